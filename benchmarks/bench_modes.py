@@ -0,0 +1,63 @@
+"""
+Measure the p50/p95 latency of the process_files analysis modes on the demo data.
+
+    python -m benchmarks.bench_modes --modes fast full --repeat 20
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from benchmarks.common import percentile
+from Demo.DemoData import jobs, resumes
+from scripts import processor
+
+
+def bench_mode(mode, repeat):
+    """Time every resume/job pair `repeat` times and return the latency summary."""
+    samples = []
+    for _ in range(repeat):
+        for job in jobs:
+            for resume in resumes:
+                start = time.perf_counter()
+                processor.process_texts(resume["resume"], job["job_desc"], mode=mode)
+                samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "mode": mode,
+        "runs": len(samples),
+        "mean_ms": statistics.fmean(samples),
+        "p50_ms": percentile(samples, 50),
+        "p95_ms": percentile(samples, 95),
+        "budget_ms": processor.MODE_BUDGETS_MS[mode],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--modes", nargs="+", default=["fast"], choices=processor.MODES)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    # Load models and fill caches outside of the timed runs
+    for mode in args.modes:
+        processor.process_texts(resumes[0]["resume"], jobs[0]["job_desc"], mode=mode)
+
+    results = []
+    for mode in args.modes:
+        repeat = args.repeat if mode == "fast" else max(1, args.repeat // 10)
+        result = bench_mode(mode, repeat)
+        results.append(result)
+        print(
+            f"{mode:>5}: p50 {result['p50_ms']:.2f} ms, p95 {result['p95_ms']:.2f} ms "
+            f"(budget {result['budget_ms']:.0f} ms, {result['runs']} runs)"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Compare the PDF backends on throughput and text fidelity.
+
+Every installed backend of scripts.PdfBackends, and the automatic selection, reads
+the PDFs of Data/Resumes and Data/JobDescription. Throughput is in pages per second.
+Fidelity is the F1 score of the words a backend extracts against those of the
+reference backend, so 1.0 means the same words in the same quantities.
+
+    python -m benchmarks.bench_pdf
+    python -m benchmarks.bench_pdf --reference pypdf --repeat 10 --output pdf.json
+"""
+
+import argparse
+import json
+import time
+from collections import Counter
+
+from benchmarks.common import JOB_PDFS, RESUME_PDFS
+from scripts.PdfBackends import (
+    BACKENDS,
+    available_backends,
+    extract_pages,
+    select_backend,
+)
+
+AUTO = "auto"
+
+
+def words(pages):
+    return Counter(" ".join(pages).split())
+
+
+def fidelity(extracted: Counter, reference: Counter) -> float:
+    """Return the F1 score of the extracted words against the reference words."""
+    common = sum((extracted & reference).values())
+    if not common:
+        return 0.0
+    precision = common / sum(extracted.values())
+    recall = common / sum(reference.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def extract(name, file_path):
+    return extract_pages(file_path, None if name == AUTO else name)
+
+
+def bench_backend(name, files, references, repeat):
+    """Read every file `repeat` times with a backend and summarize the runs."""
+    pages, elapsed, scores = 0, 0.0, []
+    for file_path in files:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            extracted = extract(name, file_path)
+            elapsed += time.perf_counter() - start
+            pages += len(extracted)
+        scores.append(fidelity(words(extracted), references[file_path]))
+    return {
+        "backend": name,
+        "files": len(files),
+        "pages": pages,
+        "pages_per_sec": pages / elapsed if elapsed else 0.0,
+        "fidelity": sum(scores) / len(scores),
+        "min_fidelity": min(scores),
+    }
+
+
+def main():
+    backends = available_backends()
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--backends", nargs="+", choices=backends + [AUTO])
+    parser.add_argument("--reference", default="pdfminer", choices=backends)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    files = RESUME_PDFS + JOB_PDFS
+    references = {
+        file_path: words(BACKENDS[args.reference].extract_pages(file_path))
+        for file_path in files
+    }
+    selected = {file_path: select_backend(file_path).name for file_path in files}
+    print(f"auto selection: {dict(Counter(selected.values()))}")
+
+    results = []
+    for name in args.backends or backends + [AUTO]:
+        # Load the modules outside of the timed runs
+        extract(name, files[0])
+        result = bench_backend(name, files, references, args.repeat)
+        results.append(result)
+        print(
+            f"{name:>9}: {result['pages_per_sec']:8.1f} pages/s, "
+            f"fidelity {result['fidelity']:.3f} (min {result['min_fidelity']:.3f}) "
+            f"against {args.reference}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"selection": selected, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
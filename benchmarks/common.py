@@ -0,0 +1,114 @@
+"""
+Helpers shared by the benchmark scripts.
+"""
+
+import glob
+import os
+import statistics
+import sys
+import time
+import zlib
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESUME_PDFS = sorted(glob.glob(os.path.join(REPO_ROOT, "Data", "Resumes", "*.pdf")))
+JOB_PDFS = sorted(glob.glob(os.path.join(REPO_ROOT, "Data", "JobDescription", "*.pdf")))
+
+
+def demo_texts():
+    """Return the resume and job description texts of Demo/DemoData.py."""
+    from Demo.DemoData import jobs, resumes
+
+    return [r["resume"] for r in resumes], [j["job_desc"] for j in jobs]
+
+
+def percentile(samples, q):
+    """Return the q-th percentile (0-100) of samples using the nearest-rank method."""
+    ordered = sorted(samples)
+    rank = max(1, round(q / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(samples_ms):
+    """Summarize a list of latencies in milliseconds."""
+    return {
+        "runs": len(samples_ms),
+        "min_ms": min(samples_ms),
+        "mean_ms": statistics.fmean(samples_ms),
+        "p50_ms": percentile(samples_ms, 50),
+        "p95_ms": percentile(samples_ms, 95),
+        "p99_ms": percentile(samples_ms, 99),
+    }
+
+
+def rss_mb():
+    """Return the resident set size of this process in MB."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # Not Linux: fall back to the peak, in bytes on macOS and kB elsewhere
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def memory_report():
+    """
+    Measure what warming the pipeline up adds to the resident memory of a process,
+    and how many spaCy pipelines it leaves loaded. Run it before any case, so the
+    numbers are those of a fresh worker.
+    """
+    from scripts import processor
+    from scripts.utils.models import get_model_name, loaded_models
+
+    before = rss_mb()
+    try:
+        processor.warm_up()
+    except Exception as e:
+        return {"skipped": f"{type(e).__name__}: {str(e).splitlines()[0]}"}
+    after = rss_mb()
+    return {
+        "model": get_model_name(),
+        "loaded_models": loaded_models(),
+        "rss_before_mb": round(before, 1),
+        "rss_after_warm_up_mb": round(after, 1),
+        "warm_up_mb": round(after - before, 1),
+    }
+
+
+def time_calls(func, inputs, repeat):
+    """Call `func` on every input `repeat` times and return the latencies in ms."""
+    samples = []
+    for _ in range(repeat):
+        for item in inputs:
+            start = time.perf_counter()
+            func(item)
+            samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+class StubEmbeddingModel:
+    """
+    A stand-in for a fastembed model: deterministic pseudo-random unit vectors seeded
+    by the text, so similarity benchmarks measure our code and not the model.
+    """
+
+    def __init__(self, dim=768):
+        self.dim = dim
+
+    def embed(self, texts, batch_size=None):
+        for text in texts:
+            rng = np.random.default_rng(zlib.crc32(text.encode("utf-8")))
+            vector = rng.standard_normal(self.dim).astype(np.float32)
+            yield vector / np.linalg.norm(vector)
+
+
+def stub_embed(texts):
+    """Embed texts with `StubEmbeddingModel`, returning a float32 matrix."""
+    return np.stack(list(StubEmbeddingModel().embed(texts)))
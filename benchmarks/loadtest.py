@@ -0,0 +1,139 @@
+"""
+Drive `process_files` over a synthetic corpus at a given concurrency and report the
+throughput and the p50/p95/p99 latency.
+
+The Cohere and Qdrant clients are pointed at the local stubs of benchmarks/stubs.py,
+so the full mode exercises the whole path, network round trips included, without API
+keys. Latency of the stubs is configurable to model a remote deployment.
+
+    python -m benchmarks.loadtest --resumes 10000 --jobs 100 --concurrency 16
+    python -m benchmarks.loadtest --corpus /tmp/corpus --requests 100000 --mode fast
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from benchmarks.common import summarize
+from benchmarks.stubs import CohereStub, QdrantStub
+from benchmarks.synthetic import write_corpus
+
+
+def list_corpus(corpus_dir):
+    """Return the resume and job description paths of a corpus directory."""
+    paths = []
+    for kind in ("Resumes", "JobDescription"):
+        directory = os.path.join(corpus_dir, kind)
+        paths.append(
+            sorted(os.path.join(directory, name) for name in os.listdir(directory))
+        )
+    return paths
+
+
+def analyze(resume_path, job_path, mode):
+    """Run one analysis and return its latency in ms, or the error."""
+    from scripts.processor import process_files
+
+    start = time.perf_counter()
+    try:
+        process_files(resume_path, job_path, mode=mode)
+    except Exception as e:
+        return None, f"{type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}"
+    return (time.perf_counter() - start) * 1000, None
+
+
+def run_load(pairs, mode, concurrency, executor="thread"):
+    """
+    Analyze every (resume, job) pair with `concurrency` workers.
+
+    Returns:
+        dict: Throughput, latency summary and error counts.
+    """
+    pool = ThreadPoolExecutor if executor == "thread" else ProcessPoolExecutor
+    samples, errors = [], Counter()
+    start = time.perf_counter()
+    with pool(max_workers=concurrency) as workers:
+        futures = [workers.submit(analyze, *pair, mode) for pair in pairs]
+        for future in as_completed(futures):
+            latency, error = future.result()
+            if error:
+                errors[error] += 1
+            else:
+                samples.append(latency)
+    wall = time.perf_counter() - start
+    return {
+        "mode": mode,
+        "concurrency": concurrency,
+        "executor": executor,
+        "requests": len(pairs),
+        "completed": len(samples),
+        "wall_s": round(wall, 3),
+        "throughput_per_s": round(len(samples) / wall, 2) if wall else 0.0,
+        "latency": summarize(samples) if samples else {},
+        "errors": dict(errors.most_common()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--corpus", help="Use this corpus instead of generating one")
+    parser.add_argument("--resumes", type=int, default=1000)
+    parser.add_argument("--jobs", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--requests", type=int, help="Number of analyses, one per resume by default"
+    )
+    parser.add_argument("--mode", choices=("fast", "full"), default="full")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--executor", choices=("thread", "process"), default="thread")
+    parser.add_argument("--cohere-latency-ms", type=float, default=50.0)
+    parser.add_argument("--qdrant-latency-ms", type=float, default=5.0)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--warm-up", type=int, default=1, help="Untimed analyses")
+    parser.add_argument("--output", help="Write the report to this JSON file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.corpus:
+            resumes, jobs = list_corpus(args.corpus)
+        else:
+            resumes, jobs = write_corpus(tmp, args.resumes, args.jobs, args.seed)
+        rng = random.Random(args.seed)
+        count = args.requests or len(resumes)
+        pairs = [(resumes[i % len(resumes)], rng.choice(jobs)) for i in range(count)]
+
+        stub_options = {"jitter": args.jitter, "error_rate": args.error_rate}
+        with CohereStub(
+            latency=args.cohere_latency_ms / 1000, **stub_options
+        ) as cohere, QdrantStub(
+            latency=args.qdrant_latency_ms / 1000, **stub_options
+        ) as qdrant:
+            # Set before the pool starts so worker processes inherit them
+            os.environ.update(
+                COHERE_API_KEY="stub",
+                COHERE_BASE_URL=cohere.url,
+                QDRANT_URL=qdrant.url,
+                QDRANT_API_KEY="stub",
+            )
+            for pair in pairs[: args.warm_up]:
+                analyze(*pair, args.mode)
+            report = run_load(pairs, args.mode, args.concurrency, args.executor)
+            report["stub_requests"] = {
+                "cohere": cohere.requests,
+                "qdrant": qdrant.requests,
+            }
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
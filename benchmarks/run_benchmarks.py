@@ -0,0 +1,400 @@
+"""
+Benchmark the parsing and scoring pipeline on the bundled data.
+
+Inputs are the PDFs in Data/Resumes and Data/JobDescription and the texts of
+Demo/DemoData.py. Embeddings are stubbed so the similarity cases measure our code
+and not a model or an API. Cases whose models or corpora are not installed are
+reported as skipped.
+
+    python -m benchmarks.run_benchmarks                      # run and compare
+    python -m benchmarks.run_benchmarks --save-baseline      # accept new numbers
+    python -m benchmarks.run_benchmarks --cases read_pdf analysis.fast
+
+Results are written to benchmarks/results/latest.json. Any case whose median is
+more than --threshold slower than in benchmarks/baseline.json is flagged and the
+script exits with status 1, as it does when a case has no baseline numbers or has
+baseline numbers but was skipped in this run: save the baseline again when adding a
+case, in an environment with the spaCy models and NLTK data installed, since cases
+skipped there keep their previous numbers.
+
+The report also holds the resident memory of the process before and after
+`processor.warm_up`, and the number of spaCy pipelines loaded, under "memory".
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+from unittest import mock
+
+from benchmarks.common import (
+    JOB_PDFS,
+    REPO_ROOT,
+    RESUME_PDFS,
+    StubEmbeddingModel,
+    demo_texts,
+    memory_report,
+    stub_embed,
+    summarize,
+    time_calls,
+)
+
+BENCHMARK_DIR = os.path.join(REPO_ROOT, "benchmarks")
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, "baseline.json")
+RESULTS_PATH = os.path.join(BENCHMARK_DIR, "results", "latest.json")
+
+CASES = {}
+
+
+def case(name):
+    """Register a benchmark case. The function returns (callable, inputs)."""
+
+    def decorator(setup):
+        CASES[name] = setup
+        return setup
+
+    return decorator
+
+
+@case("read_pdf")
+def read_pdf_case():
+    from scripts.ReadPdf import read_single_pdf
+
+    return read_single_pdf, RESUME_PDFS + JOB_PDFS
+
+
+@case("text_cleaner.spacy")
+def spacy_text_cleaner_case():
+    from scripts.utils.Utils import TextCleaner
+
+    resumes, jobs = demo_texts()
+    return TextCleaner.clean_text, resumes + jobs
+
+
+@case("text_cleaner.nltk")
+def nltk_text_cleaner_case():
+    from scripts.TextCleaner import TextCleaner
+
+    resumes, jobs = demo_texts()
+    return lambda text: TextCleaner(text).clean_text(), resumes + jobs
+
+
+@case("section_segmenter")
+def section_segmenter_case():
+    from scripts.SectionSegmenter import get_segmenter
+
+    resumes, _ = demo_texts()
+    return get_segmenter().segment, resumes
+
+
+@case("skill_matcher")
+def skill_matcher_case():
+    from scripts.SkillMatcher import get_skill_matcher
+
+    resumes, jobs = demo_texts()
+    return get_skill_matcher().extract, resumes + jobs
+
+
+@case("data_extractor")
+def data_extractor_case():
+    from scripts.Extractor import DataExtractor
+
+    def extract(text):
+        extractor = DataExtractor(text)
+        extractor.extract_entities()
+        extractor.extract_particular_words()
+        extractor.extract_experience()
+
+    resumes, jobs = demo_texts()
+    return extract, resumes + jobs
+
+
+@case("keyterm_extractor")
+def keyterm_extractor_case():
+    from scripts.KeytermsExtraction import KeytermExtractor
+
+    resumes, jobs = demo_texts()
+    return (
+        lambda text: KeytermExtractor(text).get_keyterms_based_on_sgrank(),
+        resumes + jobs,
+    )
+
+
+@case("parse_resume")
+def parse_resume_case():
+    from scripts.parsers import ParseResume
+
+    resumes, _ = demo_texts()
+    return lambda text: ParseResume(text).get_JSON(), resumes
+
+
+@case("parse_resume.keywords")
+def parse_resume_keywords_case():
+    from scripts.parsers import ParseResume
+
+    resumes, _ = demo_texts()
+    return lambda text: ParseResume(text).get_JSON(profile="keywords"), resumes
+
+
+@case("parse_job_desc")
+def parse_job_desc_case():
+    from scripts.parsers import ParseJobDesc
+
+    _, jobs = demo_texts()
+    return lambda text: ParseJobDesc(text).get_JSON(), jobs
+
+
+def stub_local_embedder():
+    """Replace the shared local embedding model with `StubEmbeddingModel`."""
+    from scripts.similarity import embedder
+
+    class StubEmbedder(embedder.LocalEmbedder):
+        def _load_model(self):
+            return StubEmbeddingModel()
+
+    embedder._embedders[embedder.DEFAULT_MODEL] = StubEmbedder()
+
+
+@case("similarity.get_score")
+def get_score_case():
+    from scripts.similarity.get_score import get_score
+
+    stub_local_embedder()
+    resumes, jobs = demo_texts()
+    pairs = [(resume, job) for resume in resumes for job in jobs]
+    return lambda pair: get_score(*pair), pairs
+
+
+@case("similarity.get_similarity_score")
+def get_similarity_score_case():
+    from benchmarks.stubs import CohereStub, QdrantStub
+    from scripts.similarity.embedder import get_cohere_embedder
+    from scripts.similarity.get_similarity_score import (
+        get_similarity_score,
+    )
+
+    # The stubs answer without latency and live as long as the process. The
+    # environment only points at them during the calls, not in the other cases.
+    cohere = CohereStub(dim=1024).start()
+    qdrant = QdrantStub().start()
+    environ = {
+        "COHERE_API_KEY": "stub",
+        "COHERE_BASE_URL": cohere.url,
+        "QDRANT_URL": qdrant.url,
+        "QDRANT_API_KEY": "stub",
+    }
+    get_cohere_embedder.cache_clear()
+
+    def score(pair):
+        with mock.patch.dict(os.environ, environ):
+            return get_similarity_score(*pair)
+
+    resumes, jobs = demo_texts()
+    return score, [(resume, job) for resume in resumes for job in jobs]
+
+
+@case("similarity.hashing_embedder")
+def hashing_embedder_case():
+    from scripts.similarity.embedder import HashingEmbedder
+
+    embedder = HashingEmbedder()
+    resumes, jobs = demo_texts()
+    return lambda text: embedder.embed([text]), resumes + jobs
+
+
+@case("similarity.bm25_two_stage")
+def bm25_case():
+    from scripts.processor import tokenize
+    from scripts.similarity.bm25 import TwoStageRetriever
+
+    resumes, jobs = demo_texts()
+    retriever = TwoStageRetriever(stub_embed)
+    # Replicate the demo resumes into a corpus large enough for BM25 to matter
+    for i in range(2000):
+        keywords = tokenize(resumes[i % len(resumes)])
+        retriever.add_document({"extracted_keywords": keywords[i % 7 :]}, str(i))
+    queries = [{"extracted_keywords": tokenize(job)} for job in jobs]
+    return lambda query: retriever.search(query, candidates=300), queries
+
+
+@case("analysis.fast")
+def fast_analysis_case():
+    from scripts.processor import process_texts
+
+    resumes, jobs = demo_texts()
+    pairs = [(resume, job) for resume in resumes for job in jobs]
+    return lambda pair: process_texts(*pair, mode="fast"), pairs
+
+
+@case("analysis.full.registered_job")
+def registered_job_analysis_case():
+    from scripts.JobRegistry import get_job_registry
+    from scripts.processor import process_texts
+
+    stub_local_embedder()
+    resumes, jobs = demo_texts()
+    registry = get_job_registry()
+    for i, job in enumerate(jobs):
+        registry.register(f"bench-{i}", job)
+    pairs = [(resume, f"bench-{i}") for resume in resumes for i in range(len(jobs))]
+    return (
+        lambda pair: process_texts(pair[0], None, mode="full", job_id=pair[1]),
+        pairs,
+    )
+
+
+def machine_info():
+    return {
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_cases(names, repeat):
+    """Run the named cases and return their summaries."""
+    results = {}
+    for name in names:
+        try:
+            func, inputs = CASES[name]()
+            # The first call loads models and fills caches
+            func(inputs[0])
+        except Exception as e:
+            lines = [line for line in str(e).splitlines() if line.strip("* ")]
+            reason = f"{type(e).__name__}: {lines[0].strip() if lines else ''}"
+            results[name] = {"skipped": reason}
+            print(f"{name:<32} skipped ({reason})")
+            continue
+        results[name] = summarize(time_calls(func, inputs, repeat))
+        print(
+            f"{name:<32} p50 {results[name]['p50_ms']:10.3f} ms"
+            f"   p95 {results[name]['p95_ms']:10.3f} ms"
+        )
+    return results
+
+
+def merge_baseline(results, baseline):
+    """
+    Return the results to store as the new baseline. A case skipped in this run keeps
+    its numbers from the previous baseline, so saving in an environment without some
+    model does not drop the cases it could not measure.
+    """
+    merged = dict(results)
+    for name, result in results.items():
+        previous = baseline.get("results", {}).get(name, {})
+        if "skipped" in result and "p50_ms" in previous:
+            merged[name] = previous
+            print(f"{name:<32} kept from the previous baseline")
+    return merged
+
+
+def compare(results, baseline, threshold):
+    """
+    Return the cases whose median regressed by more than `threshold`, and the cases
+    that cannot be compared: those without baseline numbers and those skipped in this
+    run although the baseline has numbers for them.
+    """
+    regressions, missing = [], []
+    for name, result in results.items():
+        previous = baseline.get("results", {}).get(name, {})
+        if "p50_ms" not in previous:
+            print(f"{name:<32} MISSING baseline, refresh it with --save-baseline")
+            missing.append(name)
+            continue
+        if "p50_ms" not in result:
+            print(f"{name:<32} MISSING, skipped in this run")
+            missing.append(name)
+            continue
+        ratio = result["p50_ms"] / previous["p50_ms"]
+        marker = "REGRESSION" if ratio > 1 + threshold else ""
+        print(f"{name:<32} {ratio:6.2f}x baseline {marker}")
+        if marker:
+            regressions.append(name)
+    return regressions, missing
+
+
+def compare_memory(memory, baseline, threshold):
+    """
+    Compare the resident memory after warm-up with the baseline. Returns "ok",
+    "regression" or "missing", the latter when either side was skipped.
+    """
+    previous = baseline.get("memory", {})
+    key = "rss_after_warm_up_mb"
+    if key not in memory or key not in previous:
+        print(f"{'memory':<32} MISSING, no measurement to compare")
+        return "missing"
+    ratio = memory[key] / previous[key]
+    regressed = ratio > 1 + threshold
+    print(f"{'memory':<32} {ratio:6.2f}x baseline {'REGRESSION' if regressed else ''}")
+    return "regression" if regressed else "ok"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=None)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--output", default=RESULTS_PATH)
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store the results as the new baseline instead of comparing",
+    )
+    args = parser.parse_args()
+
+    memory = memory_report()
+    if "skipped" in memory:
+        print(f"{'memory':<32} skipped ({memory['skipped']})")
+    else:
+        print(
+            f"{'memory':<32} {memory['rss_after_warm_up_mb']:10.1f} MB after warm-up"
+            f"   (+{memory['warm_up_mb']:.1f} MB, {memory['loaded_models']} model)"
+        )
+    report = {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "machine": machine_info(),
+        "memory": memory,
+        "results": run_cases(args.cases or list(CASES), args.repeat),
+    }
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    if args.save_baseline:
+        report["results"] = merge_baseline(report["results"], baseline)
+        if "skipped" in memory and "skipped" not in baseline.get("memory", {}):
+            report["memory"] = baseline["memory"]
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        return
+
+    if not baseline:
+        print(f"No baseline at {args.baseline}, run with --save-baseline")
+        return
+    if baseline.get("machine") != report["machine"]:
+        print("Warning: the baseline was recorded on a different machine")
+    regressions, missing = compare(report["results"], baseline, args.threshold)
+    if args.cases is None:
+        memory_status = compare_memory(memory, baseline, args.threshold)
+        if memory_status == "regression":
+            regressions.append("memory")
+        elif memory_status == "missing":
+            missing.append("memory")
+    if missing:
+        print(f"Cannot compare {', '.join(missing)}")
+    if regressions or missing:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,418 @@
+"""
+Local stand-ins for the Cohere embed API, the Qdrant REST API and a job board.
+
+They answer the requests the pipeline makes, with a configurable latency and error
+rate, so load tests and resilience tests run without network access or API keys.
+
+    python -m benchmarks.stubs --cohere-port 8100 --qdrant-port 6333 --latency-ms 40
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+import zlib
+from collections import Counter, deque
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import numpy as np
+
+from benchmarks.common import StubEmbeddingModel
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Dispatches requests to `routes` of the server's stub."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self, status, body, headers=None):
+        # Handlers return JSON-serializable bodies, HTML strings or None
+        if body is None:
+            data, content_type = b"", None
+        elif isinstance(body, str):
+            data, content_type = body.encode("utf-8"), "text/html; charset=utf-8"
+        else:
+            data, content_type = json.dumps(body).encode("utf-8"), "application/json"
+        self.send_response(status)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        try:
+            self.end_headers()
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up on the request, e.g. at its deadline
+            self.close_connection = True
+
+    def _handle(self, method):
+        stub = self.server.stub
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"null") if length else None
+
+        stub.requests += 1
+        stub._local.headers = self.headers
+        fault = stub.next_fault()
+        delay = stub.latency * (1 + stub.jitter * (2 * random.random() - 1))
+        if stub.slow_rate and random.random() < stub.slow_rate:
+            delay += stub.slow_latency
+        if isinstance(fault, float):
+            delay += fault
+        time.sleep(max(0.0, delay))
+        if isinstance(fault, int):
+            return self._respond(fault, {"message": "injected error"})
+        if stub.error_rate and random.random() < stub.error_rate:
+            return self._respond(503, {"message": "injected error"})
+
+        path = urlparse(self.path).path
+        for route_method, pattern, handler in stub.routes():
+            match = re.fullmatch(pattern, path)
+            if route_method == method and match:
+                try:
+                    status, response, *headers = handler(body, *match.groups())
+                except Exception as e:
+                    status, response, headers = 500, {"status": {"error": repr(e)}}, []
+                return self._respond(status, response, *headers)
+        self._respond(404, {"message": f"no route for {method} {path}"})
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+
+class StubServer:
+    """
+    Base class of the stubs: an HTTP server on a background thread.
+
+    Args:
+        latency (float): Seconds added to every request.
+        jitter (float): Relative jitter of the latency, 0.1 means +/-10%.
+        error_rate (float): Share of requests answered with a 503.
+        slow_rate (float): Share of requests that get `slow_latency` extra seconds.
+        slow_latency (float): Extra seconds of the slow requests, for tail latency.
+    """
+
+    def __init__(
+        self, latency=0.0, jitter=0.0, error_rate=0.0, slow_rate=0.0, slow_latency=0.0
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.requests = 0
+        self.server = None
+        self._local = threading.local()
+        self._faults = deque()
+        self._faults_lock = threading.Lock()
+
+    def inject(self, *faults):
+        """
+        Script the next requests, in order of arrival: a float delays a request by
+        that many seconds, an int answers it with that HTTP status, None leaves it
+        alone. Scripted faults come on top of the random latency and errors.
+        """
+        with self._faults_lock:
+            self._faults.extend(faults)
+
+    def next_fault(self):
+        with self._faults_lock:
+            return self._faults.popleft() if self._faults else None
+
+    @property
+    def request_headers(self):
+        """The headers of the request being handled on the calling thread."""
+        return self._local.headers
+
+    def routes(self):
+        """
+        Return (method, path pattern, handler) triples. A handler is called with
+        the JSON body and the groups of the pattern, and returns a status, a body
+        and optionally a dict of headers.
+        """
+        return []
+
+    def start(self, port=0):
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+        self.server.daemon_threads = True
+        self.server.stub = self
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    @property
+    def url(self):
+        host, port = self.server.server_address
+        return f"http://{host}:{port}"
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class CohereStub(StubServer):
+    """Answers POST /v1/embed like the Cohere API."""
+
+    def __init__(self, dim=4096, **kwargs):
+        super().__init__(**kwargs)
+        self.model = StubEmbeddingModel(dim)
+
+    def routes(self):
+        return [("POST", r"/v\d/embed", self.embed)]
+
+    def embed(self, body):
+        texts = body.get("texts", [])
+        return 200, {
+            "response_type": "embeddings_floats",
+            "id": str(uuid.uuid4()),
+            "embeddings": [vector.tolist() for vector in self.model.embed(texts)],
+            "texts": texts,
+            "meta": {"api_version": {"version": "1"}},
+        }
+
+
+def _ok(result):
+    return 200, {"result": result, "status": "ok", "time": 0.0}
+
+
+def _matches(condition, payload):
+    value = payload.get(condition["key"])
+    values = value if isinstance(value, list) else [value]
+    if "match" in condition:
+        match = condition["match"]
+        if "value" in match:
+            return match["value"] in values
+        if "any" in match:
+            return any(v in values for v in match["any"])
+    if "range" in condition:
+        bounds = condition["range"]
+        if value is None:
+            return False
+        checks = {
+            "gt": lambda b: value > b,
+            "gte": lambda b: value >= b,
+            "lt": lambda b: value < b,
+            "lte": lambda b: value <= b,
+        }
+        return all(checks[op](b) for op, b in bounds.items() if b is not None)
+    return True
+
+
+def matches_filter(query_filter, payload):
+    """Evaluate the must/should/must_not clauses of a Qdrant filter on a payload."""
+    if not query_filter:
+        return True
+    must = query_filter.get("must") or []
+    should = query_filter.get("should") or []
+    must_not = query_filter.get("must_not") or []
+    return (
+        all(_matches(c, payload) for c in must)
+        and (not should or any(_matches(c, payload) for c in should))
+        and not any(_matches(c, payload) for c in must_not)
+    )
+
+
+class QdrantStub(StubServer):
+    """
+    An in-memory subset of the Qdrant REST API: collections, upserts, payload
+    indexes, filtered deletes and brute-force cosine queries.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.collections = {}
+        self.lock = threading.Lock()
+
+    def routes(self):
+        name = r"/collections/([^/]+)"
+        return [
+            ("GET", r"/", lambda body: (200, {"title": "qdrant", "version": "1.19.0"})),
+            ("GET", r"/collections", self.list_collections),
+            ("GET", name + r"/exists", self.collection_exists),
+            ("GET", name, self.get_collection),
+            ("PUT", name, self.create_collection),
+            ("DELETE", name, self.delete_collection),
+            ("PUT", name + r"/index", lambda body, _: _ok({"status": "completed"})),
+            ("PUT", name + r"/points", self.upsert),
+            ("POST", name + r"/points/delete", self.delete_points),
+            ("POST", name + r"/points/query", self.query),
+        ]
+
+    def list_collections(self, body):
+        return _ok({"collections": [{"name": name} for name in self.collections]})
+
+    def collection_exists(self, body, name):
+        return _ok({"exists": name in self.collections})
+
+    def get_collection(self, body, name):
+        if name not in self.collections:
+            return 404, {"status": {"error": f"Collection `{name}` doesn't exist!"}}
+        return _ok({"status": "green", "points_count": len(self.collections[name])})
+
+    def create_collection(self, body, name):
+        with self.lock:
+            if name in self.collections:
+                return 409, {
+                    "status": {"error": f"Collection `{name}` already exists!"}
+                }
+            self.collections[name] = {}
+        return _ok(True)
+
+    def delete_collection(self, body, name):
+        with self.lock:
+            existed = self.collections.pop(name, None) is not None
+        return _ok(existed)
+
+    def upsert(self, body, name):
+        if "batch" in body:
+            batch = body["batch"]
+            payloads = batch.get("payloads") or [{}] * len(batch["ids"])
+            points = zip(batch["ids"], batch["vectors"], payloads)
+        else:
+            points = (
+                (p["id"], p["vector"], p.get("payload") or {}) for p in body["points"]
+            )
+        with self.lock:
+            collection = self.collections.setdefault(name, {})
+            for point_id, vector, payload in points:
+                vector = np.asarray(vector, dtype=np.float32)
+                collection[point_id] = (
+                    vector / (np.linalg.norm(vector) or 1.0),
+                    payload,
+                )
+        return _ok({"operation_id": self.requests, "status": "completed"})
+
+    def delete_points(self, body, name):
+        with self.lock:
+            collection = self.collections.get(name, {})
+            if "points" in body:
+                doomed = [
+                    point_id for point_id in body["points"] if point_id in collection
+                ]
+            else:
+                doomed = [
+                    point_id
+                    for point_id, (_, payload) in collection.items()
+                    if matches_filter(body.get("filter"), payload)
+                ]
+            for point_id in doomed:
+                del collection[point_id]
+        return _ok({"operation_id": self.requests, "status": "completed"})
+
+    def query(self, body, name):
+        query = body["query"]
+        if isinstance(query, dict):
+            query = query["nearest"]
+        query = np.asarray(query, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1.0)
+        with self.lock:
+            candidates = [
+                (point_id, float(vector @ query), payload)
+                for point_id, (vector, payload) in self.collections.get(
+                    name, {}
+                ).items()
+                if matches_filter(body.get("filter"), payload)
+            ]
+        candidates.sort(key=lambda item: -item[1])
+        offset = body.get("offset") or 0
+        limit = body.get("limit") or 10
+        with_payload = body.get("with_payload", True)
+        points = [
+            {
+                "id": point_id,
+                "version": 0,
+                "score": score,
+                "payload": payload if with_payload else None,
+            }
+            for point_id, score, payload in candidates[offset : offset + limit]
+        ]
+        return _ok({"points": points})
+
+
+class JobBoardStub(StubServer):
+    """
+    Serves job posting pages at /jobs/<id> in the markup of LinkedIn postings, with
+    an ETag and a Last-Modified date, and answers conditional requests with a 304
+    while a posting is unchanged.
+
+    Args:
+        failures (dict): Posting id -> number of 503s served before the page, to
+            exercise retries.
+    """
+
+    def __init__(self, failures=None, **kwargs):
+        super().__init__(**kwargs)
+        self.pages = {}
+        self.failures = Counter(failures or {})
+        self.hits = Counter()
+        self.lock = threading.Lock()
+
+    def add_posting(self, job_id, title, organization, description):
+        """Publish or update a posting."""
+        page = (
+            "<html><head><title>" + title + "</title></head><body>"
+            '<h1 class="topcard__title">' + title + "</h1>"
+            '<a class="topcard__org-name-link">' + organization + "</a>"
+            '<div class="show-more-less-html__markup">' + description + "</div>"
+            "</body></html>"
+        )
+        with self.lock:
+            self.pages[job_id] = (page, f'"{zlib.crc32(page.encode()):08x}"')
+
+    def routes(self):
+        return [("GET", r"/jobs/([^/]+)", self.get_posting)]
+
+    def get_posting(self, body, job_id):
+        with self.lock:
+            self.hits[job_id] += 1
+            if self.failures[job_id] > 0:
+                self.failures[job_id] -= 1
+                return 503, "<html><body>Service unavailable</body></html>"
+            if job_id not in self.pages:
+                return 404, "<html><body>Not found</body></html>"
+            page, etag = self.pages[job_id]
+        headers = {"ETag": etag, "Last-Modified": formatdate(0, usegmt=True)}
+        if self.request_headers.get("If-None-Match") == etag:
+            return 304, None, headers
+        return 200, page, headers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--cohere-port", type=int, default=8100)
+    parser.add_argument("--qdrant-port", type=int, default=6333)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    options = {"latency": args.latency_ms / 1000, "error_rate": args.error_rate}
+    cohere = CohereStub(**options).start(args.cohere_port)
+    qdrant = QdrantStub(**options).start(args.qdrant_port)
+    print(f"Cohere stub on {cohere.url}, Qdrant stub on {qdrant.url}")
+    threading.Event().wait()
+
+
+if __name__ == "__main__":
+    main()
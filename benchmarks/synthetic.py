@@ -0,0 +1,174 @@
+"""
+Generate a synthetic corpus of resumes and job descriptions for load testing.
+
+Documents are built by recombining the sections of Demo/DemoData.py: every
+synthetic resume takes each of its sections from a random demo resume, shuffles
+the lines inside them and gets a random name and contact block.
+
+    python -m benchmarks.synthetic --resumes 100000 --jobs 1000 --output /tmp/corpus
+"""
+
+import argparse
+import os
+import random
+import re
+
+from benchmarks.common import demo_texts
+
+RESUME_SECTIONS = {
+    "professional summary": "summary",
+    "summary": "summary",
+    "objective": "summary",
+    "skills": "skills",
+    "work experience": "experience",
+    "experience": "experience",
+    "education": "education",
+    "projects": "projects",
+    "certifications": "certifications",
+}
+JOB_SECTIONS = {
+    "about us": "about",
+    "job description": "description",
+    "responsibilities": "responsibilities",
+    "requirements": "requirements",
+    "benefits": "benefits",
+    "how to apply": "apply",
+}
+RESUME_ORDER = [
+    "summary",
+    "skills",
+    "experience",
+    "education",
+    "projects",
+    "certifications",
+]
+JOB_HEADERS = {key: header.title() for header, key in reversed(JOB_SECTIONS.items())}
+JOB_ORDER = ["about", "description", "responsibilities", "requirements", "benefits"]
+
+FIRST_NAMES = ["Ada", "Alan", "Grace", "Linus", "Barbara", "Dennis", "Margaret", "Ken"]
+LAST_NAMES = ["Lovelace", "Turing", "Hopper", "Torvalds", "Liskov", "Ritchie", "Knuth"]
+TITLES = [
+    "Full Stack Developer",
+    "Front End Engineer",
+    "Machine Learning Engineer",
+    "Product Manager",
+    "Java Developer",
+    "Data Scientist",
+]
+
+# Page markers such as "1 EDUCATION" or "1/2 Projects" precede some headers
+PAGE_MARKER = re.compile(r"^\d+(/\d+)?\s+")
+# Lines that start a new bullet or a dated entry; other lines continue the previous one
+ITEM_START = re.compile(r"^(•|\d{4}\b|[A-Z][a-z]+ \d{4}\b)")
+
+
+def split_sections(text, headers):
+    """
+    Split a demo document into {section key: [items]} using the given header names.
+    An item is a bullet or dated entry with its wrapped continuation lines.
+    """
+    sections, current = {}, None
+    for line in text.splitlines():
+        key = headers.get(PAGE_MARKER.sub("", line).strip().lower())
+        if key:
+            current = key
+            sections.setdefault(current, [])
+        elif current and line.strip():
+            items = sections[current]
+            if items and not ITEM_START.match(line):
+                items[-1] += "\n" + line
+            else:
+                items.append(line)
+    return sections
+
+
+class CorpusGenerator:
+    """
+    Recombines the sections of the demo resumes and job descriptions.
+    """
+
+    def __init__(self, seed=0):
+        self.rng = random.Random(seed)
+        resumes, jobs = demo_texts()
+        self.resume_pool = self._pool(resumes, RESUME_SECTIONS)
+        self.job_pool = self._pool(jobs, JOB_SECTIONS)
+
+    @staticmethod
+    def _pool(texts, headers):
+        pool = {}
+        for text in texts:
+            for key, lines in split_sections(text, headers).items():
+                pool.setdefault(key, []).append(lines)
+        return pool
+
+    def _section(self, pool, key):
+        lines = list(self.rng.choice(pool[key]))
+        self.rng.shuffle(lines)
+        return lines[: self.rng.randint(max(1, len(lines) // 2), len(lines))]
+
+    def resume(self):
+        """Return the text of a new synthetic resume."""
+        first, last = self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+        lines = [
+            f"{first} {last}",
+            self.rng.choice(TITLES),
+            f"{first.lower()}.{last.lower()}@example.com",
+            f"({self.rng.randint(200, 999)}) {self.rng.randint(200, 999)}-"
+            f"{self.rng.randint(1000, 9999)}",
+        ]
+        for key in RESUME_ORDER:
+            if key in self.resume_pool and (
+                key != "certifications" or self.rng.random() < 0.5
+            ):
+                lines.append(key.upper())
+                lines.extend(self._section(self.resume_pool, key))
+        return "\n".join(lines)
+
+    def job(self):
+        """Return the text of a new synthetic job description."""
+        lines = [f"Job Description {self.rng.choice(TITLES)}"]
+        for key in JOB_ORDER:
+            if key in self.job_pool:
+                lines.append(JOB_HEADERS[key])
+                lines.extend(self._section(self.job_pool, key))
+        return "\n".join(lines)
+
+
+def write_corpus(output_dir, resumes, jobs, seed=0):
+    """
+    Write `resumes` and `jobs` text files under output_dir/Resumes and
+    output_dir/JobDescription, one document at a time.
+
+    Returns:
+        tuple: The lists of resume and job description paths.
+    """
+    generator = CorpusGenerator(seed)
+    paths = ([], [])
+    for kind, count, make, collected in (
+        ("Resumes", resumes, generator.resume, paths[0]),
+        ("JobDescription", jobs, generator.job, paths[1]),
+    ):
+        directory = os.path.join(output_dir, kind)
+        os.makedirs(directory, exist_ok=True)
+        for i in range(count):
+            path = os.path.join(directory, f"{kind.lower()}_{i:07d}.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(make())
+            collected.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--resumes", type=int, default=10000)
+    parser.add_argument("--jobs", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", required=True)
+    args = parser.parse_args()
+
+    resumes, jobs = write_corpus(args.output, args.resumes, args.jobs, args.seed)
+    print(f"Wrote {len(resumes)} resumes and {len(jobs)} job descriptions")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 import sys
 import os
-from resume_matcher.scripts.processor import process_files
+from scripts.processor import process_files
 
 def main():
     try:
@@ -1,13 +1,15 @@
+import datetime
+import logging
 import re
 import urllib.request
 
-import spacy
+import numpy as np
 
+from .SectionSegmenter import get_segmenter
 from .utils import TextCleaner
+from .utils.models import get_nlp
 
-# Load the English model
-nlp = spacy.load("en_core_web_sm")
-
+logger = logging.getLogger(__name__)
 
 RESUME_SECTIONS = [
     "Contact Information",
@@ -56,8 +58,59 @@ class DataExtractor:
         """
 
         self.text = raw_text
-        self.clean_text = TextCleaner.clean_text(self.text)
-        self.doc = nlp(self.clean_text)
+        self._clean_text = None
+        self._doc = None
+        self._features = None
+
+    @property
+    def clean_text(self):
+        """The cleaned text, computed on first use."""
+        if self._clean_text is None:
+            self._clean_text = TextCleaner.clean_text(self.text)
+        return self._clean_text
+
+    @property
+    def doc(self):
+        """
+        The parsed cleaned text. Parsing happens on first use, so the regex-only
+        extractors never run the model.
+        """
+        if self._doc is None:
+            self._doc = get_nlp()(self.clean_text)
+        return self._doc
+
+    @property
+    def features(self) -> np.ndarray:
+        """
+        The token attributes ORTH, LEMMA, POS and ENT_TYPE as one uint64 array of shape
+        (tokens, 4), exported from the doc once with `Doc.to_array`. ORTH and LEMMA are
+        string hashes, resolved through `doc.vocab.strings`.
+        """
+        if self._features is None:
+            from spacy.attrs import ENT_TYPE, LEMMA, ORTH, POS
+
+            self._features = self.doc.to_array([ORTH, LEMMA, POS, ENT_TYPE])
+        return self._features
+
+    def count_features(self, column: int, mask: np.ndarray = None) -> dict:
+        """
+        Count the distinct values of a column of `features` with `np.unique`.
+
+        Args:
+            column (int): 0 for ORTH, 1 for LEMMA, 2 for POS, 3 for ENT_TYPE.
+            mask (np.ndarray): Only count the tokens where the mask is true.
+
+        Returns:
+            dict: The values as strings and their counts, in order of first occurrence.
+        """
+        values = self.features[:, column]
+        if mask is not None:
+            values = values[mask]
+        if not len(values):
+            return {}
+        unique, first, counts = np.unique(values, return_index=True, return_counts=True)
+        strings = self.doc.vocab.strings
+        return {strings[int(unique[i])]: int(counts[i]) for i in np.argsort(first)}
 
     def extract_links(self):
         """
@@ -104,7 +157,7 @@ class DataExtractor:
                 ):
                     links.append(link)
         except Exception as e:
-            print(f"Error extracting links: {str(e)}")
+            logger.error(f"Error extracting links: {str(e)}")
         return links
 
     def extract_names(self):
@@ -152,28 +205,15 @@ class DataExtractor:
 
     def extract_experience(self):
         """
-        Extract experience from a given string. It does so by using the Spacy module.
-
-        Args:
-            text (str): The string from which to extract experience.
+        Extract the experience sections of a resume with the line-based
+        `SectionSegmenter`, which also recognizes multi-word headers such as
+        "Work Experience" or "Employment History".
 
         Returns:
-            str: A string containing all the extracted experience.
+            str: The text of the experience sections, header lines included.
         """
-        experience_section = []
-        in_experience_section = False
-
-        for token in self.doc:
-            if token.text in RESUME_SECTIONS:
-                if token.text == "Experience" or "EXPERIENCE" or "experience":
-                    in_experience_section = True
-                else:
-                    in_experience_section = False
-
-            if in_experience_section:
-                experience_section.append(token.text)
-
-        return " ".join(experience_section)
+        experience = get_segmenter().extract(self.text, "experience")
+        return " ".join(experience.split())
 
     def extract_position_year(self):
         """
@@ -191,6 +231,40 @@ class DataExtractor:
         position_year = re.findall(position_year_search_pattern, self.text)
         return position_year
 
+    def extract_years_of_experience(self) -> int:
+        """
+        Estimate the years of experience from explicit mentions ("5+ years") and
+        from the year ranges of positions ("2015 - present"), counting overlapping
+        ranges once.
+
+        Returns:
+            int: The larger of the two estimates, 0 if the text has neither.
+        """
+        mentioned = [
+            int(years)
+            for years in re.findall(
+                r"\b(\d{1,2})\+?\s*(?:years|yrs)\b", self.text, re.IGNORECASE
+            )
+        ]
+        this_year = datetime.date.today().year
+        ranges = sorted(
+            (int(start), this_year if not end.isdigit() else int(end))
+            for start, end in re.findall(
+                r"\b((?:19|20)\d{2})\s*(?:-|–|to)\s*"
+                r"((?:19|20)\d{2}|present|current|now)\b",
+                self.text,
+                re.IGNORECASE,
+            )
+        )
+        worked, covered_until = 0, None
+        for start, end in ranges:
+            if covered_until is not None:
+                start = max(start, covered_until)
+            if end > start:
+                worked += end - start
+                covered_until = end
+        return max(mentioned + [worked])
+
     def extract_particular_words(self):
         """
         Extract nouns and proper nouns from the given text.
@@ -205,9 +279,32 @@ class DataExtractor:
         nouns = [token.text for token in self.doc if token.pos_ in pos_tags]
         return nouns
 
+    def extract_keyword_counts(self):
+        """
+        Count the nouns and proper nouns of the text without materializing a string
+        per token.
+
+        Returns:
+            dict: Each distinct noun with its number of occurrences, in order of first
+            occurrence.
+        """
+        from spacy.symbols import NOUN, PROPN
+
+        return self.count_features(0, np.isin(self.features[:, 2], [NOUN, PROPN]))
+
+    def count_pos(self):
+        """
+        Count the tokens per part-of-speech tag.
+
+        Returns:
+            dict: The POS tags and their counts.
+        """
+        return self.count_features(2)
+
     def extract_entities(self):
         """
-        Extract named entities of types 'GPE' (geopolitical entity) and 'ORG' (organization) from the given text.
+        Extract named entities of types 'GPE' (geopolitical entity) and 'ORG'
+        (organization) from the given text.
 
         Args:
             text (str): The input text to extract entities from.
@@ -3,7 +3,7 @@ import os.path
 import pathlib
 
 from .parsers import ParseJobDesc, ParseResume
-from .ReadPdf import read_single_pdf
+from .ReadDocument import read_document
 
 READ_JOB_DESCRIPTION_FROM = "Data/JobDescription/"
 SAVE_DIRECTORY = "Data/Processed/JobDescription"
@@ -16,20 +16,20 @@ class JobDescriptionProcessor:
 
     def process(self) -> bool:
         try:
-            resume_dict = self._read_resumes()
-            self._write_json_file(resume_dict)
+            job_desc_dict = self._read_job_desc()
+            self._write_json_file(job_desc_dict)
             return True
         except Exception as e:
             print(f"An error occurred: {str(e)}")
             return False
 
     def _read_resumes(self) -> dict:
-        data = read_single_pdf(self.input_file_name)
+        data = read_document(self.input_file_name)
         output = ParseResume(data).get_JSON()
         return output
 
     def _read_job_desc(self) -> dict:
-        data = read_single_pdf(self.input_file_name)
+        data = read_document(self.input_file_name)
         output = ParseJobDesc(data).get_JSON()
         return output
 
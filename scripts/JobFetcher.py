@@ -0,0 +1,219 @@
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from scripts.LinkedinJobToPDF import JobPosting, parse_job_posting
+
+logger = logging.getLogger(__name__)
+
+FETCHED, NOT_MODIFIED, FAILED = "fetched", "not_modified", "failed"
+
+# Responses worth another attempt, after a backoff or the server's Retry-After
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class FetchResult(NamedTuple):
+    """The outcome of fetching one URL."""
+
+    url: str
+    status: str
+    posting: Optional[JobPosting] = None
+    error: Optional[str] = None
+    attempts: int = 0
+
+
+class HostRateLimiter:
+    """
+    Spaces the requests to each host at least 1 / `rate` seconds apart, across
+    threads. Requests to different hosts do not wait for each other.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host: str):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next.get(host, now))
+            self._next[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class ValidatorCache:
+    """
+    The ETag and Last-Modified validators of fetched URLs, so a posting that did
+    not change since the last run is answered with a 304 and not downloaded again.
+
+    Args:
+        path (str): A JSON file the validators are loaded from and saved to. Without
+            one, they only last as long as the cache.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self._validators: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self._validators = json.load(f)
+
+    def headers(self, url: str) -> dict:
+        """The conditional request headers for a URL."""
+        with self._lock:
+            validators = self._validators.get(url, {})
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        return headers
+
+    def update(self, url: str, response: requests.Response):
+        validators = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        if any(validators.values()):
+            with self._lock:
+                self._validators[url] = validators
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            data = json.dumps(self._validators, indent=2)
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(data)
+
+
+class BulkFetcher:
+    """
+    Fetches job postings concurrently through one pooled session.
+
+    Requests are rate limited per host and retried on connection errors and on
+    429 and 5xx responses with exponential backoff. Each URL gets a `FetchResult`;
+    a failing URL never stops the others.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        rate_per_host: float = 2.0,
+        retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        timeout: float = 10.0,
+        cache: ValidatorCache = None,
+    ):
+        """
+        Args:
+            max_workers (int): Concurrent requests, and connections kept per host.
+            rate_per_host (float): Requests per second allowed to a host, 0 for no
+                limit.
+            retries (int): Attempts after the first one.
+            backoff (float): Seconds before the first retry, doubled at each retry.
+            max_backoff (float): The longest wait before a retry, also for a
+                server's Retry-After.
+            timeout (float): Seconds to connect and to wait for the response.
+            cache (ValidatorCache): The validators of earlier fetches.
+        """
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.cache = cache or ValidatorCache()
+        self.rate_limiter = HostRateLimiter(rate_per_host)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _delay(self, attempt: int, response: requests.Response = None) -> float:
+        retry_after = (
+            response.headers.get("Retry-After") if response is not None else None
+        )
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff)
+        return min(self.backoff * 2**attempt, self.max_backoff)
+
+    def fetch(self, url: str) -> FetchResult:
+        """Fetch and parse one posting."""
+        host = urlsplit(url).netloc
+        error = None
+        for attempt in range(self.retries + 1):
+            self.rate_limiter.wait(host)
+            try:
+                response = self.session.get(
+                    url, headers=self.cache.headers(url), timeout=self.timeout
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = f"{type(e).__name__}: {e}"
+                if attempt < self.retries:
+                    time.sleep(self._delay(attempt))
+                continue
+
+            if response.status_code == 304:
+                return FetchResult(url, NOT_MODIFIED, attempts=attempt + 1)
+            if response.status_code == 200:
+                try:
+                    posting = parse_job_posting(response.text, url)
+                except Exception as e:
+                    return FetchResult(
+                        url,
+                        FAILED,
+                        error=f"Unparsable posting: {e}",
+                        attempts=attempt + 1,
+                    )
+                self.cache.update(url, response)
+                return FetchResult(url, FETCHED, posting, attempts=attempt + 1)
+
+            error = f"HTTP {response.status_code}"
+            if response.status_code not in RETRY_STATUSES:
+                break
+            if attempt < self.retries:
+                time.sleep(self._delay(attempt, response))
+        return FetchResult(url, FAILED, error=error, attempts=attempt + 1)
+
+    def fetch_all(self, urls: Iterable[str]) -> List[FetchResult]:
+        """
+        Fetch postings concurrently.
+
+        Returns:
+            List[FetchResult]: One result per distinct URL, in input order.
+        """
+        urls = list(dict.fromkeys(urls))
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(self.fetch, urls))
+        self.cache.save()
+
+        failed = [result for result in results if result.status == FAILED]
+        logger.info(
+            f"Fetched {len(urls)} postings: "
+            f"{sum(result.status == FETCHED for result in results)} new or changed, "
+            f"{sum(result.status == NOT_MODIFIED for result in results)} unchanged, "
+            f"{len(failed)} failed"
+        )
+        for result in failed:
+            logger.warning(f"Could not fetch {result.url}: {result.error}")
+        return results
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,335 @@
+"""
+Precomputed job-side features, so a posting scored against many resumes is parsed
+and embedded once.
+
+    registry = get_job_registry()
+    registry.register("job-42", job_text)
+    process_texts(resume_text, job_id="job-42")
+
+Registering a job computes its parsed fields, the token counts of the fast mode, its
+keyterm and skill indexes and its embedding. Scoring a resume against it then only
+processes the resume. Registering a changed text under the same id bumps the job's
+version; registering the same text again is free.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: a single process owns the file
+    fcntl = None
+
+from scripts.parsers import ParseJobDesc
+from scripts.similarity.embedder import (
+    DEFAULT_MODEL,
+    HASHING_MODEL,
+    Embedder,
+    EmbeddingUnavailable,
+    get_cohere_embedder,
+    get_embedder,
+    offline_allowed,
+)
+
+logger = logging.getLogger(__name__)
+
+# Bump when the features computed at registration change, so stored jobs are redone
+FEATURES_VERSION = 1
+
+
+class RegisteredJob(NamedTuple):
+    """The precomputed job side of scoring."""
+
+    job_id: str
+    version: int
+    text_hash: str
+    parsed: dict
+    token_counts: Dict[str, int]
+    token_norm: float
+    top_keywords: Tuple[str, ...]
+    keyterms: Tuple[str, ...]
+    skills: Tuple[str, ...]
+    embedding_model: Optional[str]
+    embedding: Optional[np.ndarray]
+    hashing_embedding: np.ndarray
+    features_version: int = FEATURES_VERSION
+
+    def to_dict(self) -> dict:
+        data = self._asdict()
+        for name in ("embedding", "hashing_embedding"):
+            if data[name] is not None:
+                data[name] = data[name].tolist()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RegisteredJob":
+        data = dict(data)
+        for name in ("embedding", "hashing_embedding"):
+            if data[name] is not None:
+                data[name] = np.asarray(data[name], dtype=np.float32)
+        for name in ("top_keywords", "keyterms", "skills"):
+            data[name] = tuple(data[name])
+        return cls(**data)
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def default_embedder() -> Embedder:
+    """
+    The embedder `processor.get_match_score` scores with: Cohere when it is
+    configured, the local embedding model otherwise.
+    """
+    if os.getenv("COHERE_API_KEY") and os.getenv("QDRANT_URL"):
+        return get_cohere_embedder()
+    return get_embedder(DEFAULT_MODEL)
+
+
+def _cosine(a: np.ndarray, b: np.ndarray) -> float:
+    norm = float(np.linalg.norm(a) * np.linalg.norm(b))
+    return float(a @ b) / norm if norm else 0.0
+
+
+class JobRegistry:
+    """
+    The registered jobs of a process, optionally persisted to a JSON file.
+
+    Args:
+        path (str): A JSON file jobs are loaded from and saved to. Pre-forked workers
+            can share one file: `get` reloads it when another process changed it, and
+            saving merges with it under a file lock, keeping the higher version of each
+            job, before replacing it atomically.
+        embedder (Embedder): The embedding backend, `default_embedder` by default.
+    """
+
+    def __init__(self, path: str = None, embedder: Embedder = None):
+        self.path = path
+        self._embedder = embedder
+        self._jobs: Dict[str, RegisteredJob] = {}
+        self._lock = threading.Lock()
+        self._signature = None
+        self._load()
+
+    @property
+    def embedder(self) -> Embedder:
+        if self._embedder is None:
+            self._embedder = default_embedder()
+        return self._embedder
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        """Hold a lock on a side file, which survives the replacement of the data."""
+        if fcntl is None:
+            yield
+            return
+        with open(f"{self.path}.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        # The file is replaced on every save, so its inode changes with its content
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _read(self) -> Dict[str, RegisteredJob]:
+        """Read the file, under the caller's file lock, and remember its signature."""
+        self._signature = self._file_signature()
+        if self._signature is None:
+            return {}
+        with open(self.path, encoding="utf-8") as f:
+            stored = json.load(f)
+        jobs = {
+            job_id: RegisteredJob.from_dict(data)
+            for job_id, data in stored.items()
+            if data.get("features_version") == FEATURES_VERSION
+        }
+        if len(jobs) < len(stored):
+            logger.info(
+                f"Dropped {len(stored) - len(jobs)} jobs registered with older features"
+            )
+        return jobs
+
+    def _load(self):
+        if not self.path:
+            return
+        with self._file_lock(exclusive=False):
+            jobs = self._read()
+        with self._lock:
+            self._jobs = jobs
+
+    def _sync(self, changed=(), removed=()):
+        """
+        Merge the jobs of this process that `changed` into the file, drop the
+        `removed` ones, and take the merged file as the new view of this process.
+        A job changed here only replaces a stored one of the same or a lower version.
+        """
+        if not self.path:
+            with self._lock:
+                for job_id in removed:
+                    self._jobs.pop(job_id, None)
+            return
+        with self._file_lock(exclusive=True):
+            jobs = self._read()
+            with self._lock:
+                for job_id in changed:
+                    job = self._jobs.get(job_id)
+                    stored = jobs.get(job_id)
+                    if job is not None and (
+                        stored is None or job.version >= stored.version
+                    ):
+                        jobs[job_id] = job
+                for job_id in removed:
+                    jobs.pop(job_id, None)
+                self._jobs = jobs
+                data = {job_id: job.to_dict() for job_id, job in jobs.items()}
+            directory = os.path.dirname(os.path.abspath(self.path))
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=directory, delete=False, suffix=".tmp"
+            ) as f:
+                json.dump(data, f)
+            os.replace(f.name, self.path)
+            self._signature = self._file_signature()
+
+    def save(self):
+        """Merge every job of this process into the file."""
+        with self._lock:
+            changed = list(self._jobs)
+        self._sync(changed)
+
+    def _store(self, job: RegisteredJob):
+        with self._lock:
+            self._jobs[job.job_id] = job
+        self._sync([job.job_id])
+
+    def _embed(self, text: str) -> Tuple[Optional[str], Optional[np.ndarray]]:
+        try:
+            vector = self.embedder.embed([text])[0]
+        except Exception as e:
+            logger.warning(
+                f"Could not embed the job, registering it again retries: {e}"
+            )
+            return None, None
+        return (
+            getattr(self.embedder, "model_name", type(self.embedder).__name__),
+            vector,
+        )
+
+    def compute(self, job_id: str, job_text: str, version: int = 1) -> RegisteredJob:
+        """Compute the features of a job without registering it."""
+        from scripts.processor import get_job_features, get_job_skills
+
+        parsed = ParseJobDesc(job_text).get_JSON()
+        token_counts, token_norm, top_keywords = get_job_features(job_text)
+        keywords = " ".join(parsed["extracted_keywords"])
+        embedding_model, embedding = self._embed(keywords)
+        return RegisteredJob(
+            job_id=job_id,
+            version=version,
+            text_hash=text_hash(job_text),
+            parsed=parsed,
+            token_counts=dict(token_counts),
+            token_norm=token_norm,
+            top_keywords=tuple(top_keywords),
+            keyterms=tuple(
+                term[0] if isinstance(term, (list, tuple)) else term
+                for term in parsed["keyterms"]
+            ),
+            skills=get_job_skills(job_text),
+            embedding_model=embedding_model,
+            embedding=embedding,
+            hashing_embedding=get_embedder(HASHING_MODEL).embed_one(keywords),
+        )
+
+    def register(self, job_id: str, job_text: str) -> RegisteredJob:
+        """
+        Precompute and store the features of a job. Re-registering an unchanged text
+        returns the stored job, after retrying its embedding if it could not be
+        computed before; a changed text replaces it with the next version.
+        """
+        if not job_text.strip():
+            raise ValueError("Job description cannot be empty")
+        previous = self.get(job_id)
+        if previous is not None and previous.text_hash == text_hash(job_text):
+            if previous.embedding is not None:
+                return previous
+            keywords = " ".join(previous.parsed["extracted_keywords"])
+            embedding_model, embedding = self._embed(keywords)
+            if embedding is None:
+                return previous
+            job = previous._replace(
+                embedding_model=embedding_model, embedding=embedding
+            )
+            self._store(job)
+            return job
+
+        job = self.compute(job_id, job_text, previous.version + 1 if previous else 1)
+        self._store(job)
+        logger.info(f"Registered job {job_id} version {job.version}")
+        return job
+
+    def get(self, job_id: str) -> Optional[RegisteredJob]:
+        if self.path and self._file_signature() != self._signature:
+            self._load()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def unregister(self, job_id: str):
+        self._sync(removed=[job_id])
+
+    def __contains__(self, job_id: str) -> bool:
+        return self.get(job_id) is not None
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def match_score(self, job: RegisteredJob, resume_keywords: str) -> tuple:
+        """
+        Score the keywords of a resume against a registered job on a 0-100 scale,
+        embedding the resume side only. When the job has no model embedding or the
+        resume cannot be embedded, SIMILARITY_OFFLINE opts in to scoring with the
+        hashing embeddings; without it the failure is raised.
+
+        Returns:
+            tuple: The score and the method that computed it, "embedding" or
+            "hashing".
+        """
+        score, method = None, "embedding"
+        error = EmbeddingUnavailable(f"Job {job.job_id} has no model embedding")
+        if job.embedding is not None:
+            try:
+                score = _cosine(
+                    self.embedder.embed([resume_keywords])[0], job.embedding
+                )
+            except Exception as e:
+                error = e
+        if score is None:
+            if not offline_allowed():
+                raise error
+            logger.warning(f"Embedding failed, using the hashing embedder: {error}")
+            resume = get_embedder(HASHING_MODEL).embed_one(resume_keywords)
+            score, method = _cosine(resume, job.hashing_embedding), "hashing"
+        return round(max(0.0, min(1.0, score)) * 100, 2), method
+
+
+@lru_cache(maxsize=None)
+def get_job_registry() -> JobRegistry:
+    """
+    Return the process-wide registry, persisted to JOB_REGISTRY_PATH if it is set.
+    """
+    return JobRegistry(os.getenv("JOB_REGISTRY_PATH"))
@@ -1,7 +1,3 @@
-import textacy
-from textacy import extract
-
-
 class KeytermExtractor:
     """
     A class for extracting keyterms from a given text using various algorithms.
@@ -15,8 +11,13 @@ class KeytermExtractor:
             raw_text (str): The raw input text.
             top_n_values (int): The number of top keyterms to extract.
         """
+        import textacy
+
+        from scripts.utils.models import get_nlp
+
         self.raw_text = raw_text
-        self.text_doc = textacy.make_spacy_doc(self.raw_text, lang="en_core_web_md")
+        # Passing the shared Language keeps textacy from loading its own copy
+        self.text_doc = textacy.make_spacy_doc(self.raw_text, lang=get_nlp())
         self.top_n_values = top_n_values
 
     def get_keyterms_based_on_textrank(self):
@@ -26,6 +27,8 @@ class KeytermExtractor:
         Returns:
             List[str]: A list of top keyterms based on TextRank.
         """
+        from textacy import extract
+
         return list(
             extract.keyterms.textrank(
                 self.text_doc, normalize="lemma", topn=self.top_n_values
@@ -39,6 +42,8 @@ class KeytermExtractor:
         Returns:
             List[str]: A list of top keyterms based on SGRank.
         """
+        from textacy import extract
+
         return list(
             extract.keyterms.sgrank(
                 self.text_doc, normalize="lemma", topn=self.top_n_values
@@ -52,6 +57,8 @@ class KeytermExtractor:
         Returns:
             List[str]: A list of top keyterms based on sCAKE.
         """
+        from textacy import extract
+
         return list(
             extract.keyterms.scake(
                 self.text_doc, normalize="lemma", topn=self.top_n_values
@@ -65,6 +72,8 @@ class KeytermExtractor:
         Returns:
             List[str]: A list of top keyterms based on YAKE.
         """
+        from textacy import extract
+
         return list(
             extract.keyterms.yake(
                 self.text_doc, normalize="lemma", topn=self.top_n_values
@@ -78,8 +87,10 @@ class KeytermExtractor:
         Returns:
             List[str]: A list of bigrams.
         """
+        from textacy import extract
+
         return list(
-            textacy.extract.basics.ngrams(
+            extract.basics.ngrams(
                 self.text_doc,
                 n=2,
                 filter_stops=True,
@@ -95,8 +106,10 @@ class KeytermExtractor:
         Returns:
             List[str]: A list of trigrams.
         """
+        from textacy import extract
+
         return list(
-            textacy.extract.basics.ngrams(
+            extract.basics.ngrams(
                 self.text_doc,
                 n=3,
                 filter_stops=True,
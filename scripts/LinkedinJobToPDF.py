@@ -1,12 +1,15 @@
 import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from os import listdir
 from os.path import isfile, join
+from typing import List, NamedTuple, Optional
 
-import easygui
 import requests
-from bs4 import BeautifulSoup
-from pathvalidate import sanitize_filename
-from xhtml2pdf import pisa
+from bs4 import BeautifulSoup, SoupStrainer
+
+from scripts.parsers import ParseJobDesc
+from scripts.ReadDocument import strip_html
 
 """
 This script takes a LinkedIn job posting URL
@@ -14,66 +17,237 @@ and converts the description to a PDF file.
 The PDF file is saved in the Data/JobDescription folder.
 The name will be OrgName__Job Title_X.pdf, where X is the number of files in the folder.
 
+To analyze a posting, `linkedin_to_job_description` hands the text of the fetched
+description straight to ParseJobDesc instead; the PDF is then only rendered in the
+background when an archive copy is asked for.
+
 IMPORTANT: Make sure the URL is to the actual job description,
 and not the job search page.
 """
 
+JOB_PATH = "Data/JobDescription/"
 
-def linkedin_to_pdf(job_url: str):
+# Seconds to connect and to wait for the response, as in `JobFetcher.BulkFetcher`
+REQUEST_TIMEOUT = 10.0
 
-    job_path = "Data/JobDescription/"
-    job_description = ""
-    files_number = len([f for f in listdir(job_path) if isfile(join(job_path, f))])
+# The elements of a posting page that are read; the rest is not parsed
+POSTING_CLASSES = (
+    "topcard__title",
+    "topcard__flavor",
+    "topcard__org-name-link",
+    "show-more-less-html__markup",
+)
 
-    try:
-        page = requests.get(job_url)
+_archive_executor = None
+_archive_lock = threading.Lock()
 
-        if page.status_code != 200:
-            print(
-                f"Failed to retrieve the job posting at {job_url}. Status code: {page.status_code}"
-            )
-            return
+logger = logging.getLogger(__name__)
 
-        # Parse the HTML content of the job posting using BeautifulSoup
-        soup = BeautifulSoup(page.text, "html.parser")
 
-        # Find the job title element and get the text
-        job_title = soup.find("h1", {"class": "topcard__title"}).text.strip()
+class JobPosting(NamedTuple):
+    """The parts of a LinkedIn job posting page the pipeline uses."""
 
-        # Find the organization name element (try both selectors)
-        organization_element = soup.find("span", {"class": "topcard__flavor"})
+    url: str
+    title: str
+    organization: str
+    description_html: str
 
-        if not organization_element:
-            organization_element = soup.find("a", {"class": "topcard__org-name-link"})
 
-        # Extract the organization name
-        organization = organization_element.text.strip()
+def parse_job_posting(html: str, job_url: str = "") -> JobPosting:
+    """
+    Extract the title, organization and description markup of a posting page.
 
-        # Find the job description element
-        job_description_element = soup.find(
-            "div", {"class": "show-more-less-html__markup"}
-        )
+    Raises:
+        ValueError: The page has no job title, so it is not a job posting, e.g. a
+            search or sign-in page.
+    """
+    soup = BeautifulSoup(
+        html, "html.parser", parse_only=SoupStrainer(class_=POSTING_CLASSES)
+    )
+
+    # Find the job title element and get the text
+    job_title_element = soup.find("h1", {"class": "topcard__title"})
+    if job_title_element is None:
+        raise ValueError(f"No job title in {job_url or 'the page'}, not a job posting")
+    job_title = job_title_element.text.strip()
+
+    # Find the organization name element (try both selectors)
+    organization_element = soup.find("span", {"class": "topcard__flavor"})
+    if not organization_element:
+        organization_element = soup.find("a", {"class": "topcard__org-name-link"})
+    organization = organization_element.text.strip() if organization_element else ""
 
-        # Extract the job description and concatenate its elements
-        if job_description_element:
-            for element in job_description_element.contents:
-                job_description += str(element)
+    # Find the job description element and concatenate its elements
+    job_description_element = soup.find("div", {"class": "show-more-less-html__markup"})
+    job_description = ""
+    if job_description_element:
+        for element in job_description_element.contents:
+            job_description += str(element)
+
+    return JobPosting(job_url, job_title, organization, job_description)
 
-        # Set file_path and sanitize organization name and job title
-        file_path = f"{job_path}{sanitize_filename(organization + '__' + job_title)}_{files_number}.pdf"
 
-        # Create a PDF file and write the job description to it
-        with open(file_path, "wb") as pdf_file:
-            pisa.CreatePDF(job_description, dest=pdf_file, encoding="utf-8")
+def fetch_job_posting(job_url: str) -> Optional[JobPosting]:
+    """
+    Download and parse a posting. Returns None if the page could not be retrieved
+    or is not a job posting.
+    """
+    try:
+        page = requests.get(job_url, timeout=REQUEST_TIMEOUT)
+    except requests.RequestException as e:
+        logger.error(f"Failed to retrieve the job posting at {job_url}: {e}")
+        return None
+    if page.status_code != 200:
+        logger.error(
+            f"Failed to retrieve the job posting at {job_url}. "
+            f"Status code: {page.status_code}"
+        )
+        return None
+    try:
+        return parse_job_posting(page.text, job_url)
+    except ValueError as e:
+        logger.error(str(e))
+        return None
+
+
+def count_files(job_path: str = JOB_PATH) -> int:
+    """Return the number of files in `job_path`, which numbers the next PDF."""
+    return len([f for f in listdir(job_path) if isfile(join(job_path, f))])
+
+
+def save_pdf(
+    posting: JobPosting, job_path: str = JOB_PATH, files_number: int = None
+) -> str:
+    """
+    Render the description of a posting to a PDF in `job_path` and return its path.
+    Needs the optional xhtml2pdf and pathvalidate packages.
+
+    Args:
+        files_number (int): The number in the file name, `count_files` by default.
+    """
+    from pathvalidate import sanitize_filename
+    from xhtml2pdf import pisa
+
+    if files_number is None:
+        files_number = count_files(job_path)
+
+    # Set file_path and sanitize organization name and job title
+    file_name = sanitize_filename(posting.organization + "__" + posting.title)
+    file_path = f"{job_path}{file_name}_{files_number}.pdf"
+
+    # Create a PDF file and write the job description to it
+    with open(file_path, "wb") as pdf_file:
+        pisa.CreatePDF(posting.description_html, dest=pdf_file, encoding="utf-8")
+
+    logger.info("PDF saved to " + file_path)
+    return file_path
+
+
+def archive_pdf(posting: JobPosting, job_path: str = JOB_PATH) -> Future:
+    """
+    Render the PDF of a posting on a background thread, for archival only. Failures
+    are logged, not raised.
+
+    Returns:
+        Future: Resolves to the path of the PDF, or None if rendering failed.
+    """
+    global _archive_executor
+    with _archive_lock:
+        if _archive_executor is None:
+            _archive_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="job-pdf"
+            )
 
-        logging.info("PDF saved to " + file_path)
+    def render():
+        try:
+            return save_pdf(posting, job_path)
+        except Exception as e:
+            logger.error(f"Could not archive the job posting {posting.url}: {e}")
+            return None
+
+    return _archive_executor.submit(render)
+
+
+def job_posting_to_json(posting: JobPosting, archive: bool = False) -> dict:
+    """
+    Parse the description of a posting with ParseJobDesc, straight from its HTML.
+
+    Args:
+        posting (JobPosting): The fetched posting.
+        archive (bool): Also render the description to a PDF in the background.
+
+    Returns:
+        dict: `ParseJobDesc.get_JSON`, plus the "job_title" and "organization".
+    """
+    if archive:
+        archive_pdf(posting)
+    job_description = ParseJobDesc(strip_html(posting.description_html)).get_JSON()
+    job_description["job_title"] = posting.title
+    job_description["organization"] = posting.organization
+    return job_description
+
+
+def linkedin_to_job_description(job_url: str, archive: bool = False) -> dict:
+    """
+    Fetch a LinkedIn posting and parse its description without the round trip
+    through a PDF.
+
+    Returns:
+        dict: See `job_posting_to_json`, or None if the page could not be retrieved.
+    """
+    posting = fetch_job_posting(job_url)
+    if posting is None:
+        return None
+    return job_posting_to_json(posting, archive)
+
+
+def linkedin_to_pdf(job_url: str) -> Optional[str]:
+    """
+    Save a LinkedIn posting as a PDF. Returns its path, or None if the posting could
+    not be fetched or saved.
+    """
+    try:
+        posting = fetch_job_posting(job_url)
+        if posting is None:
+            return None
+        return save_pdf(posting)
 
     except Exception as e:
-        logging.error(f"Could not get the description from the URL: {job_url}")
-        logging.error(e)
-        exit()
+        logger.error(f"Could not get the description from the URL: {job_url}")
+        logger.error(e)
+        return None
+
+
+def linkedin_to_pdfs(job_urls: List[str], job_path: str = JOB_PATH, fetcher=None):
+    """
+    Fetch many postings concurrently with a `JobFetcher.BulkFetcher` and save the
+    new or changed ones as PDFs. The directory is counted once for the whole batch.
+    A fetcher created here is closed before returning; a given one is left open.
+
+    Returns:
+        List[FetchResult]: One result per URL; failures are reported, not raised.
+    """
+    from scripts.JobFetcher import FETCHED, BulkFetcher
+
+    if fetcher is None:
+        with BulkFetcher() as fetcher:
+            results = fetcher.fetch_all(job_urls)
+    else:
+        results = fetcher.fetch_all(job_urls)
+    files_number = count_files(job_path)
+    for result in results:
+        if result.status != FETCHED:
+            continue
+        try:
+            save_pdf(result.posting, job_path, files_number)
+            files_number += 1
+        except Exception as e:
+            logger.error(f"Could not save the posting {result.url}: {e}")
+    return results
 
 
 if __name__ == "__main__":
+    import easygui
+
     url = easygui.enterbox("Enter the URL of the LinkedIn Job Posting:").strip()
     linkedin_to_pdf(url)
@@ -0,0 +1,244 @@
+import importlib.util
+import logging
+import os
+from typing import Dict, Iterator, List, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+# Pages inspected by `probe_pdf`, from the start of the document
+PROBE_PAGES = 2
+# Above this many distinct fonts on the probed pages, a document is font-heavy
+FONT_HEAVY = 20
+# Native backends, fastest first, used whenever one is installed
+NATIVE_BACKENDS = ("pymupdf", "pdfium")
+
+
+class PdfProbe(NamedTuple):
+    """What `probe_pdf` learned about a file without extracting its text."""
+
+    size: int
+    pages: int
+    fonts: int
+    cid_fonts: bool
+    has_text: bool
+
+
+class PdfBackend:
+    """
+    Extracts the text of a PDF, one string per page.
+
+    Subclasses name the module they need in `module`; a backend whose module is not
+    installed is reported as unavailable instead of failing at import time.
+    """
+
+    name = None
+    module = None
+
+    @classmethod
+    def available(cls) -> bool:
+        return importlib.util.find_spec(cls.module) is not None
+
+    def extract_pages(self, file_path: str) -> List[str]:
+        raise NotImplementedError
+
+
+class PypdfBackend(PdfBackend):
+    """The pure-Python pypdf extractor, the fastest of the two bundled backends."""
+
+    name = "pypdf"
+    module = "pypdf"
+
+    def extract_pages(self, file_path, reader=None):
+        """
+        Args:
+            reader (PdfReader): The file already opened, as by `probe_pdf`.
+        """
+        from pypdf import PdfReader
+
+        reader = reader or PdfReader(file_path)
+        return [page.extract_text() or "" for page in reader.pages]
+
+
+class PdfminerBackend(PdfBackend):
+    """
+    pdfminer.six with the layout analysis cut down to words and lines: the text boxes
+    are kept in content-stream order instead of being sorted, the costly step of a
+    full layout. Without any layout analysis the spaces that PDFs such as TeX output
+    do not store are lost. pdfminer decodes CID fonts through their CMaps and copes
+    better than pypdf with font-heavy files.
+    """
+
+    name = "pdfminer"
+    module = "pdfminer"
+
+    def extract_pages(self, file_path):
+        from io import StringIO
+
+        from pdfminer.converter import TextConverter
+        from pdfminer.layout import LAParams
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+
+        resources = PDFResourceManager(caching=True)
+        laparams = LAParams(boxes_flow=None)
+        pages = []
+        with open(file_path, "rb") as f:
+            for page in PDFPage.get_pages(f):
+                output = StringIO()
+                converter = TextConverter(resources, output, laparams=laparams)
+                PDFPageInterpreter(resources, converter).process_page(page)
+                converter.close()
+                pages.append(output.getvalue())
+        return pages
+
+
+class PymupdfBackend(PdfBackend):
+    """The MuPDF C library through PyMuPDF, when installed."""
+
+    name = "pymupdf"
+    module = "fitz"
+
+    def extract_pages(self, file_path):
+        import fitz
+
+        with fitz.open(file_path) as document:
+            return [page.get_text() for page in document]
+
+
+class PdfiumBackend(PdfBackend):
+    """The PDFium C library through pypdfium2, when installed."""
+
+    name = "pdfium"
+    module = "pypdfium2"
+
+    def extract_pages(self, file_path):
+        import pypdfium2
+
+        document = pypdfium2.PdfDocument(file_path)
+        try:
+            return [
+                document[i].get_textpage().get_text_range()
+                for i in range(len(document))
+            ]
+        finally:
+            document.close()
+
+
+BACKENDS: Dict[str, PdfBackend] = {
+    backend.name: backend()
+    for backend in (PymupdfBackend, PdfiumBackend, PdfminerBackend, PypdfBackend)
+}
+
+
+def available_backends() -> List[str]:
+    """Return the names of the installed backends."""
+    return [name for name, backend in BACKENDS.items() if backend.available()]
+
+
+def _resource_fonts(resources, seen: set = None) -> Iterator:
+    """
+    Yield the font dictionaries of a resource dictionary, and of the Form XObjects it
+    draws, recursively: text drawn inside a form uses the fonts of the form.
+    """
+    if resources is None:
+        return
+    seen = set() if seen is None else seen
+    resources = resources.get_object()
+    font_dict = resources.get("/Font")
+    for font in (font_dict.get_object() if font_dict else {}).values():
+        yield font.get_object()
+    xobject_dict = resources.get("/XObject")
+    for reference in (xobject_dict.get_object() if xobject_dict else {}).values():
+        key = getattr(reference, "idnum", None) or id(reference)
+        if key in seen:
+            continue
+        seen.add(key)
+        xobject = reference.get_object()
+        if xobject.get("/Subtype") == "/Form":
+            yield from _resource_fonts(xobject.get("/Resources"), seen)
+
+
+def probe_pdf(file_path: str, reader=None) -> PdfProbe:
+    """
+    Inspect a PDF without extracting its text: its size, its page count and the
+    fonts of its first pages, including those of the forms they draw. pypdf only
+    reads the cross-reference table and the page dictionaries to answer, which
+    costs a fraction of an extraction.
+    """
+    from pypdf import PdfReader
+
+    reader = reader or PdfReader(file_path)
+    fonts, cid_fonts = set(), False
+    probed = reader.pages[:PROBE_PAGES]
+    for page in probed:
+        for font in _resource_fonts(page.get("/Resources")):
+            fonts.add(font.get("/BaseFont"))
+            cid_fonts = cid_fonts or font.get("/Subtype") == "/Type0"
+    return PdfProbe(
+        size=os.path.getsize(file_path),
+        pages=len(reader.pages),
+        fonts=len(fonts),
+        cid_fonts=cid_fonts,
+        has_text=bool(fonts),
+    )
+
+
+def select_backend(file_path: str, probe: PdfProbe = None) -> PdfBackend:
+    """
+    Choose the backend for a file.
+
+    The PDF_BACKEND environment variable forces a backend. Otherwise a native
+    backend is used when installed. Without one, pypdf reads the common case and
+    pdfminer the files with CID fonts or many fonts, on which pypdf is slowest.
+
+    A file without fonts has no text layer and goes to pypdf, which finds nothing
+    quickest.
+    """
+    forced = os.getenv("PDF_BACKEND")
+    if forced:
+        if forced not in BACKENDS:
+            raise ValueError(
+                f"Unknown PDF backend '{forced}', expected one of {list(BACKENDS)}"
+            )
+        return BACKENDS[forced]
+
+    if probe is None:
+        try:
+            probe = probe_pdf(file_path)
+        except Exception as e:
+            logger.warning(f"Could not probe '{file_path}', using pdfminer: {e}")
+            return BACKENDS["pdfminer"]
+
+    if not probe.has_text:
+        logger.warning(f"'{file_path}' has no text layer, OCR is not supported")
+        return BACKENDS["pypdf"]
+    for name in NATIVE_BACKENDS:
+        if BACKENDS[name].available():
+            return BACKENDS[name]
+    if probe.cid_fonts or probe.fonts > FONT_HEAVY:
+        return BACKENDS["pdfminer"]
+    return BACKENDS["pypdf"]
+
+
+def extract_pages(file_path: str, backend: str = None) -> List[str]:
+    """
+    Extract the text of each page of a PDF with the named backend, or with the one
+    `select_backend` picks. When the pick is pypdf, the reader opened to probe the
+    file is reused instead of parsing the file a second time.
+    """
+    if backend or os.getenv("PDF_BACKEND"):
+        pdf_backend = BACKENDS[backend] if backend else select_backend(file_path)
+        return pdf_backend.extract_pages(file_path)
+
+    from pypdf import PdfReader
+
+    try:
+        reader = PdfReader(file_path)
+        probe = probe_pdf(file_path, reader)
+    except Exception as e:
+        logger.warning(f"Could not probe '{file_path}', using pdfminer: {e}")
+        return BACKENDS["pdfminer"].extract_pages(file_path)
+    pdf_backend = select_backend(file_path, probe)
+    if pdf_backend is BACKENDS["pypdf"]:
+        return pdf_backend.extract_pages(file_path, reader)
+    return pdf_backend.extract_pages(file_path)
@@ -0,0 +1,178 @@
+import codecs
+import logging
+import mmap
+import re
+import zipfile
+from html.parser import HTMLParser
+from xml.etree import ElementTree
+
+from .ReadPdf import read_single_pdf
+from .utils.instrumentation import timed
+
+logger = logging.getLogger(__name__)
+
+PDF, DOCX, HTML, TEXT = "pdf", "docx", "html", "text"
+
+# Bytes read from the start of a file to tell its format
+SNIFF_BYTES = 1024
+READ_CHUNK = 64 * 1024
+
+# A document, or a fragment such as a scraped job description, opening with a tag
+_HTML_START = re.compile(rb"\s*<(?:!doctype\s+html|!--|[a-z][a-z0-9]*[\s/>])", re.I)
+_WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+# Tags whose content is not text, and tags that end a line when they close
+_SKIPPED_TAGS = {"script", "style", "noscript", "template", "head"}
+_BLOCK_TAGS = set(
+    "address article aside blockquote br dd div dl dt footer h1 h2 h3 h4 h5 h6 "
+    "header hr li main nav ol p pre section table td th title tr ul".split()
+)
+
+
+def sniff_format(file_path: str) -> str:
+    """
+    Tell the format of a document from its first bytes, whatever its extension.
+
+    Returns:
+        str: `PDF`, `DOCX`, `HTML` or `TEXT`.
+
+    Raises:
+        ValueError: For other binary formats, such as legacy .doc files or archives.
+    """
+    with open(file_path, "rb") as f:
+        head = f.read(SNIFF_BYTES)
+    if head.startswith(b"%PDF-"):
+        return PDF
+    if head.startswith(b"PK\x03\x04"):
+        with zipfile.ZipFile(file_path) as archive:
+            if "word/document.xml" in archive.namelist():
+                return DOCX
+        raise ValueError(f"Unsupported archive format: {file_path}")
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return TEXT
+    if b"\x00" in head:
+        raise ValueError(f"Unsupported binary format: {file_path}")
+    if _HTML_START.match(head.removeprefix(codecs.BOM_UTF8)):
+        return HTML
+    return TEXT
+
+
+def read_text(file_path: str) -> str:
+    """
+    Read a plain text file through a memory map, decoding straight from the mapped
+    pages without an intermediate bytes copy. UTF-8 is assumed unless the file has a
+    UTF-16 byte order mark; undecodable bytes are replaced.
+    """
+    with open(file_path, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            return ""
+        with mapped:
+            bom = mapped[:2]
+            encoding = (
+                "utf-16"
+                if bom in (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)
+                else "utf-8-sig"
+            )
+            return str(mapped, encoding, "replace")
+
+
+class _TagStripper(HTMLParser):
+    """Collects the text of an HTML document, with a line break per block."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skipping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIPPED_TAGS:
+            self._skipping += 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in _SKIPPED_TAGS:
+            self._skipping = max(0, self._skipping - 1)
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skipping:
+            self.parts.append(data)
+
+    def text(self) -> str:
+        lines = (" ".join(line.split()) for line in "".join(self.parts).splitlines())
+        return "\n".join(line for line in lines if line)
+
+
+def strip_html(html: str) -> str:
+    """
+    Return the text of an HTML document or fragment, one line per block element.
+    """
+    stripper = _TagStripper()
+    stripper.feed(html)
+    stripper.close()
+    return stripper.text()
+
+
+def read_html(file_path: str) -> str:
+    """
+    Read the text of an HTML file. The file is decoded and fed to the tag stripper
+    in chunks, so no DOM is built; scripts and styles are dropped and each block
+    element ends a line.
+    """
+    stripper = _TagStripper()
+    decoder = codecs.getincrementaldecoder("utf-8-sig")("replace")
+    with open(file_path, "rb") as f:
+        while chunk := f.read(READ_CHUNK):
+            stripper.feed(decoder.decode(chunk))
+    stripper.feed(decoder.decode(b"", final=True))
+    stripper.close()
+    return stripper.text()
+
+
+def read_docx(file_path: str) -> str:
+    """
+    Read the text of a .docx file straight from word/document.xml, streaming the XML
+    and clearing each paragraph once read. Tabs and breaks are kept and each
+    paragraph ends a line.
+    """
+    parts = []
+    with zipfile.ZipFile(file_path) as archive:
+        with archive.open("word/document.xml") as document:
+            for _, element in ElementTree.iterparse(document):
+                tag = element.tag
+                if tag == _WORD_NAMESPACE + "t":
+                    parts.append(element.text or "")
+                elif tag == _WORD_NAMESPACE + "tab":
+                    parts.append("\t")
+                elif tag in (_WORD_NAMESPACE + "br", _WORD_NAMESPACE + "cr"):
+                    parts.append("\n")
+                elif tag == _WORD_NAMESPACE + "p":
+                    parts.append("\n")
+                    element.clear()
+    return "".join(parts)
+
+
+READERS = {PDF: read_single_pdf, DOCX: read_docx, HTML: read_html, TEXT: read_text}
+
+
+@timed("read_document")
+def read_document(file_path: str) -> str:
+    """
+    Read the text of a resume or job description in any supported format. The
+    format is sniffed from the first bytes of the file, so only PDFs go through PDF
+    extraction.
+
+    Args:
+        file_path (str): The path of a PDF, DOCX, HTML or plain text file.
+
+    Returns:
+        str: The text of the document.
+    """
+    document_format = sniff_format(file_path)
+    logger.debug(f"Reading {file_path} as {document_format}")
+    return READERS[document_format](file_path)
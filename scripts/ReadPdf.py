@@ -1,7 +1,11 @@
 import glob
+import logging
 import os
 
-from pypdf import PdfReader
+from .PdfBackends import extract_pages
+from .utils.instrumentation import timed
+
+logger = logging.getLogger(__name__)
 
 
 def get_pdf_files(file_path):
@@ -34,37 +38,30 @@ def read_multiple_pdf(file_path: str) -> list:
     output = []
     for file in pdf_files:
         try:
-            with open(file, "rb") as f:
-                pdf_reader = PdfReader(f)
-                count = pdf_reader.getNumPages()
-                for i in range(count):
-                    page = pdf_reader.getPage(i)
-                    output.append(page.extractText())
+            output.extend(extract_pages(file))
         except Exception as e:
-            print(f"Error reading file '{file}': {str(e)}")
+            logger.error(f"Error reading file '{file}': {str(e)}")
     return output
 
 
-def read_single_pdf(file_path: str) -> str:
+@timed("read_pdf")
+def read_single_pdf(file_path: str, backend: str = None) -> str:
     """
     Read a single PDF file and extract the text from each page.
 
     Args:
         file_path (str): The path of the PDF file.
+        backend (str): The name of a backend in `PdfBackends.BACKENDS`. By default
+            one is chosen for the file by `PdfBackends.select_backend`.
 
     Returns:
-        list: A list containing the extracted text from each page of the PDF file.
+        str: The text of the pages, joined with spaces.
     """
     output = []
     try:
-        with open(file_path, "rb") as f:
-            pdf_reader = PdfReader(f)
-            count = len(pdf_reader.pages)
-            for i in range(count):
-                page = pdf_reader.pages[i]
-                output.append(page.extract_text())
+        output = extract_pages(file_path, backend)
     except Exception as e:
-        print(f"Error reading file '{file_path}': {str(e)}")
+        logger.error(f"Error reading file '{file_path}': {str(e)}")
     return str(" ".join(output))
 
 
@@ -82,5 +79,5 @@ def get_pdf_files(file_path: str) -> list:
     try:
         pdf_files = glob.glob(os.path.join(file_path, "*.pdf"))
     except Exception as e:
-        print(f"Error getting PDF files from '{file_path}': {str(e)}")
+        logger.error(f"Error getting PDF files from '{file_path}': {str(e)}")
     return pdf_files
@@ -3,7 +3,7 @@ import os.path
 import pathlib
 
 from .parsers import ParseJobDesc, ParseResume
-from .ReadPdf import read_single_pdf
+from .ReadDocument import read_document
 
 READ_RESUME_FROM = "Data/Resumes/"
 SAVE_DIRECTORY = "Data/Processed/Resumes"
@@ -24,12 +24,12 @@ class ResumeProcessor:
             return False
 
     def _read_resumes(self) -> dict:
-        data = read_single_pdf(self.input_file_name)
+        data = read_document(self.input_file_name)
         output = ParseResume(data).get_JSON()
         return output
 
     def _read_job_desc(self) -> dict:
-        data = read_single_pdf(self.input_file_name)
+        data = read_document(self.input_file_name)
         output = ParseJobDesc(data).get_JSON()
         return output
 
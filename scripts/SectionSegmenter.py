@@ -0,0 +1,199 @@
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+# Canonical section name -> the header variants that open it, lowercase
+SECTION_ALIASES = {
+    "contact": [
+        "contact",
+        "contact information",
+        "contact details",
+        "personal information",
+        "personal details",
+    ],
+    "summary": [
+        "summary",
+        "professional summary",
+        "career summary",
+        "executive summary",
+        "objective",
+        "career objective",
+        "profile",
+        "professional profile",
+        "about me",
+    ],
+    "experience": [
+        "experience",
+        "work experience",
+        "professional experience",
+        "relevant experience",
+        "employment",
+        "employment history",
+        "work history",
+        "career history",
+        "internship experience",
+        "internships",
+        "volunteer experience",
+        "leadership experience",
+        "research experience",
+        "teaching experience",
+    ],
+    "education": [
+        "education",
+        "education and training",
+        "academic background",
+        "academic qualifications",
+        "qualifications",
+    ],
+    "skills": [
+        "skills",
+        "key skills",
+        "core competencies",
+        "technical skills",
+        "computer skills",
+        "programming languages",
+        "software skills",
+        "soft skills",
+        "language skills",
+        "languages",
+        "professional skills",
+        "transferable skills",
+        "skills and abilities",
+    ],
+    "projects": ["projects", "personal projects", "academic projects", "key projects"],
+    "certifications": [
+        "certifications",
+        "certificates",
+        "licenses",
+        "licenses and certifications",
+        "certifications and licenses",
+    ],
+    "awards": ["awards", "honors", "honors and awards", "awards and honors"],
+    "publications": ["publications"],
+    "references": ["references"],
+    "interests": ["interests", "hobbies", "hobbies and interests"],
+}
+
+HEADER_SECTION = "header"
+
+# Page markers ("1 ", "1/2 "), bullets and decorations around a header line
+_LINE_PREFIX = re.compile(r"^[\s\d/•·\-–*#>|]*")
+_SEPARATORS = re.compile(r"[\s_]+")
+
+
+class Section(NamedTuple):
+    """A section of a document: its canonical name and its [start, end) span."""
+
+    name: str
+    start: int
+    end: int
+    text: str
+
+
+def normalize_line(line: str) -> str:
+    """
+    Lowercase a line and strip the page markers, bullets, ampersands and spacing that
+    vary between renderings of the same header.
+    """
+    line = _LINE_PREFIX.sub("", line).replace("&", " and ")
+    return _SEPARATORS.sub(" ", line).strip().lower()
+
+
+def _trie_pattern(variants: Iterable[str]) -> str:
+    """
+    Compile the variants into a regex that is a trie, so a line is matched against
+    every variant in a single left-to-right scan without backtracking over
+    alternatives that share a prefix.
+    """
+    trie: Dict = {}
+    for variant in variants:
+        node = trie
+        for char in variant:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        end = "" in node
+        branches = [
+            re.escape(char) + build(child) for char, child in node.items() if char
+        ]
+        if not branches:
+            return ""
+        group = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if end:
+            return "(?:" + group + ")?"
+        return group
+
+    return build(trie)
+
+
+class SectionSegmenter:
+    """
+    Splits a resume into its sections in one pass over the lines.
+
+    A line opens a section when, once normalized, it is a header variant, optionally
+    followed by a colon and inline content such as "Skills: Python, SQL". Lines
+    before the first header belong to the "header" section.
+    """
+
+    def __init__(self, aliases: Dict[str, List[str]] = None):
+        """
+        Args:
+            aliases (Dict[str, List[str]]): Canonical section name -> header variants.
+                Defaults to `SECTION_ALIASES`.
+        """
+        aliases = aliases or SECTION_ALIASES
+        self.sections = {
+            normalize_line(variant): name
+            for name, variants in aliases.items()
+            for variant in variants
+        }
+        self.pattern = re.compile(
+            r"(" + _trie_pattern(self.sections) + r")\s*(?::.*)?$"
+        )
+
+    def match_header(self, line: str) -> Optional[str]:
+        """
+        Return the canonical section a line opens, or None if it is not a header.
+        """
+        match = self.pattern.match(normalize_line(line))
+        return self.sections[match.group(1)] if match else None
+
+    def segment(self, text: str) -> List[Section]:
+        """
+        Split a text into sections. The sections are contiguous and cover the text,
+        header lines included, so the texts joined back give the input.
+
+        Returns:
+            List[Section]: The sections in document order. A name can repeat.
+        """
+        sections = []
+        name, start, offset = HEADER_SECTION, 0, 0
+        for line in text.splitlines(keepends=True):
+            header = self.match_header(line)
+            if header and offset > start:
+                sections.append(Section(name, start, offset, text[start:offset]))
+                start = offset
+            if header:
+                name = header
+            offset += len(line)
+        if offset > start:
+            sections.append(Section(name, start, offset, text[start:offset]))
+        return sections
+
+    def extract(self, text: str, *names: str) -> str:
+        """
+        Return the text of the sections with the given canonical names, in document
+        order.
+        """
+        return "".join(
+            section.text for section in self.segment(text) if section.name in names
+        )
+
+
+@lru_cache(maxsize=None)
+def get_segmenter() -> SectionSegmenter:
+    """
+    Return the shared segmenter over `SECTION_ALIASES`, compiled on first use.
+    """
+    return SectionSegmenter()
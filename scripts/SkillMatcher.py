@@ -0,0 +1,173 @@
+import csv
+import json
+import logging
+import os
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TAXONOMY = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "skill_taxonomy.json"
+)
+
+# Keeps "c++", "c#", ".net", "node.js" and "ci/cd"-style pieces as single tokens
+SKILL_TOKEN_PATTERN = re.compile(r"\.?[a-z0-9][a-z0-9+#]*(?:[.\-][a-z0-9+#]+)*")
+
+
+class SkillMatch(NamedTuple):
+    """A canonical skill found in a text, with its [start, end) token span."""
+
+    skill: str
+    start: int
+    end: int
+
+
+def skill_tokens(text: str) -> List[str]:
+    """
+    Lowercase a text and split it into the tokens the skill automaton runs on.
+    """
+    return SKILL_TOKEN_PATTERN.findall(text.lower())
+
+
+class SkillMatcher:
+    """
+    Finds the skills of a taxonomy in a text with an Aho-Corasick automaton over
+    tokens. The automaton is built once from every alias; a text is then scanned in
+    a single pass whose cost does not depend on the size of the taxonomy.
+
+    Overlapping matches are resolved leftmost-longest, so "Spring Boot" is reported
+    once and not also as "Spring".
+    """
+
+    def __init__(self, taxonomy: Dict[str, Iterable[str]]):
+        """
+        Args:
+            taxonomy (Dict[str, Iterable[str]]): Canonical skill -> its aliases. Only
+                the listed aliases are matched, so a skill named by a common word,
+                such as "Go" or "C", lists its unambiguous spellings; the canonical
+                name is matched only for a skill without aliases.
+        """
+        # Node i has transitions _goto[i], failure link _fail[i] and the canonical
+        # skills with their token lengths that end at it in _output[i]
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List] = [[]]
+        self.size = 0
+
+        for skill, aliases in taxonomy.items():
+            for alias in set(aliases) or {skill}:
+                tokens = skill_tokens(alias)
+                if tokens:
+                    self._add(tokens, skill)
+        self._build_failure_links()
+
+    def _add(self, tokens: List[str], skill: str):
+        node = 0
+        for token in tokens:
+            if token not in self._goto[node]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[node][token] = len(self._goto) - 1
+            node = self._goto[node][token]
+        if (skill, len(tokens)) not in self._output[node]:
+            self._output[node].append((skill, len(tokens)))
+            self.size += 1
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(token, 0)
+                self._output[child] = (
+                    self._output[child] + self._output[self._fail[child]]
+                )
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillMatcher":
+        """
+        Load a taxonomy file: JSON mapping canonical skills to lists of aliases, or
+        CSV rows of "skill,alias", such as an export of ESCO or O*NET.
+        """
+        taxonomy: Dict[str, List[str]] = {}
+        with open(path, encoding="utf-8") as f:
+            if path.lower().endswith(".csv"):
+                for row in csv.reader(f):
+                    if row and row[0].strip():
+                        taxonomy.setdefault(row[0].strip(), []).extend(
+                            alias.strip() for alias in row[1:] if alias.strip()
+                        )
+            else:
+                taxonomy = json.load(f)
+        matcher = cls(taxonomy)
+        logger.info(f"Loaded {matcher.size} skill aliases from {path}")
+        return matcher
+
+    def find(self, text: str) -> List[SkillMatch]:
+        """
+        Return the non-overlapping skill matches of a text in document order.
+        """
+        matches = []
+        node = 0
+        for position, token in enumerate(skill_tokens(text)):
+            while node and token not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(token, 0)
+            for skill, length in self._output[node]:
+                matches.append(SkillMatch(skill, position - length + 1, position + 1))
+
+        matches.sort(key=lambda match: (match.start, match.start - match.end))
+        selected, covered = [], 0
+        for match in matches:
+            if match.start >= covered:
+                selected.append(match)
+                covered = match.end
+        return selected
+
+    def extract(self, text: str) -> List[str]:
+        """
+        Return the canonical skills of a text, each once, in order of first mention.
+        """
+        return list(dict.fromkeys(match.skill for match in self.find(text)))
+
+    def coverage(self, resume_text: str, job_text: str) -> dict:
+        """
+        Compare the skills of a resume with those a job description asks for.
+
+        Returns:
+            dict: "score", the share of job skills the resume has (0-100), and the
+            "matched_skills" and "missing_skills" lists.
+        """
+        return skill_coverage(self.extract(resume_text), self.extract(job_text))
+
+
+def skill_coverage(resume_skills: List[str], job_skills: List[str]) -> dict:
+    """
+    Compute the coverage of the job skills by the resume skills by set intersection.
+    """
+    have = set(resume_skills)
+    matched = [skill for skill in job_skills if skill in have]
+    missing = [skill for skill in job_skills if skill not in have]
+    score = 100 * len(matched) / len(job_skills) if job_skills else 0.0
+    return {
+        "score": round(score, 2),
+        "matched_skills": matched,
+        "missing_skills": missing,
+    }
+
+
+@lru_cache(maxsize=None)
+def get_skill_matcher() -> SkillMatcher:
+    """
+    Return the shared matcher, built on first use from the SKILL_TAXONOMY file if it
+    is set and from the bundled taxonomy otherwise.
+    """
+    return SkillMatcher.from_file(os.getenv("SKILL_TAXONOMY") or DEFAULT_TAXONOMY)
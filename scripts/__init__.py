@@ -1,3 +1,23 @@
+import logging
+
 from . import ReadPdf
 from .JobDescriptionProcessor import JobDescriptionProcessor
 from .ResumeProcessor import ResumeProcessor
+
+
+def init(basic_log_level=logging.INFO):
+    """
+    Configure logging and load the spaCy models, the skill taxonomy and the stop words
+    of the fast mode up front.
+
+    Importing the package is kept free of side effects so short-lived scripts start
+    quickly; long-running processes call this once to pay the model load before the
+    first document arrives.
+    """
+    from .processor import load_fast_mode
+    from .utils import init_logging_config
+    from .utils.models import get_nlp
+
+    init_logging_config(basic_log_level=basic_log_level)
+    load_fast_mode()
+    get_nlp()
@@ -0,0 +1,128 @@
+from functools import wraps
+from typing import Dict, Iterable, Tuple
+
+from scripts.parsers.ParseLongDocument import (
+    LONG_DOCUMENT_CHARS,
+    ChunkedParser,
+    ngrams_repr,
+)
+from scripts.utils.instrumentation import stage
+from scripts.utils.Utils import generate_unique_id
+
+
+class memoized:
+    """
+    A lazy attribute computed on first access and stored in the instance
+    `__dict__`, which then shadows it. Unlike `functools.cached_property` before
+    Python 3.12, it takes no lock shared by all instances, so parsers on different
+    threads do not wait for each other; two threads reading the same new attribute
+    of one instance may both compute it.
+    """
+
+    def __init__(self, compute):
+        self.compute = compute
+        self.name = compute.__name__
+        self.__doc__ = compute.__doc__
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = self.compute(instance)
+        instance.__dict__[self.name] = value
+        return value
+
+
+def parser_field(stage_name: str = None, chunked: bool = False):
+    """
+    Declare a field of a `LazyParser`: computed on first access, timed under
+    "<STAGE_PREFIX>.<stage_name>", then memoized on the instance. The fields it
+    reads are computed first, so asking for a field computes exactly it and its
+    dependencies.
+
+    Args:
+        stage_name (str): The instrumentation stage of the computation.
+        chunked (bool): For documents too long for a single Doc, the value comes
+            from the `ChunkedParser` result of the same name.
+    """
+
+    def decorator(compute):
+        @wraps(compute)
+        def getter(self):
+            if chunked and self.parsed_in_chunks:
+                return self.chunked_fields[compute.__name__]
+            if stage_name is None:
+                return compute(self)
+            with stage(f"{self.STAGE_PREFIX}.{stage_name}"):
+                return compute(self)
+
+        return memoized(getter)
+
+    return decorator
+
+
+class LazyParser:
+    """
+    Base class of the document parsers. No field is computed until `get_JSON` or
+    an attribute asks for it.
+
+    Subclasses declare their JSON fields with `parser_field`, list them in FIELDS
+    and name field sets per use in PROFILES.
+    """
+
+    STAGE_PREFIX = "document"
+    FIELDS: Tuple[str, ...] = ()
+    PROFILES: Dict[str, Tuple[str, ...]] = {}
+
+    def __init__(self, text: str):
+        self.text = text
+
+    @property
+    def parsed_in_chunks(self) -> bool:
+        return len(self.text) > LONG_DOCUMENT_CHARS
+
+    @memoized
+    def chunked_fields(self) -> dict:
+        # Too long for a single Doc: stream it through the model in chunks
+        return ChunkedParser().parse(self.text, self.STAGE_PREFIX)
+
+    @memoized
+    def unique_id(self) -> str:
+        return generate_unique_id()
+
+    def select_fields(
+        self, fields: Iterable[str] = None, profile: str = None
+    ) -> Tuple[str, ...]:
+        """
+        Resolve the requested fields, in FIELDS order. With neither a field set nor
+        a profile, every field is selected.
+        """
+        if profile is not None:
+            if profile not in self.PROFILES:
+                expected = list(self.PROFILES)
+                raise ValueError(
+                    f"Unknown profile '{profile}', expected one of {expected}"
+                )
+            fields = self.PROFILES[profile]
+        if fields is None:
+            return self.FIELDS
+        unknown = set(fields) - set(self.FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields {sorted(unknown)}")
+        return tuple(name for name in self.FIELDS if name in set(fields))
+
+    def get_JSON(self, fields: Iterable[str] = None, profile: str = None) -> dict:
+        """
+        Return the requested fields of the document, always with its "unique_id".
+
+        Args:
+            fields (Iterable[str]): Field names from FIELDS.
+            profile (str): The name of a field set in PROFILES, instead of `fields`.
+        """
+        output = {"unique_id": self.unique_id}
+        for name in self.select_fields(fields, profile):
+            value = getattr(self, name)
+            output[name] = ngrams_repr(value) if name.endswith("_grams") else value
+        return output
@@ -4,37 +4,76 @@ import pathlib
 
 from scripts.Extractor import DataExtractor
 from scripts.KeytermsExtraction import KeytermExtractor
-from scripts.utils.Utils import CountFrequency, TextCleaner, generate_unique_id
+from scripts.parsers.ParseFields import LazyParser, memoized, parser_field
+from scripts.utils.Utils import TextCleaner
 
 SAVE_DIRECTORY = "../../Data/Processed/JobDescription"
 
 
-class ParseJobDesc:
+class ParseJobDesc(LazyParser):
+    """
+    Parses a job description. Fields are computed on demand, see `ParseResume`.
+    """
+
+    STAGE_PREFIX = "job_description"
+    FIELDS = (
+        "job_desc_data",
+        "clean_data",
+        "entities",
+        "extracted_keywords",
+        "keyword_counts",
+        "keyterms",
+        "bi_grams",
+        "tri_grams",
+        "pos_frequencies",
+    )
+    PROFILES = {
+        "full": FIELDS,
+        "keywords": ("extracted_keywords", "keyword_counts"),
+        "scoring": ("clean_data", "extracted_keywords", "keyword_counts", "keyterms"),
+    }
 
     def __init__(self, job_desc: str):
+        super().__init__(job_desc)
         self.job_desc_data = job_desc
-        self.clean_data = TextCleaner.clean_text(self.job_desc_data)
-        self.entities = DataExtractor(self.clean_data).extract_entities()
-        self.key_words = DataExtractor(self.clean_data).extract_particular_words()
-        self.pos_frequencies = CountFrequency(self.clean_data).count_frequency()
-        self.keyterms = KeytermExtractor(self.clean_data).get_keyterms_based_on_sgrank()
-        self.bi_grams = KeytermExtractor(self.clean_data).bi_gramchunker()
-        self.tri_grams = KeytermExtractor(self.clean_data).tri_gramchunker()
-
-    def get_JSON(self) -> dict:
-        """
-        Returns a dictionary of job description data.
-        """
-        job_desc_dictionary = {
-            "unique_id": generate_unique_id(),
-            "job_desc_data": self.job_desc_data,
-            "clean_data": self.clean_data,
-            "entities": self.entities,
-            "extracted_keywords": self.key_words,
-            "keyterms": self.keyterms,
-            "bi_grams": str(self.bi_grams),
-            "tri_grams": str(self.tri_grams),
-            "pos_frequencies": self.pos_frequencies,
-        }
-
-        return job_desc_dictionary
+
+    @memoized
+    def extractor(self) -> DataExtractor:
+        # One parse of the clean text serves every extractor below
+        return DataExtractor(self.clean_data)
+
+    @memoized
+    def keyterm_extractor(self) -> KeytermExtractor:
+        return KeytermExtractor(self.clean_data)
+
+    @parser_field("cleaning", chunked=True)
+    def clean_data(self):
+        return TextCleaner.clean_text(self.job_desc_data)
+
+    @parser_field("entities", chunked=True)
+    def entities(self):
+        return self.extractor.extract_entities()
+
+    @parser_field("extraction", chunked=True)
+    def keyword_counts(self):
+        return self.extractor.extract_keyword_counts()
+
+    @parser_field()
+    def extracted_keywords(self):
+        return list(self.keyword_counts)
+
+    @parser_field("pos_frequencies", chunked=True)
+    def pos_frequencies(self):
+        return self.extractor.count_pos()
+
+    @parser_field("sgrank", chunked=True)
+    def keyterms(self):
+        return self.keyterm_extractor.get_keyterms_based_on_sgrank()
+
+    @parser_field("ngrams", chunked=True)
+    def bi_grams(self):
+        return self.keyterm_extractor.bi_gramchunker()
+
+    @parser_field("ngrams", chunked=True)
+    def tri_grams(self):
+        return self.keyterm_extractor.tri_gramchunker()
@@ -0,0 +1,181 @@
+import os
+import re
+from collections import Counter
+from typing import Iterator, List
+
+from scripts.SectionSegmenter import get_segmenter
+from scripts.utils.instrumentation import stage
+from scripts.utils.models import get_nlp
+from scripts.utils.Utils import REGEX_PATTERNS
+
+# Documents longer than this many characters are parsed in chunks
+LONG_DOCUMENT_CHARS = int(os.getenv("LONG_DOCUMENT_CHARS", "100000"))
+MAX_CHUNK_CHARS = 20000
+TOP_KEYTERMS = 20
+# Distinct n-grams kept per document, most frequent first
+MAX_NGRAMS = 1000
+
+PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n")
+
+
+def _pieces(text: str, max_chars: int) -> Iterator[str]:
+    """Yield the paragraphs of a text, cutting the longer ones on lines or spaces."""
+    start = 0
+    for match in PARAGRAPH_BREAK.finditer(text):
+        yield from _cut(text[start : match.end()], max_chars)
+        start = match.end()
+    if start < len(text):
+        yield from _cut(text[start:], max_chars)
+
+
+def _cut(paragraph: str, max_chars: int) -> Iterator[str]:
+    while len(paragraph) > max_chars:
+        cut = paragraph.rfind("\n", 0, max_chars)
+        if cut <= 0:
+            cut = paragraph.rfind(" ", 0, max_chars)
+        cut = cut + 1 if cut > 0 else max_chars
+        yield paragraph[:cut]
+        paragraph = paragraph[cut:]
+    if paragraph:
+        yield paragraph
+
+
+def split_into_chunks(text: str, max_chars: int = MAX_CHUNK_CHARS) -> Iterator[str]:
+    """
+    Split a long text into chunks of at most `max_chars` characters. Chunks end on
+    section boundaries or paragraph breaks where possible, then on line breaks, then
+    on spaces, so a sentence is only cut when a single line is longer than a chunk.
+    Joined back, the chunks give the text.
+    """
+    chunk: List[str] = []
+    size = 0
+    for section in get_segmenter().segment(text):
+        for piece in _pieces(section.text, max_chars):
+            if size + len(piece) > max_chars and chunk:
+                yield "".join(chunk)
+                chunk, size = [], 0
+            chunk.append(piece)
+            size += len(piece)
+    if chunk:
+        yield "".join(chunk)
+
+
+def ngrams_repr(ngrams) -> str:
+    """Format n-grams like str() of the list of spans the parsers store."""
+    return "[" + ", ".join(str(ngram) for ngram in ngrams) + "]"
+
+
+def remove_patterns(text: str) -> str:
+    """Remove the emails, phones and links, like `TextCleaner.remove_emails_links`."""
+    for pattern in REGEX_PATTERNS.values():
+        text = re.sub(pattern, "", text)
+    return text
+
+
+def remove_punctuation(doc) -> str:
+    """Remove the punctuation tokens of a chunk, like `TextCleaner.clean_text`."""
+    text = doc.text
+    for punct in {token.text for token in doc if token.pos_ == "PUNCT"}:
+        text = text.replace(punct, "")
+    return text
+
+
+class ChunkedParser:
+    """
+    Parses documents too long to hold as a single spaCy Doc.
+
+    The text is split into chunks that are cleaned and parsed through `nlp.pipe` one
+    batch at a time. Each chunk Doc is reduced to counters and dropped before the next
+    one is parsed, so peak memory depends on the chunk size and not on the length of
+    the document. The per-chunk entities, keywords, POS counts, keyterms and n-grams
+    are merged into the fields of the regular parsers.
+    """
+
+    def __init__(self, nlp=None, max_chunk_chars: int = MAX_CHUNK_CHARS, batch_size=2):
+        """
+        Args:
+            nlp (Language): The pipeline, the shared model of `models.get_nlp` by
+                default.
+            max_chunk_chars (int): The maximum size of a chunk.
+            batch_size (int): How many chunks `nlp.pipe` parses together.
+        """
+        self.nlp = nlp
+        self.max_chunk_chars = max_chunk_chars
+        self.batch_size = batch_size
+
+    def _pipe(self, texts):
+        nlp = self.nlp or get_nlp()
+        return nlp.pipe(texts, batch_size=self.batch_size)
+
+    def parse(self, text: str, prefix: str = "document") -> dict:
+        """
+        Parse a long text in chunks.
+
+        Args:
+            text (str): The raw text.
+            prefix (str): The prefix of the stage timings, "resume" or
+                "job_description".
+
+        Returns:
+            dict: "clean_data", "entities", "name", "keyword_counts",
+            "pos_frequencies", "keyterms", "bi_grams" and "tri_grams".
+        """
+        from spacy.symbols import NOUN, PROPN
+        from textacy import extract
+
+        chunks = split_into_chunks(text, self.max_chunk_chars)
+        clean_chunks = (
+            remove_punctuation(doc)
+            for doc in self._pipe(remove_patterns(chunk) for chunk in chunks)
+        )
+
+        clean_data, entities, name = [], {}, None
+        keyword_counts, pos_frequencies = Counter(), Counter()
+        keyterm_scores = Counter()
+        ngrams = {2: Counter(), 3: Counter()}
+        for doc in self._pipe(clean_chunks):
+            clean_data.append(doc.text)
+            with stage(f"{prefix}.entities"):
+                for ent in doc.ents:
+                    if ent.label_ in ("GPE", "ORG"):
+                        entities.setdefault(ent.text, None)
+                if name is None:
+                    # Like the regular parsers, names are looked for at the very top
+                    head = (self.nlp or get_nlp())(doc.text[:30])
+                    name = [ent.text for ent in head.ents if ent.label_ == "PERSON"]
+            with stage(f"{prefix}.extraction"):
+                keyword_counts.update(
+                    token.text for token in doc if token.pos in (NOUN, PROPN)
+                )
+            with stage(f"{prefix}.pos_frequencies"):
+                pos_frequencies.update(token.pos_ for token in doc)
+            with stage(f"{prefix}.sgrank"):
+                # Weight the keyterms of a chunk by its share of the document
+                weight = len(doc.text) / max(1, len(text))
+                for term, score in extract.keyterms.sgrank(
+                    doc, normalize="lemma", topn=TOP_KEYTERMS
+                ):
+                    keyterm_scores[term] += score * weight
+            with stage(f"{prefix}.ngrams"):
+                for n, counts in ngrams.items():
+                    counts.update(
+                        span.text
+                        for span in extract.basics.ngrams(
+                            doc,
+                            n=n,
+                            filter_stops=True,
+                            filter_nums=True,
+                            filter_punct=True,
+                        )
+                    )
+
+        return {
+            "clean_data": "".join(clean_data),
+            "entities": list(entities),
+            "name": name or [],
+            "keyword_counts": dict(keyword_counts),
+            "pos_frequencies": dict(pos_frequencies),
+            "keyterms": keyterm_scores.most_common(TOP_KEYTERMS),
+            "bi_grams": [ngram for ngram, _ in ngrams[2].most_common(MAX_NGRAMS)],
+            "tri_grams": [ngram for ngram, _ in ngrams[3].most_common(MAX_NGRAMS)],
+        }
@@ -1,51 +1,274 @@
+import hashlib
 import json
 import os
 import os.path
 import pathlib
+import threading
+from collections import Counter, OrderedDict
+
+import numpy as np
 
 from scripts.Extractor import DataExtractor
 from scripts.KeytermsExtraction import KeytermExtractor
-from scripts.utils.Utils import CountFrequency, TextCleaner, generate_unique_id
+from scripts.parsers.ParseFields import LazyParser, memoized, parser_field
+from scripts.parsers.ParseLongDocument import ngrams_repr
+from scripts.SectionSegmenter import get_segmenter
+from scripts.utils.instrumentation import stage
+from scripts.utils.Utils import TextCleaner, generate_unique_id
 
 SAVE_DIRECTORY = "../../Data/Processed/Resumes"
 
+TOP_KEYTERMS = 20
+
+
+class ParseResume(LazyParser):
+    """
+    Parses a resume. Fields are computed on demand: `get_JSON(profile="keywords")`
+    parses the text once for the nouns and skips entities, SGRank and n-grams.
+    """
 
-class ParseResume:
+    STAGE_PREFIX = "resume"
+    FIELDS = (
+        "resume_data",
+        "clean_data",
+        "entities",
+        "extracted_keywords",
+        "keyword_counts",
+        "keyterms",
+        "name",
+        "experience",
+        "emails",
+        "phones",
+        "years",
+        "bi_grams",
+        "tri_grams",
+        "pos_frequencies",
+    )
+    PROFILES = {
+        "full": FIELDS,
+        "keywords": ("extracted_keywords", "keyword_counts"),
+        "contact": ("name", "emails", "phones"),
+        "scoring": ("clean_data", "extracted_keywords", "keyword_counts", "keyterms"),
+    }
 
     def __init__(self, resume: str):
+        super().__init__(resume)
         self.resume_data = resume
-        self.clean_data = TextCleaner.clean_text(self.resume_data)
-        self.entities = DataExtractor(self.clean_data).extract_entities()
-        self.name = DataExtractor(self.clean_data[:30]).extract_names()
-        self.experience = DataExtractor(self.clean_data).extract_experience()
-        self.emails = DataExtractor(self.resume_data).extract_emails()
-        self.phones = DataExtractor(self.resume_data).extract_phone_numbers()
-        self.years = DataExtractor(self.clean_data).extract_position_year()
-        self.key_words = DataExtractor(self.clean_data).extract_particular_words()
-        self.pos_frequencies = CountFrequency(self.clean_data).count_frequency()
-        self.keyterms = KeytermExtractor(self.clean_data).get_keyterms_based_on_sgrank()
-        self.bi_grams = KeytermExtractor(self.clean_data).bi_gramchunker()
-        self.tri_grams = KeytermExtractor(self.clean_data).tri_gramchunker()
-
-    def get_JSON(self) -> dict:
+
+    @memoized
+    def extractor(self) -> DataExtractor:
+        # One parse of the clean text serves every extractor below
+        return DataExtractor(self.clean_data)
+
+    @memoized
+    def raw_extractor(self) -> DataExtractor:
+        return DataExtractor(self.resume_data)
+
+    @memoized
+    def keyterm_extractor(self) -> KeytermExtractor:
+        return KeytermExtractor(self.clean_data)
+
+    @parser_field("cleaning", chunked=True)
+    def clean_data(self):
+        return TextCleaner.clean_text(self.resume_data)
+
+    @parser_field("entities", chunked=True)
+    def entities(self):
+        return self.extractor.extract_entities()
+
+    @parser_field("entities", chunked=True)
+    def name(self):
+        return DataExtractor(self.clean_data[:30]).extract_names()
+
+    @parser_field("extraction")
+    def experience(self):
+        return self.extractor.extract_experience()
+
+    @parser_field("extraction")
+    def emails(self):
+        return self.raw_extractor.extract_emails()
+
+    @parser_field("extraction")
+    def phones(self):
+        return self.raw_extractor.extract_phone_numbers()
+
+    @parser_field("extraction")
+    def years(self):
+        return self.extractor.extract_position_year()
+
+    @parser_field("extraction", chunked=True)
+    def keyword_counts(self):
+        return self.extractor.extract_keyword_counts()
+
+    @parser_field()
+    def extracted_keywords(self):
+        return list(self.keyword_counts)
+
+    @parser_field("pos_frequencies", chunked=True)
+    def pos_frequencies(self):
+        return self.extractor.count_pos()
+
+    @parser_field("sgrank", chunked=True)
+    def keyterms(self):
+        return self.keyterm_extractor.get_keyterms_based_on_sgrank()
+
+    @parser_field("ngrams", chunked=True)
+    def bi_grams(self):
+        return self.keyterm_extractor.bi_gramchunker()
+
+    @parser_field("ngrams", chunked=True)
+    def tri_grams(self):
+        return self.keyterm_extractor.tri_gramchunker()
+
+
+class IncrementalResumeParser:
+    """
+    Parses resumes section by section, as split by `SectionSegmenter`, and keeps the
+    results of every section keyed by the hash of its text. When an edited resume is
+    parsed again only the sections whose text changed are recomputed; the document
+    fields are merged from the section results, so an edit and rescore loop costs one
+    section, not a document.
+
+    Keyterms are ranked per section and merged by score weighted with the length of
+    their section, which approximates document-level SGRank.
+    """
+
+    def __init__(self, embedder=None, max_sections: int = 1024):
         """
-        Returns a dictionary of resume data.
+        Args:
+            embedder (Embedder): Embeds each section, the HashingEmbedder by default.
+            max_sections (int): How many section results are kept, least recently
+                used first out.
         """
-        resume_dictionary = {
-            "unique_id": generate_unique_id(),
-            "resume_data": self.resume_data,
-            "clean_data": self.clean_data,
-            "entities": self.entities,
-            "extracted_keywords": self.key_words,
-            "keyterms": self.keyterms,
-            "name": self.name,
-            "experience": self.experience,
-            "emails": self.emails,
-            "phones": self.phones,
-            "years": self.years,
-            "bi_grams": str(self.bi_grams),
-            "tri_grams": str(self.tri_grams),
-            "pos_frequencies": self.pos_frequencies,
+        self.embedder = embedder
+        self.max_sections = max_sections
+        self._sections = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get_embedder(self):
+        if self.embedder is None:
+            from scripts.similarity.embedder import HASHING_MODEL, get_embedder
+
+            self.embedder = get_embedder(HASHING_MODEL)
+        return self.embedder
+
+    def analyze_section(self, text: str) -> dict:
+        """
+        Compute the fields of a single section.
+        """
+        with stage("resume.cleaning"):
+            clean_data = TextCleaner.clean_text(text)
+        extractor = DataExtractor(clean_data)
+        with stage("resume.entities"):
+            entities = extractor.extract_entities()
+            name = DataExtractor(clean_data[:30]).extract_names()
+        with stage("resume.extraction"):
+            raw_extractor = DataExtractor(text)
+            emails = raw_extractor.extract_emails()
+            phones = raw_extractor.extract_phone_numbers()
+            years = extractor.extract_position_year()
+            keyword_counts = extractor.extract_keyword_counts()
+        with stage("resume.pos_frequencies"):
+            pos_frequencies = extractor.count_pos()
+        keyterm_extractor = KeytermExtractor(clean_data)
+        with stage("resume.sgrank"):
+            keyterms = keyterm_extractor.get_keyterms_based_on_sgrank()
+        with stage("resume.ngrams"):
+            bi_grams = [span.text for span in keyterm_extractor.bi_gramchunker()]
+            tri_grams = [span.text for span in keyterm_extractor.tri_gramchunker()]
+        return {
+            "clean_data": clean_data,
+            "entities": entities,
+            "name": name,
+            "emails": emails,
+            "phones": phones,
+            "years": years,
+            "keyword_counts": keyword_counts,
+            "pos_frequencies": pos_frequencies,
+            "keyterms": keyterms,
+            "bi_grams": bi_grams,
+            "tri_grams": tri_grams,
+            "embedding": self._get_embedder().embed([clean_data])[0],
         }
 
-        return resume_dictionary
+    def _section(self, text: str) -> dict:
+        key = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        with self._lock:
+            if key in self._sections:
+                self._sections.move_to_end(key)
+                self.hits += 1
+                return self._sections[key]
+            self.misses += 1
+        result = self.analyze_section(text)
+        with self._lock:
+            self._sections[key] = result
+            while len(self._sections) > self.max_sections:
+                self._sections.popitem(last=False)
+        return result
+
+    def parse(self, resume: str) -> dict:
+        """
+        Parse a resume, reusing the results of unchanged sections.
+
+        Returns:
+            dict: The fields of `ParseResume.get_JSON`, plus "sections" (name and
+            length of each section) and the normalized document "embedding".
+        """
+        if not resume.strip():
+            raise ValueError("Resume cannot be empty")
+        sections = [
+            (section.name, section.text, self._section(section.text))
+            for section in get_segmenter().segment(resume)
+        ]
+
+        lengths = [max(1, len(result["clean_data"])) for _, _, result in sections]
+        total = sum(lengths)
+        keyterm_scores = Counter()
+        for (_, _, result), length in zip(sections, lengths):
+            for term, score in result["keyterms"]:
+                keyterm_scores[term] += score * length / total
+
+        embedding = sum(
+            result["embedding"] * length
+            for (_, _, result), length in zip(sections, lengths)
+        )
+        norm = np.linalg.norm(embedding)
+
+        pos_frequencies, keyword_counts = Counter(), Counter()
+        entities = []
+        for _, _, result in sections:
+            pos_frequencies.update(result["pos_frequencies"])
+            keyword_counts.update(result["keyword_counts"])
+            entities += [e for e in result["entities"] if e not in entities]
+
+        def collect(field):
+            return [item for _, _, result in sections for item in result[field]]
+
+        return {
+            "unique_id": generate_unique_id(),
+            "resume_data": resume,
+            "clean_data": "".join(result["clean_data"] for _, _, result in sections),
+            "entities": entities,
+            "extracted_keywords": list(keyword_counts),
+            "keyword_counts": dict(keyword_counts),
+            "keyterms": keyterm_scores.most_common(TOP_KEYTERMS),
+            "name": sections[0][2]["name"] if sections else [],
+            "experience": " ".join(
+                word
+                for name, _, result in sections
+                if name == "experience"
+                for word in result["clean_data"].split()
+            ),
+            "emails": collect("emails"),
+            "phones": collect("phones"),
+            "years": collect("years"),
+            "bi_grams": ngrams_repr(collect("bi_grams")),
+            "tri_grams": ngrams_repr(collect("tri_grams")),
+            "pos_frequencies": dict(pos_frequencies),
+            "sections": [
+                {"name": name, "length": len(text)} for name, text, _ in sections
+            ],
+            "embedding": (embedding / norm if norm else embedding).tolist(),
+        }
@@ -1,2 +1,3 @@
 from .ParseJobDescToJson import ParseJobDesc
-from .ParseResumeToJson import ParseResume
+from .ParseLongDocument import ChunkedParser
+from .ParseResumeToJson import IncrementalResumeParser, ParseResume
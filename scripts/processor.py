@@ -0,0 +1,409 @@
+import json
+import logging
+import math
+import os
+import re
+import time
+from collections import Counter
+from functools import lru_cache
+
+from .parsers import IncrementalResumeParser, ParseJobDesc, ParseResume
+from .ReadDocument import read_document
+from .similarity.embedder import (
+    HASHING_MODEL,
+    TOKEN_PATTERN,
+    get_embedder,
+    offline_allowed,
+)
+from .SkillMatcher import get_skill_matcher, skill_coverage
+from .utils.instrumentation import profile, stage
+from .utils.Utils import REGEX_PATTERNS
+
+logger = logging.getLogger(__name__)
+
+MODES = ("fast", "full")
+OUTPUT_FORMATS = ("json", "text")
+
+# Latency budget of each mode in milliseconds. Requests over budget are logged.
+MODE_BUDGETS_MS = {
+    "fast": float(os.getenv("FAST_MODE_BUDGET_MS", "50")),
+    "full": float(os.getenv("FULL_MODE_BUDGET_MS", "5000")),
+}
+
+TOP_KEYWORDS = 20
+
+
+def warm_up():
+    """
+    Load every model the pipeline needs so the first request does not pay for it.
+    """
+    from . import init
+    from .KeytermsExtraction import KeytermExtractor
+
+    init()
+    KeytermExtractor("warm up").get_keyterms_based_on_sgrank()
+
+
+def get_match_score(resume_string: str, job_description_string: str) -> tuple:
+    """
+    Score a resume against a job description on a 0-100 scale.
+
+    The Cohere/Qdrant scorer is used when it is configured, the local embedding model
+    otherwise. If the remote services fail, the error is raised, unless
+    SIMILARITY_OFFLINE opts in to scoring with the HashingEmbedder, which needs
+    neither a network nor a model.
+
+    Returns:
+        tuple: The score and the method that computed it, "embedding" or "hashing".
+    """
+    method = "embedding"
+    if os.getenv("COHERE_API_KEY") and os.getenv("QDRANT_URL"):
+        from .similarity.get_similarity_score import get_similarity_score
+
+        try:
+            hits = get_similarity_score(resume_string, job_description_string)
+            score = hits[0]["score"] if hits else 0.0
+        except Exception as e:
+            if not offline_allowed():
+                raise
+            logger.warning(f"Remote scoring failed, using the hashing embedder: {e}")
+            vectors = get_embedder(HASHING_MODEL).embed(
+                [resume_string, job_description_string]
+            )
+            score, method = float(vectors[0] @ vectors[1]), "hashing"
+    else:
+        from .similarity.get_score import get_score
+
+        hits = get_score(resume_string, job_description_string)
+        score = hits[0].score if hits else 0.0
+    return round(max(0.0, min(1.0, float(score))) * 100, 2), method
+
+
+def extract_contact_info(text: str) -> dict:
+    """
+    Extract emails, phone numbers and links with the shared regex patterns.
+    """
+    return {
+        "emails": re.findall(REGEX_PATTERNS["email_pattern"], text),
+        "phones": re.findall(REGEX_PATTERNS["phone_pattern"], text),
+        "links": re.findall(REGEX_PATTERNS["link_pattern"], text),
+    }
+
+
+@lru_cache(maxsize=None)
+def _stop_words() -> frozenset:
+    from spacy.lang.en.stop_words import STOP_WORDS
+
+    return frozenset(STOP_WORDS)
+
+
+def load_fast_mode():
+    """
+    Load what the fast mode needs, which is no spaCy model: the stop words and the
+    skill matcher. Otherwise the first fast request pays for them.
+    """
+    _stop_words()
+    get_skill_matcher()
+
+
+def tokenize(text: str) -> list:
+    """
+    Lowercase and split a text into word tokens, dropping stop words.
+    """
+    stop_words = _stop_words()
+    return [
+        token
+        for token in TOKEN_PATTERN.findall(text.lower())
+        if len(token) > 1 and token not in stop_words
+    ]
+
+
+@lru_cache(maxsize=256)
+def get_job_features(job_text: str) -> tuple:
+    """
+    Compute the job-side features used by the fast mode. A posting is scored against
+    many resumes, so the result is cached per job text.
+
+    Returns:
+        tuple: The token counts, their L2 norm and the top keywords of the job.
+    """
+    counts = Counter(tokenize(job_text))
+    norm = math.sqrt(sum(count * count for count in counts.values()))
+    top_keywords = [word for word, _ in counts.most_common(TOP_KEYWORDS)]
+    return counts, norm, top_keywords
+
+
+@lru_cache(maxsize=256)
+def get_job_skills(job_text: str) -> tuple:
+    """
+    Return the taxonomy skills of a job description, cached per job text.
+    """
+    return tuple(get_skill_matcher().extract(job_text))
+
+
+def get_skill_coverage(resume_text: str, job_text: str, job=None) -> dict:
+    """
+    Match both documents against the skill taxonomy and compute the share of the job
+    skills the resume covers. Needs no model or embedding.
+
+    Args:
+        job (RegisteredJob): The registered job, whose skills are precomputed.
+    """
+    resume_skills = get_skill_matcher().extract(resume_text)
+    job_skills = job.skills if job is not None else get_job_skills(job_text)
+    return skill_coverage(resume_skills, list(job_skills))
+
+
+def process_texts_fast(resume_text: str, job_text: str, job=None) -> dict:
+    """
+    Score a resume with regex and tokenization only, skipping NER, sgrank and n-grams.
+
+    Args:
+        job (RegisteredJob): Use the precomputed features of a registered job instead
+            of `job_text`.
+    """
+    if job is not None:
+        job_counts, job_norm, job_keywords = (
+            job.token_counts,
+            job.token_norm,
+            job.top_keywords,
+        )
+    else:
+        job_counts, job_norm, job_keywords = get_job_features(job_text)
+    resume_counts = Counter(tokenize(resume_text))
+    resume_norm = math.sqrt(sum(count * count for count in resume_counts.values()))
+
+    dot = sum(
+        count * job_counts.get(token, 0) for token, count in resume_counts.items()
+    )
+    similarity = dot / (resume_norm * job_norm) if resume_norm and job_norm else 0.0
+
+    skills_analysis = {
+        "source": "job_keywords",
+        "matched_skills": [word for word in job_keywords if word in resume_counts],
+        "missing_skills": [word for word in job_keywords if word not in resume_counts],
+    }
+    return {
+        "match_score": round(similarity * 100, 2),
+        "score_method": "token_cosine",
+        "top_keywords": [word for word, _ in resume_counts.most_common(TOP_KEYWORDS)],
+        "skills_analysis": skills_analysis,
+    }
+
+
+@lru_cache(maxsize=None)
+def get_resume_parser() -> IncrementalResumeParser:
+    """
+    Return the process-wide incremental resume parser, whose section results survive
+    between requests.
+    """
+    return IncrementalResumeParser()
+
+
+def process_texts_full(
+    resume_text: str, job_text: str, incremental: bool = False, job=None
+) -> dict:
+    """
+    Run the full parsing pipeline on both documents and score them with embeddings.
+
+    With `incremental`, the resume is parsed section by section and sections seen in
+    an earlier request are not parsed again. With a registered `job`, only the resume
+    is parsed and embedded.
+    """
+    if incremental:
+        resume = get_resume_parser().parse(resume_text)
+        resume.pop("embedding")
+    else:
+        resume = ParseResume(resume_text).get_JSON()
+    resume_keywords = " ".join(resume["extracted_keywords"])
+    if job is not None:
+        from .JobRegistry import get_job_registry
+
+        job_description = job.parsed
+        match_score, score_method = get_job_registry().match_score(job, resume_keywords)
+        keyterms = job.keyterms
+    else:
+        job_description = ParseJobDesc(job_text).get_JSON()
+        match_score, score_method = get_match_score(
+            resume_keywords, " ".join(job_description["extracted_keywords"])
+        )
+        keyterms = job_description["keyterms"]
+    keyword_counts = Counter()
+    for word, count in resume["keyword_counts"].items():
+        keyword_counts[word.lower()] += count
+    return {
+        "match_score": match_score,
+        "score_method": score_method,
+        "top_keywords": [word for word, _ in keyword_counts.most_common(TOP_KEYWORDS)],
+        "skills_analysis": get_skills_analysis(resume, {"keyterms": keyterms}),
+        "resume": resume,
+        "job_description": job_description,
+    }
+
+
+def get_skills_analysis(resume: dict, job_description: dict) -> dict:
+    """
+    Split the job description keyterms into those the resume covers and those it misses.
+    """
+    resume_text = resume["clean_data"].lower()
+    matched_skills, missing_skills = [], []
+    for keyterm in job_description["keyterms"]:
+        term = keyterm[0] if isinstance(keyterm, (list, tuple)) else keyterm
+        if term.lower() in resume_text:
+            matched_skills.append(term)
+        else:
+            missing_skills.append(term)
+    return {
+        "source": "job_keyterms",
+        "matched_skills": matched_skills,
+        "missing_skills": missing_skills,
+    }
+
+
+def get_recommendations(skills_analysis: dict, limit: int = 5) -> list:
+    """
+    Turn the most important missing skills into suggestions.
+    """
+    return [
+        f"Consider highlighting your experience with {skill}."
+        for skill in skills_analysis["missing_skills"][:limit]
+    ]
+
+
+def process_texts(
+    resume_text: str,
+    job_text: str,
+    mode: str = "full",
+    output_format: str = "json",
+    profile_path: str = None,
+    profiler: str = "cprofile",
+    incremental: bool = False,
+    job_id: str = None,
+):
+    """
+    Analyze a resume against a job description.
+
+    Args:
+        resume_text (str): The text of the resume.
+        job_text (str): The text of the job description, None with `job_id`.
+        mode (str): The analysis mode, one of `MODES`.
+        output_format (str): "json" returns a dictionary, "text" a JSON string.
+        profile_path (str): If given, the analysis is profiled and the profile is
+            written to this path.
+        profiler (str): "cprofile" or "sampling", see `utils.instrumentation.profile`.
+        incremental (bool): Reuse the parse of the resume sections that did not change
+            since an earlier request, for edit and rescore loops. "full" mode only.
+        job_id (str): Score against a job of the `JobRegistry`, whose side of the
+            analysis was computed when it was registered.
+
+    Returns:
+        dict | str: The match score, contact info, top keywords, skills analysis,
+        taxonomy skill coverage and recommendations. The "full" mode also returns
+        the parsed documents.
+
+        The modes compute some fields differently, and say how:
+
+        - "match_score": "score_method" is "token_cosine" for the cosine of the
+          token counts in "fast" mode, "embedding" or "hashing" in "full" mode.
+        - "skills_analysis": "source" is "job_keywords", the most frequent job
+          tokens, in "fast" mode and "job_keyterms", the sgrank keyterms, in "full"
+          mode.
+        - "top_keywords": the most frequent resume tokens in "fast" mode, the most
+          frequent parsed resume keywords in "full" mode.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode '{mode}', expected one of {MODES}")
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(
+            f"Unknown output format '{output_format}', expected one of {OUTPUT_FORMATS}"
+        )
+    job = None
+    if job_id is not None:
+        from .JobRegistry import get_job_registry
+
+        job = get_job_registry().get(job_id)
+        if job is None:
+            raise ValueError(f"Unknown job '{job_id}', register it first")
+    elif not job_text or not job_text.strip():
+        raise ValueError("Resume and job description cannot be empty")
+    if not resume_text.strip():
+        raise ValueError("Resume and job description cannot be empty")
+
+    if profile_path:
+        with profile(profile_path, profiler):
+            return process_texts(
+                resume_text,
+                job_text,
+                mode,
+                output_format,
+                incremental=incremental,
+                job_id=job_id,
+            )
+
+    start = time.perf_counter()
+    with stage(f"analysis.{mode}"):
+        if mode == "fast":
+            result = process_texts_fast(resume_text, job_text, job)
+        else:
+            result = process_texts_full(resume_text, job_text, incremental, job)
+    result["mode"] = mode
+    result["contact"] = extract_contact_info(resume_text)
+    result["skill_coverage"] = get_skill_coverage(resume_text, job_text, job)
+    result["recommendations"] = get_recommendations(result["skills_analysis"])
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    result["elapsed_ms"] = round(elapsed_ms, 3)
+    if elapsed_ms > MODE_BUDGETS_MS[mode]:
+        logger.warning(
+            f"{mode} analysis took {elapsed_ms:.0f} ms, "
+            f"over its {MODE_BUDGETS_MS[mode]:.0f} ms budget"
+        )
+
+    if output_format == "text":
+        return json.dumps(result, indent=2)
+    return result
+
+
+def process_files(
+    resume_path: str,
+    job_path: str,
+    mode: str = "full",
+    output_format: str = "json",
+    profile_path: str = None,
+    profiler: str = "cprofile",
+    incremental: bool = False,
+):
+    """
+    Read a resume and a job description from disk and analyze them.
+
+    Args:
+        resume_path (str): The path of the resume.
+        job_path (str): The path of the job description.
+        mode (str): The analysis mode, one of `MODES`.
+        output_format (str): "json" returns a dictionary, "text" a JSON string.
+        profile_path (str): If given, the whole run, including reading the files, is
+            profiled and the profile is written to this path.
+        profiler (str): "cprofile" or "sampling".
+        incremental (bool): See `process_texts`.
+
+    Returns:
+        dict | str: See `process_texts`.
+    """
+    for path in (resume_path, job_path):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"File not found: {path}")
+
+    if profile_path:
+        with profile(profile_path, profiler):
+            return process_files(
+                resume_path, job_path, mode, output_format, incremental=incremental
+            )
+
+    logger.info(f"Processing {resume_path} against {job_path} ({mode})")
+    return process_texts(
+        read_document(resume_path),
+        read_document(job_path),
+        mode,
+        output_format,
+        incremental=incremental,
+    )
@@ -1 +1,19 @@
-from .get_similarity_score import get_similarity_score
+from .bm25 import BM25Index, TwoStageRetriever
+from .embedder import (
+    CohereEmbedder,
+    Embedder,
+    EmbeddingUnavailable,
+    HashingEmbedder,
+    LocalEmbedder,
+    ResilienceConfig,
+    ResilientEmbedder,
+    get_cohere_embedder,
+    get_embedder,
+    offline_allowed,
+)
+from .get_similarity_score import (
+    QdrantSearch,
+    RankFilter,
+    RankPage,
+    get_similarity_score,
+)
@@ -0,0 +1,255 @@
+import heapq
+import logging
+import math
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def document_terms(document: dict) -> List[str]:
+    """
+    Build the list of index terms for a processed resume or job description.
+
+    Args:
+        document (dict): A dictionary produced by `ParseResume.get_JSON` or
+            `ParseJobDesc.get_JSON`.
+
+    Returns:
+        List[str]: The lowercased keywords, repeated as often as they occur, followed by
+        the `keyterms` phrases.
+    """
+    if "keyword_counts" in document:
+        terms = [
+            str(word).lower()
+            for word, count in document["keyword_counts"].items()
+            for _ in range(count)
+        ]
+    else:
+        terms = [str(word).lower() for word in document.get("extracted_keywords", [])]
+    for keyterm in document.get("keyterms", []):
+        # sgrank returns (term, score) pairs, older JSON files store plain strings
+        term = keyterm[0] if isinstance(keyterm, (list, tuple)) else keyterm
+        terms.append(str(term).lower())
+    return terms
+
+
+class BM25Index:
+    """
+    An inverted index (term -> postings) scored with Okapi BM25.
+
+    Documents can be added and removed at any time. Only term frequencies are stored
+    in the postings; the BM25 weight of a posting depends on the corpus statistics and
+    is computed when the index is queried.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """
+        Initialize an empty BM25Index.
+
+        Args:
+            k1 (float): Term frequency saturation parameter.
+            b (float): Document length normalization parameter.
+        """
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.doc_lengths: Dict[str, int] = {}
+        self.doc_terms: Dict[str, Tuple[str, ...]] = {}
+        self.total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self.doc_lengths
+
+    def add(self, doc_id: str, terms: Iterable[str]):
+        """
+        Add a document to the index, replacing any previous version of it.
+
+        Args:
+            doc_id (str): The unique id of the document.
+            terms (Iterable[str]): The terms of the document.
+        """
+        if doc_id in self.doc_lengths:
+            self.remove(doc_id)
+
+        frequencies = Counter(terms)
+        for term, frequency in frequencies.items():
+            self.postings.setdefault(term, {})[doc_id] = frequency
+
+        length = sum(frequencies.values())
+        self.doc_terms[doc_id] = tuple(frequencies)
+        self.doc_lengths[doc_id] = length
+        self.total_length += length
+
+    def add_document(self, document: dict, doc_id: Optional[str] = None):
+        """
+        Add a processed resume or job description to the index.
+
+        Args:
+            document (dict): A dictionary produced by one of the parsers.
+            doc_id (str): The id to store the document under. Defaults to its
+                `unique_id`.
+        """
+        self.add(doc_id or document["unique_id"], document_terms(document))
+
+    def remove(self, doc_id: str) -> bool:
+        """
+        Remove a document from the index.
+
+        Args:
+            doc_id (str): The id of the document to remove.
+
+        Returns:
+            bool: True if the document was indexed, False otherwise.
+        """
+        length = self.doc_lengths.pop(doc_id, None)
+        if length is None:
+            return False
+
+        self.total_length -= length
+        for term in self.doc_terms.pop(doc_id):
+            del self.postings[term][doc_id]
+            if not self.postings[term]:
+                del self.postings[term]
+        return True
+
+    def idf(self, term: str) -> float:
+        """
+        Return the BM25 inverse document frequency of a term.
+        """
+        document_frequency = len(self.postings.get(term, ()))
+        return math.log(
+            1 + (len(self) - document_frequency + 0.5) / (document_frequency + 0.5)
+        )
+
+    def term_weights(self, term: str) -> Dict[str, float]:
+        """
+        Return the postings of a term with their BM25 weights.
+
+        Args:
+            term (str): The term to look up.
+
+        Returns:
+            Dict[str, float]: A mapping from document id to the BM25 weight of the term.
+        """
+        postings = self.postings.get(term)
+        if not postings:
+            return {}
+
+        idf = self.idf(term)
+        average_length = self.total_length / len(self) if len(self) else 0.0
+        weights = {}
+        for doc_id, frequency in postings.items():
+            norm = self.k1 * (
+                1 - self.b + self.b * self.doc_lengths[doc_id] / (average_length or 1)
+            )
+            weights[doc_id] = idf * frequency * (self.k1 + 1) / (frequency + norm)
+        return weights
+
+    def search(
+        self, query_terms: Iterable[str], top_k: int = 300
+    ) -> List[Tuple[str, float]]:
+        """
+        Score every document sharing a term with the query and return the best ones.
+
+        Args:
+            query_terms (Iterable[str]): The terms of the query.
+            top_k (int): The number of candidates to return.
+
+        Returns:
+            List[Tuple[str, float]]: (doc_id, score) pairs, best first.
+        """
+        scores: Dict[str, float] = {}
+        for term, query_frequency in Counter(query_terms).items():
+            for doc_id, weight in self.term_weights(term).items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight * query_frequency
+        return heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+
+
+class TwoStageRetriever:
+    """
+    BM25 candidate generation over the whole corpus followed by an embedding rerank
+    of the best candidates only.
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[List[str]], "np.ndarray"],
+        index: Optional[BM25Index] = None,
+    ):
+        """
+        Initialize the TwoStageRetriever.
+
+        Args:
+            embed (Callable): A function that maps a list of texts to a matrix of
+                embeddings, one row per text.
+            index (BM25Index): The index to use. A new one is created if not given.
+        """
+        self.embed = embed
+        self.index = index or BM25Index()
+        self.texts: Dict[str, str] = {}
+        self.vectors: Dict[str, np.ndarray] = {}
+
+    def add_document(self, document: dict, doc_id: Optional[str] = None):
+        """
+        Index a processed document. Its embedding is computed the first time it is
+        reranked.
+        """
+        doc_id = doc_id or document["unique_id"]
+        terms = document_terms(document)
+        self.index.add(doc_id, terms)
+        self.texts[doc_id] = " ".join(terms)
+        self.vectors.pop(doc_id, None)
+
+    def remove(self, doc_id: str) -> bool:
+        """
+        Remove a document from the index and drop its cached embedding.
+        """
+        self.texts.pop(doc_id, None)
+        self.vectors.pop(doc_id, None)
+        return self.index.remove(doc_id)
+
+    def _vectors_for(self, doc_ids: List[str]) -> np.ndarray:
+        missing = [doc_id for doc_id in doc_ids if doc_id not in self.vectors]
+        if missing:
+            embeddings = np.asarray(
+                self.embed([self.texts[doc_id] for doc_id in missing]),
+                dtype=np.float32,
+            )
+            for doc_id, vector in zip(missing, embeddings):
+                self.vectors[doc_id] = vector / (np.linalg.norm(vector) or 1.0)
+        return np.stack([self.vectors[doc_id] for doc_id in doc_ids])
+
+    def search(
+        self, query: dict, candidates: int = 300, top_n: int = 10
+    ) -> List[Tuple[str, float]]:
+        """
+        Retrieve the documents most similar to a processed job description or resume.
+
+        Args:
+            query (dict): A dictionary produced by one of the parsers.
+            candidates (int): The number of BM25 candidates to rerank.
+            top_n (int): The number of results to return.
+
+        Returns:
+            List[Tuple[str, float]]: (doc_id, cosine similarity) pairs, best first.
+        """
+        query_terms = document_terms(query)
+        shortlist = [doc_id for doc_id, _ in self.index.search(query_terms, candidates)]
+        logger.debug(f"BM25 returned {len(shortlist)} of {len(self.index)} documents")
+        if not shortlist:
+            return []
+
+        query_vector = np.asarray(
+            self.embed([" ".join(query_terms)]), dtype=np.float32
+        )[0]
+        query_vector = query_vector / (np.linalg.norm(query_vector) or 1.0)
+        similarities = self._vectors_for(shortlist) @ query_vector
+
+        order = np.argsort(-similarities)[:top_n]
+        return [(shortlist[i], float(similarities[i])) for i in order]
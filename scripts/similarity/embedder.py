@@ -0,0 +1,609 @@
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+import zlib
+from collections import Counter, OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "BAAI/bge-base-en"
+HASHING_MODEL = "hashing"
+COHERE_MODEL = "large"
+
+TOKEN_PATTERN = re.compile(r"[a-z][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+
+
+def offline_allowed() -> bool:
+    """
+    Whether SIMILARITY_OFFLINE opts in to the local stand-ins of the remote services:
+    the HashingEmbedder for Cohere and an in-memory Qdrant. Without it, a service
+    that is not configured or fails is an error rather than a silent substitution.
+    """
+    return os.getenv("SIMILARITY_OFFLINE", "").lower() in ("1", "true", "yes")
+
+
+class Embedder:
+    """
+    The interface of the embedding backends: `embed` turns a list of texts into a
+    float32 matrix with one row of `dim` columns per text.
+    """
+
+    dim: int
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        raise NotImplementedError
+
+
+@lru_cache(maxsize=1 << 16)
+def _hash_feature(feature: str, dim: int) -> Tuple[int, float]:
+    h = zlib.crc32(feature.encode("utf-8"))
+    # The low bits pick the bucket, the top bit the sign, so collisions cancel out
+    # on average instead of piling up
+    return h % dim, -1.0 if h & 0x80000000 else 1.0
+
+
+class HashingEmbedder(Embedder):
+    """
+    A fully local embedder that hashes the word n-grams of a text into a fixed number
+    of buckets. It needs no model or network and costs microseconds per document, so
+    it serves as a prefilter, as a fallback when the embedding API is down, and in
+    tests. Vectors are L2-normalized, so dot products are cosine similarities.
+    """
+
+    def __init__(self, dim: int = 1024, ngram_range: Tuple[int, int] = (1, 2)):
+        """
+        Args:
+            dim (int): The number of buckets, i.e. the vector size.
+            ngram_range (Tuple[int, int]): The smallest and largest word n-grams hashed.
+        """
+        self.dim = dim
+        self.ngram_range = ngram_range
+
+    def features(self, text: str) -> List[str]:
+        """Return the word n-grams of a text."""
+        tokens = [
+            token for token in TOKEN_PATTERN.findall(text.lower()) if len(token) > 1
+        ]
+        low, high = self.ngram_range
+        features = tokens if low == 1 else []
+        for n in range(max(2, low), high + 1):
+            features += [
+                " ".join(tokens[i : i + n]) for i in range(len(tokens) - n + 1)
+            ]
+        return features
+
+    def embed_one(self, text: str) -> np.ndarray:
+        """Embed a single text into a float32 vector of size `dim`."""
+        hashed = [_hash_feature(feature, self.dim) for feature in self.features(text)]
+        if not hashed:
+            return np.zeros(self.dim, dtype=np.float32)
+        indices, signs = zip(*hashed)
+        vector = np.bincount(indices, weights=signs, minlength=self.dim)
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).astype(np.float32)
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed a list of texts.
+
+        Returns:
+            np.ndarray: A float32 matrix with one row per text.
+        """
+        texts = list(texts)
+        if not texts:
+            return np.empty((0, self.dim), dtype=np.float32)
+        return np.stack([self.embed_one(text) for text in texts])
+
+
+class CohereEmbedder(Embedder):
+    """
+    Embeds texts with the Cohere API. COHERE_BASE_URL points the client at another
+    deployment, such as the stub of benchmarks/stubs.py.
+    """
+
+    def __init__(
+        self,
+        model: str = COHERE_MODEL,
+        api_key: str = None,
+        dim: int = 4096,
+        timeout: float = None,
+        max_retries: int = None,
+    ):
+        """
+        Args:
+            model (str): The Cohere embedding model.
+            api_key (str): The API key, COHERE_API_KEY by default.
+            dim (int): The size of the vectors the model returns.
+            timeout (float): Seconds before a request is abandoned, the SDK's
+                default if None.
+            max_retries (int): Retries of the SDK itself, its default if None.
+        """
+        import cohere
+
+        api_key = api_key or os.getenv("COHERE_API_KEY")
+        if not api_key:
+            raise ValueError("COHERE_API_KEY environment variable is not set")
+        self.model = model
+        self.dim = dim
+        self.client = cohere.Client(
+            api_key,
+            base_url=os.getenv("COHERE_BASE_URL") or None,
+            timeout=timeout,
+            max_retries=max_retries,
+        )
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed a list of texts in one API call.
+
+        Returns:
+            np.ndarray: A float32 matrix with one row per text.
+        """
+        texts = list(texts)
+        if not texts:
+            return np.empty((0, self.dim), dtype=np.float32)
+        response = self.client.embed(texts=texts, model=self.model)
+        return np.asarray(response.embeddings, dtype=np.float32)
+
+
+class LocalEmbedder(Embedder):
+    """
+    A warm handle on a local fastembed model, the same model `QdrantClient.set_model`
+    uses.
+
+    The model is loaded once, on the first call to `embed`. Concurrent callers are
+    served by a single background thread that groups their texts into one batch, so
+    the model runs once per batch instead of once per request.
+    """
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL,
+        max_batch_size: int = 64,
+        max_wait: float = 0.005,
+    ):
+        """
+        Initialize the LocalEmbedder. Nothing is loaded until the first call to `embed`.
+
+        Args:
+            model_name (str): The fastembed model to load.
+            max_batch_size (int): The maximum number of texts embedded in one model
+                call.
+            max_wait (float): How long, in seconds, the batcher waits for more requests
+                once it has received one.
+        """
+        self.model_name = model_name
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._model = None
+        self._dim = None
+        self._model_lock = threading.Lock()
+        self._requests: "queue.Queue" = queue.Queue()
+        self._worker = None
+        self._worker_pid = None
+        self._worker_lock = threading.Lock()
+
+    def _load_model(self):
+        from fastembed import TextEmbedding
+
+        logger.info(f"Loading embedding model {self.model_name}")
+        return TextEmbedding(model_name=self.model_name)
+
+    @property
+    def model(self):
+        """
+        The loaded model. Loading happens at most once per process.
+        """
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    self._model = self._load_model()
+        return self._model
+
+    @property
+    def dim(self) -> int:
+        """The size of the vectors, found by embedding a probe text once."""
+        if self._dim is None:
+            self._dim = self.embed(["dimension probe"]).shape[1]
+        return self._dim
+
+    def _ensure_worker(self):
+        # A forked child inherits the handle but not the batching thread
+        if self._worker is not None and self._worker_pid == os.getpid():
+            return
+        with self._worker_lock:
+            if self._worker is None or self._worker_pid != os.getpid():
+                self._requests = queue.Queue()
+                self._worker = threading.Thread(
+                    target=self._run, name="embedder-batcher", daemon=True
+                )
+                self._worker_pid = os.getpid()
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            batch = [self._requests.get()]
+            size = len(batch[0][0])
+            while size < self.max_batch_size:
+                try:
+                    request = self._requests.get(timeout=self.max_wait)
+                except queue.Empty:
+                    break
+                batch.append(request)
+                size += len(request[0])
+            self._embed_batch(batch)
+
+    def _embed_batch(self, batch):
+        texts = [text for request_texts, _ in batch for text in request_texts]
+        try:
+            matrix = self._encode(texts)
+        except Exception as e:
+            logger.error(f"Error embedding batch: {str(e)}", exc_info=True)
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        start = 0
+        for request_texts, future in batch:
+            future.set_result(matrix[start : start + len(request_texts)])
+            start += len(request_texts)
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        vectors = list(self.model.embed(texts, batch_size=self.max_batch_size))
+        return np.asarray(vectors, dtype=np.float32)
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed a list of texts.
+
+        Args:
+            texts (List[str]): The texts to embed.
+
+        Returns:
+            np.ndarray: A float32 matrix with one row per text.
+        """
+        texts = list(texts)
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        self._ensure_worker()
+        future: Future = Future()
+        self._requests.put((texts, future))
+        return future.result()
+
+
+class EmbeddingTimeout(TimeoutError):
+    """No attempt of an embedding call answered within its deadline."""
+
+
+class EmbeddingUnavailable(RuntimeError):
+    """
+    The embedding service could not answer a call and not every text of it was
+    cached. Callers must not substitute vectors from another model: they would be
+    compared with, or stored next to, the service's own.
+    """
+
+
+class ResilienceConfig(NamedTuple):
+    """
+    The tail-latency controls of a `ResilientEmbedder`. Durations are in seconds.
+
+    Attributes:
+        deadline: How long one attempt, hedge included, may take.
+        retries: Attempts after the first one.
+        backoff: The cap of the first retry's random delay, doubled at each retry.
+        max_backoff: The largest delay before a retry.
+        hedge_after: Send a duplicate request when an attempt has not answered after
+            this long. None disables hedging.
+        breaker_failures: Consecutive failed attempts that open the circuit.
+        breaker_reset: How long the circuit stays open before a trial call.
+        cache_size: Embeddings kept to answer calls whose texts were all embedded
+            before while the service is unavailable. 0 disables the cache.
+    """
+
+    deadline: float = 10.0
+    retries: int = 2
+    backoff: float = 0.2
+    max_backoff: float = 2.0
+    hedge_after: Optional[float] = None
+    breaker_failures: int = 5
+    breaker_reset: float = 30.0
+    cache_size: int = 4096
+
+    @classmethod
+    def from_env(cls) -> "ResilienceConfig":
+        """
+        Read the configuration of a deployment: EMBED_DEADLINE_MS, EMBED_RETRIES,
+        EMBED_BACKOFF_MS, EMBED_MAX_BACKOFF_MS, EMBED_HEDGE_AFTER_MS,
+        EMBED_BREAKER_FAILURES, EMBED_BREAKER_RESET_MS and EMBED_CACHE_SIZE. Unset
+        variables keep their defaults.
+        """
+        defaults = cls()
+
+        def seconds(name, default):
+            value = os.getenv(name)
+            return float(value) / 1000 if value else default
+
+        def integer(name, default):
+            value = os.getenv(name)
+            return int(value) if value else default
+
+        return cls(
+            deadline=seconds("EMBED_DEADLINE_MS", defaults.deadline),
+            retries=integer("EMBED_RETRIES", defaults.retries),
+            backoff=seconds("EMBED_BACKOFF_MS", defaults.backoff),
+            max_backoff=seconds("EMBED_MAX_BACKOFF_MS", defaults.max_backoff),
+            hedge_after=seconds("EMBED_HEDGE_AFTER_MS", defaults.hedge_after),
+            breaker_failures=integer(
+                "EMBED_BREAKER_FAILURES", defaults.breaker_failures
+            ),
+            breaker_reset=seconds("EMBED_BREAKER_RESET_MS", defaults.breaker_reset),
+            cache_size=integer("EMBED_CACHE_SIZE", defaults.cache_size),
+        )
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing service. After `failures` consecutive failures the
+    circuit opens and calls are refused; once `reset_timeout` seconds have passed,
+    one trial call is let through, and its outcome closes or reopens the circuit.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failures: int, reset_timeout: float):
+        self.failures = failures
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._consecutive = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go through now."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if (
+                self.state == self.OPEN
+                and time.monotonic() - self._opened_at >= self.reset_timeout
+            ):
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self._consecutive = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._consecutive += 1
+            if self.state == self.HALF_OPEN or self._consecutive >= self.failures:
+                if self.state != self.OPEN:
+                    logger.warning("Embedding circuit opened")
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+def _retryable(error: Exception) -> bool:
+    # Client errors other than rate limiting fail the same way on every attempt
+    status = getattr(error, "status_code", None)
+    return status is None or status == 429 or status >= 500
+
+
+class ResilientEmbedder(Embedder):
+    """
+    Wraps a remote embedder with a deadline per attempt, jittered exponential
+    retries, optional hedged requests and a circuit breaker.
+
+    When every attempt failed or the circuit is open, a call whose texts were all
+    embedded before is answered from a cache of the primary's vectors. Otherwise
+    `EmbeddingUnavailable` is raised: vectors of another model are never returned
+    in place of the primary's.
+
+    Counters of the calls, retries, hedges, timeouts and cache answers are in
+    `stats`.
+    """
+
+    def __init__(
+        self,
+        primary: Embedder,
+        config: ResilienceConfig = None,
+        max_workers: int = 8,
+    ):
+        """
+        Args:
+            primary (Embedder): The remote embedder.
+            config (ResilienceConfig): `ResilienceConfig.from_env` by default.
+            max_workers (int): Threads running the attempts. An attempt past its
+                deadline keeps its thread until the primary's own timeout.
+        """
+        self.primary = primary
+        self.config = config or ResilienceConfig.from_env()
+        self.breaker = CircuitBreaker(
+            self.config.breaker_failures, self.config.breaker_reset
+        )
+        self.stats = Counter()
+        self._stats_lock = threading.Lock()
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="embed"
+        )
+
+    @property
+    def dim(self) -> int:
+        return self.primary.dim
+
+    @property
+    def model_name(self) -> str:
+        """The model of the primary, which every returned vector comes from."""
+        return getattr(self.primary, "model_name", None) or getattr(
+            self.primary, "model", type(self.primary).__name__
+        )
+
+    def _count(self, name: str):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def _attempt(self, texts: List[str]) -> np.ndarray:
+        """One attempt: the request, and its hedge if it is slow, under a deadline."""
+        start = time.monotonic()
+        deadline = start + self.config.deadline
+        hedge_at = (
+            start + self.config.hedge_after
+            if self.config.hedge_after is not None
+            else None
+        )
+        pending = {self._executor.submit(self.primary.embed, texts)}
+        error = None
+        while pending:
+            now = time.monotonic()
+            until = min(deadline, hedge_at) if hedge_at is not None else deadline
+            done, pending = wait(
+                pending, timeout=max(0.0, until - now), return_when=FIRST_COMPLETED
+            )
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+            if done:
+                continue
+            if hedge_at is not None and time.monotonic() < deadline:
+                # The first request is slow: race a duplicate against it
+                self._count("hedges")
+                pending.add(self._executor.submit(self.primary.embed, texts))
+                hedge_at = None
+                continue
+            self._count("timeouts")
+            raise EmbeddingTimeout(
+                f"No embedding within {self.config.deadline * 1000:.0f} ms"
+            )
+        raise error
+
+    def _call(self, texts: List[str]) -> np.ndarray:
+        """
+        Attempt and retry while the circuit lets calls through.
+
+        Raises:
+            EmbeddingUnavailable: No attempt succeeded, or the circuit is open.
+        """
+        error = None
+        for attempt in range(self.config.retries + 1):
+            if attempt:
+                self._count("retries")
+                cap = min(
+                    self.config.max_backoff, self.config.backoff * 2 ** (attempt - 1)
+                )
+                time.sleep(random.uniform(0, cap))
+            if not self.breaker.allow():
+                self._count("short_circuits")
+                raise EmbeddingUnavailable("The embedding circuit is open") from error
+            try:
+                vectors = self._attempt(texts)
+            except Exception as e:
+                error = e
+                logger.warning(f"Embedding attempt {attempt + 1} failed: {e}")
+                if not _retryable(e):
+                    # The service answered, if only to reject the request: it is up,
+                    # and a half-open circuit must not wait for another trial
+                    self.breaker.record_success()
+                    break
+                self.breaker.record_failure()
+                continue
+            self.breaker.record_success()
+            return vectors
+        raise EmbeddingUnavailable(f"Embedding failed: {error}") from error
+
+    def _remember(self, texts: List[str], vectors: np.ndarray):
+        if not self.config.cache_size:
+            return
+        with self._cache_lock:
+            for text, vector in zip(texts, vectors):
+                self._cache[text] = vector
+                self._cache.move_to_end(text)
+            while len(self._cache) > self.config.cache_size:
+                self._cache.popitem(last=False)
+
+    def _cached(self, texts: List[str]) -> Optional[np.ndarray]:
+        """The cached vectors of the texts, None unless every one is cached."""
+        with self._cache_lock:
+            rows = [self._cache.get(text) for text in texts]
+        if any(row is None for row in rows):
+            return None
+        return np.stack(rows).astype(np.float32)
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed a list of texts with the primary embedder, or from the cache when the
+        primary cannot answer in time and every text was embedded before.
+
+        Returns:
+            np.ndarray: A float32 matrix with one row per text.
+
+        Raises:
+            EmbeddingUnavailable: The primary failed and some text is not cached.
+        """
+        texts = list(texts)
+        if not texts:
+            return np.empty((0, self.dim), dtype=np.float32)
+        self._count("calls")
+        try:
+            vectors = self._call(texts)
+        except EmbeddingUnavailable:
+            cached = self._cached(texts)
+            if cached is None:
+                raise
+            self._count("cache_answers")
+            return cached
+        self._remember(texts, vectors)
+        return vectors
+
+
+@lru_cache(maxsize=None)
+def get_cohere_embedder() -> ResilientEmbedder:
+    """
+    Return the process-wide Cohere embedder, wrapped in a `ResilientEmbedder`
+    configured from the environment. Sharing it shares the circuit breaker state and
+    the cache between requests. The SDK's own retries are turned off and its timeout
+    is the deadline, so the wrapper alone decides when to retry.
+    """
+    config = ResilienceConfig.from_env()
+    return ResilientEmbedder(
+        CohereEmbedder(timeout=config.deadline, max_retries=0), config=config
+    )
+
+
+_embedders: Dict[str, Embedder] = {}
+_embedders_lock = threading.Lock()
+
+
+def get_embedder(model_name: str = DEFAULT_MODEL) -> Embedder:
+    """
+    Return the process-wide embedder for a model, creating it on first use.
+
+    Args:
+        model_name (str): A fastembed model name, or `HASHING_MODEL` for the
+            HashingEmbedder.
+
+    Returns:
+        Embedder: The shared handle.
+    """
+    with _embedders_lock:
+        if model_name not in _embedders:
+            if model_name == HASHING_MODEL:
+                _embedders[model_name] = HashingEmbedder()
+            else:
+                _embedders[model_name] = LocalEmbedder(model_name)
+        return _embedders[model_name]
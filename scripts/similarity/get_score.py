@@ -1,14 +1,14 @@
 import json
 import logging
 import os
+from functools import lru_cache
 from typing import List
 
 import yaml
-from qdrant_client import QdrantClient
 
+from scripts.similarity.embedder import get_embedder
 from scripts.utils.logger import init_logging_config
 
-init_logging_config(basic_log_level=logging.INFO)
 # Get the logger
 logger = logging.getLogger(__name__)
 
@@ -44,10 +44,37 @@ def find_path(folder_name):
     raise ValueError(f"Folder '{folder_name}' not found.")
 
 
-cwd = find_path("Resume-Matcher")
-READ_RESUME_FROM = os.path.join(cwd, "Data", "Processed", "Resumes")
-READ_JOB_DESCRIPTION_FROM = os.path.join(cwd, "Data", "Processed", "JobDescription")
-config_path = os.path.join(cwd, "scripts", "similarity")
+@lru_cache(maxsize=None)
+def get_paths() -> dict:
+    """
+    Locate the project folder and return the directories the processed documents are
+    read from. The filesystem is only searched the first time this is called.
+
+    Returns:
+      A dictionary with the `cwd`, `READ_RESUME_FROM`, `READ_JOB_DESCRIPTION_FROM` and
+    `config_path` entries.
+    """
+    cwd = find_path("Resume-Matcher")
+    return {
+        "cwd": cwd,
+        "READ_RESUME_FROM": os.path.join(cwd, "Data", "Processed", "Resumes"),
+        "READ_JOB_DESCRIPTION_FROM": os.path.join(
+            cwd, "Data", "Processed", "JobDescription"
+        ),
+        "config_path": os.path.join(cwd, "scripts", "similarity"),
+    }
+
+
+def init(basic_log_level=logging.INFO) -> dict:
+    """
+    Configure logging and resolve the data directories. Scripts call this once at
+    start-up; importing the module has no side effects.
+
+    Returns:
+      The dictionary returned by `get_paths`.
+    """
+    init_logging_config(basic_log_level=basic_log_level)
+    return get_paths()
 
 
 def read_config(filepath):
@@ -119,34 +146,49 @@ def get_score(resume_string, job_description_string):
 
     Returns:
       The function `get_score` returns the search result obtained by querying a QdrantClient with the
-    job description string against the resume string provided.
+    job description string against the resume string provided. The embedding model is
+    loaded once per process by `get_embedder` and reused across calls.
     """
+    from qdrant_client import QdrantClient, models
+
     logger.info("Started getting similarity score")
 
     documents: List[str] = [resume_string]
-    client = QdrantClient(":memory:")
-    client.set_model("BAAI/bge-base-en")
+    vectors = get_embedder("BAAI/bge-base-en").embed(
+        documents + [job_description_string]
+    )
 
-    client.add(
+    client = QdrantClient(":memory:")
+    client.create_collection(
         collection_name="demo_collection",
-        documents=documents,
+        vectors_config=models.VectorParams(
+            size=vectors.shape[1], distance=models.Distance.COSINE
+        ),
     )
-
-    search_result = client.query(
-        collection_name="demo_collection", query_text=job_description_string
+    client.upsert(
+        collection_name="demo_collection",
+        points=[
+            models.PointStruct(id=i, vector=vector.tolist(), payload={"document": doc})
+            for i, (doc, vector) in enumerate(zip(documents, vectors))
+        ],
     )
+
+    search_result = client.query_points(
+        collection_name="demo_collection", query=vectors[-1].tolist()
+    ).points
     logger.info("Finished getting similarity score")
     return search_result
 
 
 if __name__ == "__main__":
+    paths = init()
     # To give your custom resume use this code
     resume_dict = read_config(
-        READ_RESUME_FROM
+        paths["READ_RESUME_FROM"]
         + "/Resume-alfred_pennyworth_pm.pdf83632b66-5cce-4322-a3c6-895ff7e3dd96.json"
     )
     job_dict = read_config(
-        READ_JOB_DESCRIPTION_FROM
+        paths["READ_JOB_DESCRIPTION_FROM"]
         + "/JobDescription-job_desc_product_manager.pdf6763dc68-12ff-4b32-b652-ccee195de071.json"
     )
     resume_keywords = resume_dict["extracted_keywords"]
@@ -1,106 +1,413 @@
+import base64
+import hashlib
 import json
 import logging
 import os
 import sys
-import cohere
-import yaml
-from qdrant_client import QdrantClient, models
-from qdrant_client.http.models import Batch
-from scripts.utils.logger import get_handlers, init_logging_config
+import threading
+import uuid
+import weakref
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Tuple
+
+from scripts.utils.logger import init_logging_config
 
-init_logging_config(basic_log_level=logging.INFO)
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
-stderr_handler, file_handler = get_handlers()
+
+# The structured payload fields of a resume point, indexed so filters on them are
+# applied by the vector search instead of after it
+PAYLOAD_INDEXES = {
+    "years_experience": "integer",
+    "skills": "keyword",
+    "locations": "keyword",
+}
+
+# Payload returned with each hit; the full text stays on the server
+HIT_PAYLOAD = ["doc_id", "text", *PAYLOAD_INDEXES]
+
+# One collection per vector size, shared by every request. Requests are kept apart
+# by the "namespace" payload field instead of a collection each.
+DEFAULT_COLLECTION = "resume_collection_name"
+
+# Point ids are uuid5(POINT_ID_NAMESPACE, "<namespace>/<doc_id>"), so upserting a
+# document again replaces it and never touches another namespace's points
+POINT_ID_NAMESPACE = uuid.UUID("0f5f4a5e-8f0c-5d1b-9a57-3c4e1d2b6a90")
+
+_collections_lock = threading.Lock()
+# The collections known to exist, per client
+_ready_collections = weakref.WeakKeyDictionary()
+
+
+def init(basic_log_level=logging.INFO):
+    """Configure logging. Importing the module has no side effects."""
+    init_logging_config(basic_log_level=basic_log_level)
+
+
+def candidate_payload(text: str, entities: List[str] = None) -> dict:
+    """
+    Build the payload of a resume point: its text and the fields rankings filter on.
+
+    Args:
+        text (str): The resume text.
+        entities (List[str]): The GPE and ORG entities of the resume, e.g. the
+            "entities" of `ParseResume.get_JSON`. They need the spaCy model, so
+            locations are only filled in when they are given.
+    """
+    from scripts.Extractor import DataExtractor
+    from scripts.SkillMatcher import get_skill_matcher
+
+    return {
+        "text": text,
+        "years_experience": DataExtractor(text).extract_years_of_experience(),
+        "skills": get_skill_matcher().extract(text),
+        "locations": sorted(set(entities or [])),
+    }
+
+
+def canonical_skill(skill: str) -> str:
+    """Map a skill name or alias to its taxonomy name, as stored in the payload."""
+    from scripts.SkillMatcher import get_skill_matcher
+
+    matches = get_skill_matcher().extract(skill)
+    return matches[0] if matches else skill
+
+
+class RankFilter(NamedTuple):
+    """
+    Structured conditions on the candidates of a ranking. Every condition given must
+    hold; empty ones are ignored.
+    """
+
+    min_years: Optional[int] = None
+    max_years: Optional[int] = None
+    all_skills: Tuple[str, ...] = ()
+    any_skills: Tuple[str, ...] = ()
+    locations: Tuple[str, ...] = ()
+
+    def conditions(self) -> list:
+        """Translate the conditions to Qdrant field conditions."""
+        from qdrant_client import models
+
+        must = []
+        if self.min_years is not None or self.max_years is not None:
+            must.append(
+                models.FieldCondition(
+                    key="years_experience",
+                    range=models.Range(gte=self.min_years, lte=self.max_years),
+                )
+            )
+        for skill in self.all_skills:
+            must.append(
+                models.FieldCondition(
+                    key="skills", match=models.MatchValue(value=canonical_skill(skill))
+                )
+            )
+        if self.any_skills:
+            must.append(
+                models.FieldCondition(
+                    key="skills",
+                    match=models.MatchAny(
+                        any=[canonical_skill(skill) for skill in self.any_skills]
+                    ),
+                )
+            )
+        if self.locations:
+            must.append(
+                models.FieldCondition(
+                    key="locations", match=models.MatchAny(any=list(self.locations))
+                )
+            )
+        return must
+
+    def fingerprint(self) -> str:
+        return hashlib.sha1(repr(tuple(self)).encode("utf-8")).hexdigest()[:12]
+
+
+class RankPage(NamedTuple):
+    """
+    One page of a ranking. `next_cursor` fetches the following page and is None on
+    the last one.
+    """
+
+    hits: List[dict]
+    next_cursor: Optional[str]
+
+
+def encode_cursor(offset: int, filters: RankFilter) -> str:
+    data = json.dumps({"offset": offset, "filter": filters.fingerprint()})
+    return base64.urlsafe_b64encode(data.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, filters: RankFilter) -> int:
+    """Return the offset of a cursor, checking it was issued for the same filters."""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        offset = int(data["offset"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if data.get("filter") != filters.fingerprint():
+        raise ValueError("The cursor was issued for different filters")
+    return offset
+
+
+class SerializedClient:
+    """
+    Wraps a client so that only one thread calls it at a time. The in-memory
+    Qdrant is not thread safe: concurrent upserts corrupt its storage.
+    """
+
+    def __init__(self, client):
+        self._client = client
+        self._lock = threading.RLock()
+
+    def __getattr__(self, name):
+        attribute = getattr(self._client, name)
+        if not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            with self._lock:
+                return attribute(*args, **kwargs)
+
+        return call
+
+
+@lru_cache(maxsize=None)
+def get_qdrant_client(url: str = None, api_key: str = None):
+    """
+    Return the process-wide client of a Qdrant server, or of an in-memory Qdrant
+    without `url`. Requests share it, and its connection pool, instead of connecting
+    each time.
+    """
+    from qdrant_client import QdrantClient
+
+    if url:
+        return QdrantClient(url=url, api_key=api_key)
+    return SerializedClient(QdrantClient(":memory:"))
+
+
+def point_id(namespace: str, doc_id) -> str:
+    return str(uuid.uuid5(POINT_ID_NAMESPACE, f"{namespace}/{doc_id}"))
+
+
+def ensure_collection(client, collection_name: str, vector_size: int, indexed: bool):
+    """
+    Create a collection unless it exists, safely across threads and processes.
+    Existing collections are never dropped.
+
+    Args:
+        indexed (bool): Create the payload indexes too. The in-memory Qdrant filters
+            without indexes and warns about them.
+    """
+    from qdrant_client import models
+
+    if collection_name in _ready_collections.get(client, ()):
+        return
+    with _collections_lock:
+        if collection_name in _ready_collections.get(client, ()):
+            return
+        if not client.collection_exists(collection_name):
+            print("Creating new vector collection...", file=sys.stderr)
+            try:
+                client.create_collection(
+                    collection_name=collection_name,
+                    vectors_config=models.VectorParams(
+                        size=vector_size, distance=models.Distance.COSINE
+                    ),
+                )
+            except Exception:
+                # Another process created it in between
+                if not client.collection_exists(collection_name):
+                    raise
+        if indexed:
+            client.create_payload_index(
+                collection_name=collection_name,
+                field_name="namespace",
+                field_schema=models.KeywordIndexParams(
+                    type=models.KeywordIndexType.KEYWORD, is_tenant=True
+                ),
+            )
+            for field, schema in PAYLOAD_INDEXES.items():
+                client.create_payload_index(
+                    collection_name=collection_name,
+                    field_name=field,
+                    field_schema=schema,
+                )
+        _ready_collections.setdefault(client, set()).add(collection_name)
+
 
 class QdrantSearch:
-    def __init__(self, resumes, jd):
-        """Initialize QdrantSearch with resume and job description texts."""
+    def __init__(
+        self,
+        resumes,
+        jd,
+        embedder=None,
+        payloads=None,
+        namespace=None,
+        ids=None,
+        client=None,
+        offline=None,
+    ):
+        """
+        Initialize QdrantSearch with resume and job description texts.
+
+        Args:
+            resumes (list): The resume texts to index.
+            jd (str): The job description to search with.
+            embedder (Embedder): The embedding backend. Defaults to the Cohere API,
+                behind the deadlines, retries and circuit breaker of
+                `get_cohere_embedder`. Requires COHERE_API_KEY unless `offline`.
+            payloads (list): One payload per resume, `candidate_payload` of the text
+                by default.
+            namespace (str): The partition of the shared collection the resumes are
+                stored in and searched, e.g. a tenant or a job id. Without one, the
+                instance gets a private namespace that `close` deletes.
+            ids (list): The document ids of the resumes, unique within the
+                namespace. Their positions by default.
+            client: The Qdrant client, `get_qdrant_client` by default. Requires
+                QDRANT_URL unless `offline`.
+            offline (bool): Use the HashingEmbedder and an in-memory Qdrant for the
+                services that are not configured. `offline_allowed()` by default.
+        """
+        from scripts.similarity.embedder import (
+            HASHING_MODEL,
+            get_cohere_embedder,
+            get_embedder,
+            offline_allowed,
+        )
+
         print("Initializing similarity analysis...", file=sys.stderr)
         # Get API keys from environment variables
-        self.cohere_key = os.getenv('COHERE_API_KEY')
-        self.qdrant_key = os.getenv('QDRANT_API_KEY')
-        self.qdrant_url = os.getenv('QDRANT_URL')
-        
-        if not self.cohere_key:
-            raise ValueError("COHERE_API_KEY environment variable is not set")
-        if not self.qdrant_key:
+        self.cohere_key = os.getenv("COHERE_API_KEY")
+        self.qdrant_key = os.getenv("QDRANT_API_KEY")
+        self.qdrant_url = os.getenv("QDRANT_URL")
+
+        if self.qdrant_url and not self.qdrant_key:
             raise ValueError("QDRANT_API_KEY environment variable is not set")
-        if not self.qdrant_url:
-            raise ValueError("QDRANT_URL environment variable is not set")
-            
+
         self.resumes = resumes
         self.jd = jd
-        
+        self.payloads = payloads
+        self.ids = list(ids) if ids is not None else list(range(len(resumes)))
+        self.namespace = namespace or uuid.uuid4().hex
+        self._private_namespace = namespace is None
+        self._query_vector = None
+
         # Initialize clients
         try:
-            print("Connecting to Cohere and Qdrant...", file=sys.stderr)
-            self.cohere = cohere.Client(self.cohere_key)
-            self.collection_name = "resume_collection_name"
-            self.qdrant = QdrantClient(
-                url=self.qdrant_url,
-                api_key=self.qdrant_key,
-            )
+            if offline is None:
+                offline = offline_allowed()
+            if embedder is None:
+                if self.cohere_key:
+                    print("Connecting to Cohere...", file=sys.stderr)
+                    embedder = get_cohere_embedder()
+                elif offline:
+                    logger.warning("COHERE_API_KEY is not set, using hashing")
+                    embedder = get_embedder(HASHING_MODEL)
+                else:
+                    raise ValueError(
+                        "COHERE_API_KEY environment variable is not set, "
+                        "set SIMILARITY_OFFLINE=1 to use the hashing embedder"
+                    )
+            self.embedder = embedder
+            if client is None:
+                if self.qdrant_url:
+                    print("Connecting to Qdrant...", file=sys.stderr)
+                elif offline:
+                    logger.warning("QDRANT_URL is not set, using an in-memory Qdrant")
+                else:
+                    raise ValueError(
+                        "QDRANT_URL environment variable is not set, "
+                        "set SIMILARITY_OFFLINE=1 to use an in-memory Qdrant"
+                    )
+                client = get_qdrant_client(self.qdrant_url, self.qdrant_key)
+            self.qdrant = client
 
-            # Check if collection exists, create only if it doesn't
-            collections = self.qdrant.get_collections()
-            collection_exists = any(col.name == self.collection_name for col in collections.collections)
-            
-            if not collection_exists:
-                vector_size = 4096
-                print("Creating new vector collection...", file=sys.stderr)
-                self.qdrant.create_collection(
-                    collection_name=self.collection_name,
-                    vectors_config=models.VectorParams(
-                        size=vector_size, 
-                        distance=models.Distance.COSINE
-                    ),
-                )
-            else:
-                print("Resetting existing vector collection...", file=sys.stderr)
-                # Clear existing points
-                self.qdrant.delete_collection(self.collection_name)
-                self.qdrant.create_collection(
-                    collection_name=self.collection_name,
-                    vectors_config=models.VectorParams(
-                        size=vector_size, 
-                        distance=models.Distance.COSINE
-                    ),
-                )
+            vector_size = self.embedder.dim
+            base_name = os.getenv("QDRANT_COLLECTION") or DEFAULT_COLLECTION
+            self.collection_name = f"{base_name}_{vector_size}"
+            ensure_collection(
+                self.qdrant,
+                self.collection_name,
+                vector_size,
+                indexed=bool(self.qdrant_url),
+            )
             print("Vector collection ready", file=sys.stderr)
         except Exception as e:
             logger.error(f"Failed to initialize clients: {str(e)}", exc_info=True)
             raise
 
-    def get_embedding(self, text):
-        """Get text embeddings using Cohere API."""
+    def namespace_filter(self, filters=None):
+        """The Qdrant filter of the namespace, and of the ranking `filters` if any."""
+        from qdrant_client import models
+
+        must = [
+            models.FieldCondition(
+                key="namespace", match=models.MatchValue(value=self.namespace)
+            )
+        ]
+        if filters is not None:
+            must += filters.conditions()
+        return models.Filter(must=must)
+
+    def delete_namespace(self):
+        """Delete every point of the namespace."""
+        from qdrant_client import models
+
+        self.qdrant.delete(
+            collection_name=self.collection_name,
+            points_selector=models.FilterSelector(filter=self.namespace_filter()),
+        )
+
+    def close(self):
+        """Delete the points of a private namespace. Named namespaces are kept."""
+        if self._private_namespace:
+            self.delete_namespace()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get_embeddings(self, texts):
+        """Get text embeddings from the embedder, one list of floats per text."""
         try:
-            print("Generating embeddings using Cohere API...", file=sys.stderr)
-            response = self.cohere.embed(texts=[text], model="large")
-            embeddings = list(map(float, response.embeddings[0]))
+            print("Generating embeddings...", file=sys.stderr)
+            embeddings = self.embedder.embed(texts).tolist()
             print("Embeddings generated successfully", file=sys.stderr)
             return embeddings
         except Exception as e:
             logger.error(f"Error getting embeddings: {str(e)}", exc_info=True)
             raise
 
+    def get_embedding(self, text):
+        """Get the embedding of a single text."""
+        return self.get_embeddings([text])[0]
+
     def update_qdrant(self):
         """Update Qdrant collection with resume vectors."""
+        from qdrant_client.http.models import Batch
+
         try:
             print("Updating Qdrant collection with vectors...", file=sys.stderr)
-            vectors = []
-            ids = []
-            for i, resume in enumerate(self.resumes):
-                vector = self.get_embedding(resume)
-                vectors.append(vector)
-                ids.append(i)
-            
+            # One embedding call for all resumes instead of one per resume
+            vectors = self.get_embeddings(self.resumes)
+            payloads = self.payloads or [
+                candidate_payload(resume) for resume in self.resumes
+            ]
+            payloads = [
+                {**payload, "namespace": self.namespace, "doc_id": doc_id}
+                for payload, doc_id in zip(payloads, self.ids)
+            ]
+
             self.qdrant.upsert(
                 collection_name=self.collection_name,
                 points=Batch(
-                    ids=ids,
+                    ids=[point_id(self.namespace, doc_id) for doc_id in self.ids],
                     vectors=vectors,
-                    payloads=[{"text": resume} for resume in self.resumes],
+                    payloads=payloads,
                 ),
             )
             print("Vectors uploaded to Qdrant successfully", file=sys.stderr)
@@ -113,41 +420,116 @@ class QdrantSearch:
         try:
             print("Performing similarity search in Qdrant...", file=sys.stderr)
             vector = self.get_embedding(self.jd)
-            hits = self.qdrant.search(
+            hits = self.qdrant.query_points(
                 collection_name=self.collection_name,
-                query_vector=vector,
-                limit=30
-            )
-            
+                query=vector,
+                query_filter=self.namespace_filter(),
+                limit=30,
+            ).points
+
             results = []
             for hit in hits:
+                # The first 100 characters are a preview
                 result = {
-                    "text": str(hit.payload.get("text", ""))[:100],  # Get first 100 chars for preview
-                    "score": float(hit.score)  # Ensure score is a float
+                    "text": str(hit.payload.get("text", ""))[:100],
+                    "score": float(hit.score),
                 }
                 results.append(result)
-            
+
             print(f"Search completed. Found {len(results)} matches", file=sys.stderr)
             return results
         except Exception as e:
             logger.error(f"Error performing search: {str(e)}", exc_info=True)
             raise
 
-def get_similarity_score(resume_string, job_description_string):
-    """Calculate similarity score between resume and job description."""
+    def rank(
+        self,
+        filters: RankFilter = None,
+        limit: int = 10,
+        offset: int = 0,
+        cursor: str = None,
+        preview_chars: Optional[int] = 100,
+    ) -> RankPage:
+        """
+        Rank the indexed resumes against the job description, one page at a time.
+
+        The filters are pushed into the vector search, which only scores the points
+        whose indexed payload matches, so a page is never over-fetched and then
+        filtered. The job description is embedded once per QdrantSearch.
+
+        Args:
+            filters (RankFilter): Conditions on years of experience, skills and
+                locations.
+            limit (int): The size of the page.
+            offset (int): The number of hits to skip, for the first page requested.
+            cursor (str): The `next_cursor` of the previous page, instead of `offset`.
+            preview_chars (int): Truncate the text of the hits to this many
+                characters, None for the whole text.
+
+        Returns:
+            RankPage: The hits with their document "id", "score", "text" and
+            structured fields, and the cursor of the next page.
+        """
+        filters = filters or RankFilter()
+        if cursor is not None:
+            offset = decode_cursor(cursor, filters)
+        if self._query_vector is None:
+            self._query_vector = self.get_embedding(self.jd)
+
+        # One extra hit tells whether there is a next page
+        points = self.qdrant.query_points(
+            collection_name=self.collection_name,
+            query=self._query_vector,
+            query_filter=self.namespace_filter(filters),
+            limit=limit + 1,
+            offset=offset,
+            with_payload=HIT_PAYLOAD,
+        ).points
+
+        hits = []
+        for point in points[:limit]:
+            payload = dict(point.payload)
+            hit = {"id": payload.pop("doc_id", point.id), "score": float(point.score)}
+            hit.update(payload)
+            if preview_chars is not None:
+                hit["text"] = str(hit.get("text", ""))[:preview_chars]
+            hits.append(hit)
+        next_cursor = (
+            encode_cursor(offset + limit, filters) if len(points) > limit else None
+        )
+        return RankPage(hits, next_cursor)
+
+
+def get_similarity_score(
+    resume_string, job_description_string, embedder=None, offline=None
+):
+    """
+    Calculate similarity score between resume and job description.
+
+    Args:
+        embedder (Embedder): The embedding backend, see `QdrantSearch`.
+        offline (bool): See `QdrantSearch`.
+    """
     try:
         print("Starting similarity analysis...", file=sys.stderr)
-        
+
         if not resume_string or not job_description_string:
             raise ValueError("Resume and job description strings cannot be empty")
-            
-        qdrant_search = QdrantSearch([resume_string], job_description_string)
-        qdrant_search.update_qdrant()
-        search_result = qdrant_search.search()
-        
+
+        # A single resume is scored, not ranked: no filter fields needed
+        with QdrantSearch(
+            [resume_string],
+            job_description_string,
+            embedder=embedder,
+            payloads=[{"text": resume_string}],
+            offline=offline,
+        ) as qdrant_search:
+            qdrant_search.update_qdrant()
+            search_result = qdrant_search.search()
+
         print("Similarity analysis completed successfully", file=sys.stderr)
         return search_result
-        
+
     except Exception as e:
         logger.error(f"Error in similarity analysis: {str(e)}", exc_info=True)
         raise
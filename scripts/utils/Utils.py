@@ -1,10 +1,7 @@
 import re
 from uuid import uuid4
 
-import spacy
-
-# Load the English model
-nlp = spacy.load("en_core_web_md")
+from .models import get_nlp
 
 REGEX_PATTERNS = {
     "email_pattern": r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b",
@@ -53,7 +50,7 @@ class TextCleaner:
             str: The cleaned text.
         """
         text = TextCleaner.remove_emails_links(text)
-        doc = nlp(text)
+        doc = get_nlp()(text)
         for token in doc:
             if token.pos_ == "PUNCT":
                 text = text.replace(token.text, "")
@@ -69,7 +66,7 @@ class TextCleaner:
         Returns:
             str: The cleaned text.
         """
-        doc = nlp(text)
+        doc = get_nlp()(text)
         for token in doc:
             if token.is_stop:
                 text = text.replace(token.text, "")
@@ -78,9 +75,14 @@ class TextCleaner:
 
 class CountFrequency:
 
-    def __init__(self, text):
+    def __init__(self, text, doc=None):
+        """
+        Args:
+            text (str): The text to count.
+            doc (Doc): An existing parse of the text, to avoid parsing it again.
+        """
         self.text = text
-        self.doc = nlp(text)
+        self.doc = doc if doc is not None else get_nlp()(text)
 
     def count_frequency(self):
         """
@@ -89,10 +91,7 @@ class CountFrequency:
         Returns:
             dict: A dictionary with the words as keys and the frequency as values.
         """
-        pos_freq = {}
-        for token in self.doc:
-            if token.pos_ in pos_freq:
-                pos_freq[token.pos_] += 1
-            else:
-                pos_freq[token.pos_] = 1
-        return pos_freq
+        from spacy.attrs import POS
+
+        strings = self.doc.vocab.strings
+        return {strings[pos]: count for pos, count in self.doc.count_by(POS).items()}
@@ -0,0 +1,250 @@
+import bisect
+import cProfile
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the histogram buckets, in seconds
+DEFAULT_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    float("inf"),
+)
+
+METRIC_NAME = "resume_matcher_stage_seconds"
+
+
+class Histogram:
+    """
+    A cumulative-bucket histogram of durations, in the layout Prometheus expects.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        """
+        Record one duration in seconds.
+        """
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def to_dict(self) -> dict:
+        """
+        Return the histogram with cumulative bucket counts.
+        """
+        cumulative, running = [], 0
+        for count in self.counts:
+            running += count
+            cumulative.append(running)
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "buckets": {
+                ("+Inf" if bound == float("inf") else str(bound)): total
+                for bound, total in zip(self.buckets, cumulative)
+            },
+        }
+
+
+_histograms = {}
+_lock = threading.Lock()
+
+
+def observe(name: str, seconds: float):
+    """
+    Record the duration of one run of a stage.
+    """
+    with _lock:
+        if name not in _histograms:
+            _histograms[name] = Histogram()
+        _histograms[name].observe(seconds)
+
+
+@contextmanager
+def stage(name: str):
+    """
+    Time the enclosed block and record it under the stage `name`.
+
+    Example:
+        with stage("resume.sgrank"):
+            keyterms = KeytermExtractor(text).get_keyterms_based_on_sgrank()
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start)
+
+
+def timed(name: str):
+    """
+    Decorator version of `stage`.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def get_stats() -> dict:
+    """
+    Return a snapshot of every stage histogram.
+    """
+    with _lock:
+        return {name: histogram.to_dict() for name, histogram in _histograms.items()}
+
+
+def reset():
+    """
+    Drop all recorded timings.
+    """
+    with _lock:
+        _histograms.clear()
+
+
+def _write_atomic(path: str, content: str):
+    # Prometheus' textfile collector may read the file at any time
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def export_prometheus(path: str = None) -> str:
+    """
+    Render the stage histograms in the Prometheus text exposition format.
+
+    Args:
+        path (str): If given, the output is also written to this file, e.g. for the
+            node_exporter textfile collector.
+
+    Returns:
+        str: The rendered metrics.
+    """
+    lines = [
+        f"# HELP {METRIC_NAME} Time spent in each stage of the parse pipeline.",
+        f"# TYPE {METRIC_NAME} histogram",
+    ]
+    for name, histogram in sorted(get_stats().items()):
+        for bound, total in histogram["buckets"].items():
+            lines.append(f'{METRIC_NAME}_bucket{{stage="{name}",le="{bound}"}} {total}')
+        lines.append(f'{METRIC_NAME}_sum{{stage="{name}"}} {histogram["sum"]}')
+        lines.append(f'{METRIC_NAME}_count{{stage="{name}"}} {histogram["count"]}')
+    output = "\n".join(lines) + "\n"
+
+    if path:
+        _write_atomic(path, output)
+    return output
+
+
+def export_json(path: str = None) -> dict:
+    """
+    Return the stage histograms as a dictionary, optionally writing them to a JSON file.
+    """
+    stats = get_stats()
+    if path:
+        _write_atomic(path, json.dumps(stats, indent=2))
+    return stats
+
+
+class SamplingProfiler:
+    """
+    A low-overhead profiler that samples the stack of one thread at a fixed interval.
+
+    The samples are written in the "folded stacks" format understood by flamegraph.pl
+    and speedscope: one line per distinct stack with its sample count.
+    """
+
+    def __init__(self, interval: float = 0.005, thread_id: int = None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                location = f"{os.path.basename(code.co_filename)}:{code.co_firstlineno}"
+                stack.append(f"{code.co_name} ({location})")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def dump(self, path: str):
+        with open(path, "w") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+@contextmanager
+def profile(path: str, mode: str = "cprofile"):
+    """
+    Profile the enclosed block and write the profile to `path`.
+
+    Args:
+        path (str): The output file. cProfile output can be read with `pstats` or
+            snakeviz, sampling output with flamegraph.pl or speedscope.
+        mode (str): "cprofile" for a deterministic profile, "sampling" for a sampling
+            profile of the current thread.
+    """
+    if mode == "cprofile":
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield profiler
+        finally:
+            profiler.disable()
+            profiler.dump_stats(path)
+    elif mode == "sampling":
+        profiler = SamplingProfiler()
+        profiler.start()
+        try:
+            yield profiler
+        finally:
+            profiler.stop()
+            profiler.dump(path)
+    else:
+        raise ValueError(f"Unknown profiler '{mode}', expected cprofile or sampling")
+    logger.info(f"Profile written to {path}")
@@ -1,42 +1,63 @@
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import os
+import queue
+
+_listener = None
 
 
 def get_handlers(
-    filename="app.log", mode="w", file_level=logging.DEBUG, stderr_level=logging.DEBUG
+    filename="app.log",
+    mode="a",
+    file_level=logging.DEBUG,
+    stderr_level=logging.DEBUG,
+    max_bytes=10 * 1024 * 1024,
+    backup_count=5,
+    json_format=False,
 ):
     """
-    The function `get_handlers` returns a stream handler and a file handler with specified logging
-    levels and formatters.
+    The function `get_handlers` returns a stream handler and a rotating file handler
+    with specified logging levels and formatters.
 
     Args:
       filename: The `filename` parameter is the name of the log file where the log messages will be
     written. In this case, the default filename is "app.log". Defaults to app.log
       mode: The `mode` parameter in the `get_handlers` function specifies the mode in which the file
-    should be opened. In this case, the default mode is set to "w", which stands for write mode. This
-    means that if the file already exists, it will be truncated (i.e., its. Defaults to w
+    should be opened. The default is "a", which appends to an existing log file
+    instead of truncating it. Defaults to a
       file_level: The `file_level` parameter in the `get_handlers` function is used to specify the
     logging level for the file handler. In this case, it is set to `logging.DEBUG`, which means that the
     file handler will log all messages at the DEBUG level and above.
       stderr_level: The `stderr_level` parameter in the `get_handlers` function is used to specify the
     logging level for the StreamHandler that outputs log messages to the standard error stream (stderr).
     This level determines which log messages will be processed and output by the StreamHandler.
+      max_bytes: The size in bytes at which the log file is rotated. Defaults to 10 MB
+      backup_count: The number of rotated log files to keep. Defaults to 5
+      json_format: If `True`, both handlers write one JSON object per record instead
+    of text.
+
+    The file handler rotates the file it writes, so only one process may own it.
+    Pre-forked children switch to files of their own, see `process_log_file`.
 
     Returns:
       The `get_handlers` function returns two logging handlers: `stderr_handler` which is a
-    StreamHandler for logging to stderr, and `file_handler` which is a FileHandler for logging to a file
-    specified by the `filename` parameter.
+    StreamHandler for logging to stderr, and `file_handler` which is a
+    RotatingFileHandler for logging to a file specified by the `filename` parameter.
     """
     # Stream handler
     stderr_handler = logging.StreamHandler()
     stderr_handler.setLevel(stderr_level)
-    stderr_handler.setFormatter(CustomFormatter())
+    stderr_handler.setFormatter(JsonFormatter() if json_format else CustomFormatter())
 
     # File handler
-    file_handler = logging.FileHandler(filename, mode=mode)
+    file_handler = logging.handlers.RotatingFileHandler(
+        filename, mode=mode, maxBytes=max_bytes, backupCount=backup_count, delay=True
+    )
     file_handler.setLevel(file_level)
-    file_handler.setFormatter(CustomFormatter(True))
-
-    # TODO: Add RotatingFileHandler
+    file_handler.setFormatter(JsonFormatter() if json_format else CustomFormatter(True))
 
     return stderr_handler, file_handler
 
@@ -50,6 +71,8 @@ class CustomFormatter(logging.Formatter):
 
     Attributes:
         FORMATS (dict): A dictionary mapping log levels to colorized log message formats.
+        FORMATTERS (dict): A dictionary mapping log levels to formatters built from
+            `FORMATS`.
 
     Methods:
         format(record): Formats the log record with the appropriate colorized log message format.
@@ -83,6 +106,9 @@ class CustomFormatter(logging.Formatter):
             logging.ERROR: red + log + msg,
             logging.CRITICAL: bold_red + log + msg,
         }
+        self.FORMATTERS = {
+            level: logging.Formatter(log_fmt) for level, log_fmt in self.FORMATS.items()
+        }
 
     def format(self, record):
         """
@@ -95,51 +121,198 @@ class CustomFormatter(logging.Formatter):
             str: The formatted log message.
 
         """
-        log_fmt = self.FORMATS.get(record.levelno)
-        formatter = logging.Formatter(log_fmt)
+        formatter = self.FORMATTERS.get(record.levelno, self.FORMATTERS[logging.DEBUG])
         return formatter.format(record)
 
 
+class JsonFormatter(logging.Formatter):
+    """
+    A log formatter that writes each record as a single line of JSON.
+    """
+
+    def format(self, record):
+        """
+        Formats the log record as a JSON object.
+
+        Args:
+            record (LogRecord): The log record to be formatted.
+
+        Returns:
+            str: The JSON encoded log record.
+
+        """
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "file": record.filename,
+            "line": record.lineno,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry)
+
+
+class LocalQueueHandler(logging.handlers.QueueHandler):
+    """
+    A `QueueHandler` for a queue read in the same process. The base class formats the
+    record and drops its exception info so it can be pickled; here the message is only
+    merged with its arguments and the exception info is kept for the formatters.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+
 def init_logging_config(
     basic_log_level=logging.INFO,
     filename="app.log",
-    mode="w",
+    mode="a",
     file_level=logging.DEBUG,
     stderr_level=logging.DEBUG,
+    json_format=False,
+    max_bytes=10 * 1024 * 1024,
+    backup_count=5,
 ):
     """
     The function `init_logging_config` initializes logging configuration in Python by setting basic log
-    level, configuring handlers, and adding them to the logger.
+    level and routing records through a queue to the stderr and file handlers.
+
+    The root logger only gets a `QueueHandler`, so logging from a request thread is a
+    queue put. A `QueueListener` thread formats the records and does the file I/O.
+    Calling the function again only updates the root log level; handlers are never
+    added twice.
 
     Args:
       basic_log_level: The `basic_log_level` parameter is used to set the logging level for the root
     logger. In this function, it is set to `logging.INFO` by default, which means that log messages with
     severity level INFO or higher will be processed.
       filename: The `filename` parameter is a string that specifies the name of the log file where the
-    logs will be written. In the `init_logging_config` function you provided, the default value for
-    `filename` is "app.log". This means that if no filename is provided when calling the function, logs.
-    Defaults to app.log
+    logs will be written. Defaults to app.log
       mode: The `mode` parameter in the `init_logging_config` function specifies the mode in which the
-    log file will be opened. In this case, the default value is "w" which stands for write mode. This
-    means that the log file will be opened for writing, and if the file already exists. Defaults to w
+    log file will be opened. The default is "a", so restarting the application keeps
+    earlier logs. Defaults to a
       file_level: The `file_level` parameter in the `init_logging_config` function is used to specify
     the logging level for the file handler. This determines the severity level of log messages that will
-    be written to the log file specified by the `filename` parameter. In this case, the default value
-    for `file
+    be written to the log file specified by the `filename` parameter.
       stderr_level: The `stderr_level` parameter in the `init_logging_config` function is used to
     specify the logging level for the stderr (standard error) handler. This handler is responsible for
     directing log messages to the standard error stream. The logging level determines which severity of
     log messages will be output to the stderr.
+      json_format: If `True`, the handlers write structured JSON lines instead of text.
+      max_bytes: The size in bytes at which the log file is rotated. Defaults to 10 MB
+      backup_count: The number of rotated log files to keep. Defaults to 5
     """
+    global _listener
 
     logger = logging.getLogger()
     logger.setLevel(basic_log_level)
 
+    if _listener is not None:
+        return
+
     # Get the handlers
     stderr_handler, file_handler = get_handlers(
-        file_level=file_level, stderr_level=stderr_level, filename=filename, mode=mode
+        file_level=file_level,
+        stderr_level=stderr_level,
+        filename=filename,
+        mode=mode,
+        max_bytes=max_bytes,
+        backup_count=backup_count,
+        json_format=json_format,
     )
 
-    # Add the handlers
-    logger.addHandler(stderr_handler)
-    logger.addHandler(file_handler)
+    # Add the handlers behind a queue so the I/O happens on the listener thread
+    log_queue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(
+        log_queue, stderr_handler, file_handler, respect_handler_level=True
+    )
+    _listener.start()
+    logger.addHandler(LocalQueueHandler(log_queue))
+
+
+def shutdown_logging():
+    """
+    The function `shutdown_logging` flushes the pending records and stops the listener
+    thread started by `init_logging_config`. Logging can be initialized again
+    afterwards.
+    """
+    global _listener
+
+    if _listener is None:
+        return
+
+    logger = logging.getLogger()
+    for handler in list(logger.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            logger.removeHandler(handler)
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+def process_log_file(filename, pid=None):
+    """
+    The function `process_log_file` returns the log file of a forked process:
+    "app.log" becomes "app.<pid>.log".
+    """
+    root, ext = os.path.splitext(filename)
+    return f"{root}.{pid or os.getpid()}{ext}"
+
+
+def _stop_listener_before_fork():
+    # Write the queued records first, so the child does not inherit and repeat them
+    if _listener is not None:
+        _listener.stop()
+
+
+def _start_listener_after_fork():
+    if _listener is not None:
+        _listener.start()
+
+
+def _restart_listener_after_fork():
+    # The listener thread does not survive os.fork(), so a pre-forked child would
+    # queue records that nobody writes. Start a fresh listener on the same queue.
+    # Processes rotating one file would rename it under each other, so the child
+    # writes to a file of its own.
+    global _listener
+
+    if _listener is not None:
+        handlers = []
+        for handler in _listener.handlers:
+            if isinstance(handler, logging.handlers.RotatingFileHandler):
+                own = logging.handlers.RotatingFileHandler(
+                    process_log_file(handler.baseFilename),
+                    mode=handler.mode,
+                    maxBytes=handler.maxBytes,
+                    backupCount=handler.backupCount,
+                    delay=True,
+                )
+                own.setLevel(handler.level)
+                own.setFormatter(handler.formatter)
+                handler = own
+            handlers.append(handler)
+        _listener = logging.handlers.QueueListener(
+            _listener.queue, *handlers, respect_handler_level=True
+        )
+        _listener.start()
+
+
+# Registered once: shutting down is a no-op when logging was not initialized
+atexit.register(shutdown_logging)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(
+        before=_stop_listener_before_fork,
+        after_in_parent=_start_listener_after_fork,
+        after_in_child=_restart_listener_after_fork,
+    )
@@ -0,0 +1,47 @@
+import logging
+import os
+import threading
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+# The one pipeline every stage shares: cleaning, extraction, counting and textacy
+DEFAULT_MODEL = "en_core_web_md"
+
+_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _load(name: str, exclude: tuple = ()):
+    import spacy
+
+    logger.info(f"Loading spaCy model {name}")
+    return spacy.load(name, exclude=list(exclude))
+
+
+def get_model_name() -> str:
+    """
+    Return the name of the shared model, the SPACY_MODEL environment variable if it
+    is set and `DEFAULT_MODEL` otherwise.
+    """
+    return os.getenv("SPACY_MODEL") or DEFAULT_MODEL
+
+
+def get_nlp():
+    """
+    Return the pipeline shared by every stage, loading it on first use.
+
+    Components listed in SPACY_EXCLUDE (comma separated) are not loaded at all,
+    which saves their memory in every worker.
+    """
+    exclude = os.getenv("SPACY_EXCLUDE", "")
+    with _lock:
+        return _load(
+            get_model_name(),
+            tuple(name.strip() for name in exclude.split(",") if name.strip()),
+        )
+
+
+def loaded_models() -> int:
+    """Return how many spaCy pipelines this process holds."""
+    return _load.cache_info().currsize
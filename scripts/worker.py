@@ -0,0 +1,276 @@
+"""
+A long-lived analysis worker that keeps the models warm between requests.
+
+Requests and responses are JSON objects, one per line:
+
+    {"id": 1, "resume_path": "...", "job_path": "...", "mode": "full"}
+    {"id": 1, "ok": true, "result": {...}}
+
+Texts can be sent directly with "resume_text" and "job_text" instead of paths,
+{"op": "ping"} checks that the worker is alive and {"op": "metrics"} returns the
+stage timings of the process that answers. "profile_name" and "profiler" profile a
+single request; the profile is written under WORKER_PROFILE_DIR with that file name.
+"incremental": true reuses the parse of resume sections that did not change since an
+earlier request to the same process.
+
+A posting scored against many resumes is registered once and then referred to by id,
+so only the resume side is processed per request:
+
+    {"id": 2, "op": "register_job", "job_id": "job-42", "job_text": "..."}
+    {"id": 3, "resume_text": "...", "job_id": "job-42", "mode": "fast"}
+
+Set JOB_REGISTRY_PATH to share the registered jobs between pre-forked workers.
+
+Serve on stdin/stdout (one process):
+
+    python -m scripts.worker
+
+Serve on a Unix socket with a pre-forked pool. The models are loaded once in the
+parent and shared copy-on-write by the children:
+
+    python -m scripts.worker --socket /tmp/resume-matcher.sock --workers 4
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import signal
+import socket
+import sys
+import tempfile
+import time
+
+from .JobRegistry import get_job_registry
+from .processor import process_files, process_texts, warm_up
+from .utils import instrumentation
+
+logger = logging.getLogger(__name__)
+
+# Requests only name their profile; the directory is the operator's choice
+PROFILE_DIR = os.getenv(
+    "WORKER_PROFILE_DIR", os.path.join(tempfile.gettempdir(), "resume-matcher-profiles")
+)
+
+# A child that dies sooner than this after its start is restarted after a delay that
+# doubles with each such death, up to the maximum
+RESTART_WINDOW = 5.0
+RESTART_BACKOFF = 0.5
+RESTART_MAX_BACKOFF = 30.0
+
+
+def profile_path(name: str) -> str:
+    """
+    Return the path in `PROFILE_DIR` a request's profile is written to.
+
+    Raises:
+        ValueError: The name is not a plain file name.
+    """
+    if not name:
+        return None
+    if os.path.basename(name) != name or name.startswith("."):
+        raise ValueError(f"Invalid profile name '{name}', expected a file name")
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    return os.path.join(PROFILE_DIR, name)
+
+
+def handle_request(request: dict) -> dict:
+    """
+    Run one request and wrap the outcome in a response object.
+
+    Args:
+        request (dict): A decoded request line.
+
+    Returns:
+        dict: The response, with "ok" set and either "result" or "error".
+    """
+    response = {"id": request.get("id")}
+    try:
+        options = {
+            "mode": request.get("mode", "full"),
+            "output_format": request.get("output_format", "json"),
+            "profile_path": profile_path(request.get("profile_name")),
+            "profiler": request.get("profiler", "cprofile"),
+            "incremental": request.get("incremental", False),
+        }
+        if request.get("op") == "ping":
+            result = "pong"
+        elif request.get("op") == "metrics":
+            if request.get("format") == "prometheus":
+                result = instrumentation.export_prometheus()
+            else:
+                result = instrumentation.export_json()
+        elif request.get("op") == "register_job":
+            job = get_job_registry().register(request["job_id"], request["job_text"])
+            result = {"job_id": job.job_id, "version": job.version}
+        elif "job_id" in request:
+            result = process_texts(
+                request["resume_text"], None, job_id=request["job_id"], **options
+            )
+        elif "resume_text" in request:
+            result = process_texts(
+                request["resume_text"], request["job_text"], **options
+            )
+        else:
+            result = process_files(
+                request["resume_path"], request["job_path"], **options
+            )
+        response.update(ok=True, result=result)
+    except Exception as e:
+        logger.error(f"Request {response['id']} failed: {str(e)}", exc_info=True)
+        response.update(ok=False, error=f"{type(e).__name__}: {e}")
+    return response
+
+
+def serve_stream(reader, writer):
+    """
+    Answer JSON-lines requests from `reader` on `writer` until end of input.
+    """
+    for line in reader:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            response = {"id": None, "ok": False, "error": f"Invalid JSON: {e}"}
+        else:
+            response = handle_request(request)
+        writer.write(json.dumps(response) + "\n")
+        writer.flush()
+
+
+def _serve_connections(listener: socket.socket):
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    while True:
+        connection, _ = listener.accept()
+        with connection, connection.makefile("r", encoding="utf-8") as reader:
+            with connection.makefile("w", encoding="utf-8") as writer:
+                try:
+                    serve_stream(reader, writer)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+
+def _spawn(listener: socket.socket) -> int:
+    pid = os.fork()
+    if pid == 0:
+        try:
+            _serve_connections(listener)
+        finally:
+            os._exit(0)
+    return pid
+
+
+def serve_socket(socket_path: str, workers: int):
+    """
+    Pre-fork `workers` processes that accept connections on a Unix socket.
+
+    The parent loads the models before forking and restarts children that die,
+    backing off while they keep dying soon after they start.
+    """
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(socket_path)
+    listener.listen(128)
+
+    # Keep the warm objects out of the collector so children don't dirty their pages
+    gc.freeze()
+    children = {_spawn(listener): time.monotonic() for _ in range(workers)}
+    logger.info(f"Serving on {socket_path} with {workers} workers")
+
+    def stop(signum, frame):
+        for pid in children:
+            os.kill(pid, signal.SIGTERM)
+        listener.close()
+        os.unlink(socket_path)
+        sys.exit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    failures = 0
+    while True:
+        pid, status = os.wait()
+        started = children.pop(pid, None)
+        if started is not None and time.monotonic() - started < RESTART_WINDOW:
+            failures += 1
+        else:
+            failures = 0
+        delay = (
+            min(RESTART_MAX_BACKOFF, RESTART_BACKOFF * 2 ** (failures - 1))
+            if failures
+            else 0.0
+        )
+        logger.warning(
+            f"Worker {pid} exited with status {status}, restarting in {delay:.1f} s"
+        )
+        time.sleep(delay)
+        children[_spawn(listener)] = time.monotonic()
+
+
+class WorkerClient:
+    """
+    A client for a worker serving on a Unix socket.
+    """
+
+    def __init__(self, socket_path: str):
+        self.connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.connection.connect(socket_path)
+        self.reader = self.connection.makefile("r", encoding="utf-8")
+        self.writer = self.connection.makefile("w", encoding="utf-8")
+        self.next_id = 0
+
+    def request(self, payload: dict) -> dict:
+        """
+        Send one request and wait for its response.
+        """
+        self.next_id += 1
+        self.writer.write(json.dumps({"id": self.next_id, **payload}) + "\n")
+        self.writer.flush()
+        return json.loads(self.reader.readline())
+
+    def process_files(self, resume_path, job_path, mode="full", output_format="json"):
+        """
+        Same as `scripts.processor.process_files`, run by the worker.
+        """
+        response = self.request(
+            {
+                "resume_path": resume_path,
+                "job_path": job_path,
+                "mode": mode,
+                "output_format": output_format,
+            }
+        )
+        if not response["ok"]:
+            raise RuntimeError(response["error"])
+        return response["result"]
+
+    def close(self):
+        self.reader.close()
+        self.writer.close()
+        self.connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--socket", help="Serve on this Unix socket path")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of pre-forked workers in socket mode",
+    )
+    args = parser.parse_args()
+
+    warm_up()
+    if args.socket:
+        serve_socket(args.socket, args.workers)
+    else:
+        serve_stream(sys.stdin, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
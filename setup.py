@@ -4,6 +4,7 @@ setup(
     name="resume_matcher",
     version="0.1",
     packages=find_packages(),
+    package_data={"scripts": ["data/*.json"]},
     install_requires=[
         "cohere",
         "spacy",
@@ -11,7 +12,8 @@ setup(
         "pdfminer.six",
         "nltk",
         "textacy",
-        "qdrant-client",
+        "qdrant-client[fastembed]",
+        "numpy",
         "pypdf",
     ],
 )
@@ -1,6 +1,6 @@
 import os
 from dotenv import load_dotenv
-from resume_matcher.scripts.processor import process_files
+from scripts.processor import process_files
 
 def test_analysis():
     try:
@@ -0,0 +1,116 @@
+import math
+
+import numpy as np
+import pytest
+
+from scripts.similarity.bm25 import BM25Index, TwoStageRetriever, document_terms
+
+CORPUS = {
+    "python": ["python", "django", "python", "sql"],
+    "java": ["java", "spring", "sql"],
+    "chef": ["pastry", "desserts", "french"],
+}
+
+
+@pytest.fixture
+def index():
+    index = BM25Index()
+    for doc_id, terms in CORPUS.items():
+        index.add(doc_id, terms)
+    return index
+
+
+def test_document_terms():
+    document = {
+        "keyword_counts": {"Python": 2, "SQL": 1},
+        "keyterms": [["Django", 0.5]],
+    }
+
+    assert document_terms(document) == ["python", "python", "sql", "django"]
+    assert document_terms({"extracted_keywords": ["Java"], "keyterms": ["Spring"]}) == [
+        "java",
+        "spring",
+    ]
+
+
+def test_scores_follow_okapi_bm25(index):
+    k1, b = index.k1, index.b
+    average_length = 10 / 3
+    idf = math.log(1 + (3 - 1 + 0.5) / (1 + 0.5))
+    norm = k1 * (1 - b + b * 4 / average_length)
+
+    assert index.term_weights("python") == {
+        "python": pytest.approx(idf * 2 * (k1 + 1) / (2 + norm))
+    }
+    # A term in more documents is worth less
+    assert index.idf("sql") < index.idf("django")
+
+
+def test_ranking(index):
+    results = index.search(["python", "sql"])
+
+    assert [doc_id for doc_id, _ in results] == ["python", "java"]
+    assert results[0][1] > results[1][1] > 0
+    assert index.search(["python", "sql"], top_k=1) == results[:1]
+
+
+def test_empty_queries(index):
+    assert index.search([]) == []
+    assert index.search(["cobol"]) == []
+    assert BM25Index().search(["python"]) == []
+
+
+def test_add_replaces_and_remove(index):
+    index.add("java", ["kotlin"])
+    assert index.search(["java"]) == []
+    assert index.total_length == 8
+
+    assert index.remove("java")
+    assert not index.remove("java")
+    assert "java" not in index and len(index) == 2
+    assert "kotlin" not in index.postings
+
+
+# Embeddings that disagree with BM25: the rerank must put "python" first
+VECTORS = {
+    "sql spring": [1.0, 0.0],
+    "python django python sql": [2.0, 0.0],
+    "java spring sql": [0.0, 1.0],
+    "python sql": [1.0, 1.0],
+}
+
+
+def test_two_stage_reranks_candidates():
+    calls = []
+
+    def embed(texts):
+        calls.append(len(texts))
+        return np.array([VECTORS[text] for text in texts])
+
+    retriever = TwoStageRetriever(embed)
+    for doc_id, terms in CORPUS.items():
+        retriever.add_document({"extracted_keywords": terms}, doc_id)
+    query = {"extracted_keywords": ["sql", "spring"]}
+    assert [doc_id for doc_id, _ in retriever.index.search(["sql", "spring"])] == [
+        "java",
+        "python",
+    ]
+
+    assert retriever.search(query, candidates=2) == [
+        ("python", pytest.approx(1.0)),
+        ("java", pytest.approx(0.0)),
+    ]
+    # Only the BM25 shortlist is reranked
+    assert retriever.search(query, candidates=1) == [("java", pytest.approx(0.0))]
+    assert retriever.search(query, candidates=2, top_n=1)[0][0] == "python"
+    assert retriever.search({"extracted_keywords": ["cobol"]}) == []
+
+    # Document embeddings are computed once, and again when the document changes
+    assert calls == [1, 2, 1, 1]
+    retriever.add_document({"extracted_keywords": ["python", "sql"]}, "java")
+    assert retriever.search(query, candidates=2)[1] == (
+        "java",
+        pytest.approx(math.sqrt(0.5)),
+    )
+    assert calls == [1, 2, 1, 1, 1, 1]
+    assert retriever.remove("java") and "java" not in retriever.vectors
@@ -0,0 +1,170 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from Demo.DemoData import jobs, resumes
+from scripts import processor
+from scripts.similarity.embedder import HashingEmbedder, LocalEmbedder
+from scripts.similarity.get_similarity_score import get_similarity_score
+
+
+def test_hashing_embedder_vectors():
+    embedder = HashingEmbedder(dim=256)
+    vectors = embedder.embed(["Python developer", "Python developer", ""])
+
+    assert vectors.shape == (3, 256)
+    assert vectors.dtype == np.float32
+    assert np.array_equal(vectors[0], vectors[1])
+    assert np.isclose(np.linalg.norm(vectors[0]), 1.0)
+    assert not vectors[2].any()
+
+
+def test_hashing_embedder_ranks_related_texts_higher():
+    embedder = HashingEmbedder()
+    job, related, unrelated = embedder.embed(
+        [
+            "Senior Java developer with Spring Boot and microservices",
+            "Java developer, five years of Spring Boot microservices",
+            "Pastry chef experienced in French desserts",
+        ]
+    )
+
+    assert job @ related > job @ unrelated
+
+
+def test_hashing_embedder_is_fast():
+    embedder = HashingEmbedder()
+    texts = [resume["resume"] for resume in resumes]
+    embedder.embed(texts)
+
+    start = time.perf_counter()
+    embedder.embed(texts)
+    per_document = (time.perf_counter() - start) / len(texts)
+    assert per_document < 0.005
+
+
+def test_similarity_score_offline(monkeypatch):
+    for name in ("COHERE_API_KEY", "QDRANT_URL", "QDRANT_API_KEY"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.delenv("SIMILARITY_OFFLINE", raising=False)
+
+    with pytest.raises(ValueError, match="COHERE_API_KEY"):
+        get_similarity_score(resumes[0]["resume"], jobs[0]["job_desc"])
+    with pytest.raises(ValueError, match="QDRANT_URL"):
+        get_similarity_score(
+            resumes[0]["resume"], jobs[0]["job_desc"], embedder=HashingEmbedder()
+        )
+
+    hits = get_similarity_score(resumes[0]["resume"], jobs[0]["job_desc"], offline=True)
+    assert len(hits) == 1
+    assert 0 < hits[0]["score"] <= 1
+
+
+def test_match_score_falls_back_only_when_offline(monkeypatch):
+    monkeypatch.setenv("COHERE_API_KEY", "key")
+    monkeypatch.setenv("QDRANT_URL", "http://127.0.0.1:9")
+    monkeypatch.setenv("QDRANT_API_KEY", "key")
+    monkeypatch.delenv("SIMILARITY_OFFLINE", raising=False)
+
+    with pytest.raises(Exception):
+        processor.get_match_score("java spring", "java spring")
+
+    monkeypatch.setenv("SIMILARITY_OFFLINE", "1")
+    assert processor.get_match_score("java spring", "java spring") == (
+        100.0,
+        "hashing",
+    )
+
+
+class RecordingModel:
+    """A stand-in for a fastembed model that records the size of each batch."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.batches = []
+
+    def embed(self, texts, batch_size=None):
+        self.batches.append(len(texts))
+        time.sleep(self.delay)
+        for text in texts:
+            yield np.array([len(text), text.count("a"), 1.0])
+
+
+class StubLocalEmbedder(LocalEmbedder):
+    def __init__(self, model, **options):
+        super().__init__("stub", **options)
+        self.stub = model
+        self.loads = 0
+
+    def _load_model(self):
+        self.loads += 1
+        return self.stub
+
+
+def expected(texts):
+    return np.array([[len(text), text.count("a"), 1.0] for text in texts])
+
+
+def test_local_embedder_batches_concurrent_calls():
+    model = RecordingModel(delay=0.02)
+    embedder = StubLocalEmbedder(model, max_batch_size=8, max_wait=0.01)
+    requests = [[f"text {i}", "a" * i] for i in range(32)]
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(embedder.embed, requests))
+
+    for texts, vectors in zip(requests, results):
+        assert vectors.dtype == np.float32
+        assert np.array_equal(vectors, expected(texts))
+    assert embedder.loads == 1
+    assert sum(model.batches) == 64
+    assert len(model.batches) < len(requests)
+    # A batch is closed once it holds max_batch_size texts
+    assert max(model.batches) <= 8
+    assert embedder.embed([]).shape == (0, 0)
+
+
+def test_local_embedder_errors_reach_callers():
+    class BrokenModel:
+        def embed(self, texts, batch_size=None):
+            raise RuntimeError("model crashed")
+
+    embedder = StubLocalEmbedder(BrokenModel())
+
+    with pytest.raises(RuntimeError, match="model crashed"):
+        embedder.embed(["text"])
+    # The batching thread survives a failed batch
+    embedder.stub = RecordingModel()
+    embedder._model = None
+    assert np.array_equal(embedder.embed(["text"]), expected(["text"]))
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_local_embedder_restarts_its_thread_after_fork():
+    embedder = StubLocalEmbedder(RecordingModel())
+    embedder.embed(["parent"])
+    parent_worker = embedder._worker
+
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            vectors = embedder.embed(["child", "banana"])
+            ok = (
+                np.array_equal(vectors, expected(["child", "banana"]))
+                and embedder._worker is not parent_worker
+                and embedder._worker_pid == os.getpid()
+            )
+            os.write(write_end, b"1" if ok else b"0")
+        finally:
+            os._exit(0)
+    os.close(write_end)
+    with os.fdopen(read_end, "rb") as reader:
+        assert reader.read() == b"1"
+    os.waitpid(pid, 0)
+
+    assert embedder._worker is parent_worker
+    assert np.array_equal(embedder.embed(["parent"]), expected(["parent"]))
@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Cumulative import time allowed for each module, in microseconds. Loading spaCy,
+# textacy, pypdf, cohere or qdrant_client at import time blows well past these.
+IMPORT_TIME_BUDGET_US = int(os.getenv("IMPORT_TIME_BUDGET_US", "300000"))
+
+
+def import_time(module, cwd):
+    """Return the cumulative `-X importtime` figure of `module`, in microseconds."""
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert completed.returncode == 0, completed.stderr
+
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if name.strip() == module:
+            return int(cumulative)
+    raise AssertionError(f"{module} not found in -X importtime output")
+
+
+@pytest.mark.parametrize("module", ["scripts", "scripts.similarity"])
+def test_import_time_budget(module, tmp_path):
+    cumulative = import_time(module, cwd=tmp_path)
+    assert cumulative < IMPORT_TIME_BUDGET_US, (
+        f"importing {module} took {cumulative / 1000:.0f} ms, "
+        f"budget is {IMPORT_TIME_BUDGET_US / 1000:.0f} ms"
+    )
+
+
+@pytest.mark.parametrize(
+    "module",
+    ["scripts", "scripts.similarity.get_score", "scripts.similarity"],
+)
+def test_import_has_no_side_effects(module, tmp_path):
+    # Runs outside of any "Resume-Matcher" folder and must not touch app.log
+    import_time(module, cwd=tmp_path)
+    assert not (tmp_path / "app.log").exists()
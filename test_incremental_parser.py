@@ -0,0 +1,66 @@
+from collections import Counter
+
+import numpy as np
+
+from Demo.DemoData import resumes
+from scripts.parsers import IncrementalResumeParser
+
+RESUME = resumes[0]["resume"]
+
+
+class CountingParser(IncrementalResumeParser):
+    """Replaces the spaCy pipeline with a cheap analysis that records its calls."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.analyzed = []
+
+    def analyze_section(self, text):
+        self.analyzed.append(text)
+        words = text.split()
+        return {
+            "clean_data": text,
+            "entities": words[:1],
+            "name": words[:2],
+            "emails": [],
+            "phones": [],
+            "years": [],
+            "keyword_counts": dict(Counter(words)),
+            "pos_frequencies": {"NOUN": len(words)},
+            "keyterms": [(word.lower(), 1.0) for word in words[:3]],
+            "bi_grams": [],
+            "tri_grams": [],
+            "embedding": np.ones(4, dtype=np.float32),
+        }
+
+
+def test_only_changed_sections_are_reanalyzed():
+    parser = CountingParser()
+    first = parser.parse(RESUME)
+    sections = len(parser.analyzed)
+
+    edited = RESUME.replace("•Docker", "•Docker and Kubernetes")
+    second = parser.parse(edited)
+
+    assert len(parser.analyzed) == sections + 1
+    assert "Kubernetes" in parser.analyzed[-1]
+    assert "Kubernetes" in second["extracted_keywords"]
+    assert "Kubernetes" not in first["extracted_keywords"]
+    assert second["pos_frequencies"]["NOUN"] == first["pos_frequencies"]["NOUN"] + 2
+    assert parser.hits == sections - 1
+
+
+def test_merged_fields():
+    result = CountingParser().parse(RESUME)
+
+    assert result["name"] == ["JOHN", "DOE"]
+    assert result["experience"].startswith("WORK EXPERIENCE")
+    assert [s["name"] for s in result["sections"]] == [
+        "header",
+        "summary",
+        "skills",
+        "experience",
+        "education",
+        "certifications",
+    ]
+    assert np.isclose(np.linalg.norm(result["embedding"]), 1.0)
@@ -0,0 +1,114 @@
+import json
+import pstats
+import time
+
+import pytest
+
+from scripts.utils import instrumentation
+from scripts.utils.instrumentation import Histogram
+
+
+@pytest.fixture(autouse=True)
+def clean_stats():
+    instrumentation.reset()
+    yield
+    instrumentation.reset()
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram(buckets=(0.01, 0.1, float("inf")))
+    for seconds in (0.005, 0.01, 0.05, 3.0):
+        histogram.observe(seconds)
+
+    assert histogram.to_dict() == {
+        "count": 4,
+        "sum": pytest.approx(3.065),
+        "mean": pytest.approx(3.065 / 4),
+        # A bucket counts the values up to and including its bound
+        "buckets": {"0.01": 2, "0.1": 3, "+Inf": 4},
+    }
+    assert Histogram().to_dict()["mean"] == 0.0
+
+
+def test_stage_and_timed_record_durations():
+    @instrumentation.timed("decorated")
+    def work():
+        time.sleep(0.002)
+        return "done"
+
+    assert work() == "done"
+    with pytest.raises(ValueError):
+        with instrumentation.stage("failing"):
+            raise ValueError
+
+    stats = instrumentation.get_stats()
+    assert set(stats) == {"decorated", "failing"}
+    assert stats["decorated"]["count"] == 1
+    assert stats["decorated"]["sum"] >= 0.002
+
+
+def test_prometheus_export(tmp_path):
+    instrumentation.observe("parse", 0.02)
+    instrumentation.observe("parse", 0.2)
+    path = tmp_path / "metrics.prom"
+
+    output = instrumentation.export_prometheus(str(path))
+
+    name = instrumentation.METRIC_NAME
+    lines = output.splitlines()
+    assert lines[1] == f"# TYPE {name} histogram"
+    assert f'{name}_bucket{{stage="parse",le="0.01"}} 0' in lines
+    assert f'{name}_bucket{{stage="parse",le="0.025"}} 1' in lines
+    assert f'{name}_bucket{{stage="parse",le="+Inf"}} 2' in lines
+    assert f'{name}_count{{stage="parse"}} 2' in lines
+    assert float(lines[-2].split()[-1]) == pytest.approx(0.22)
+    assert path.read_text() == output
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_json_export(tmp_path):
+    instrumentation.observe("parse", 0.02)
+    path = tmp_path / "metrics.json"
+
+    stats = instrumentation.export_json(str(path))
+
+    assert stats == instrumentation.get_stats()
+    assert json.loads(path.read_text()) == stats
+    assert stats["parse"]["buckets"]["+Inf"] == 1
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_cprofile(tmp_path):
+    path = str(tmp_path / "run.prof")
+
+    with instrumentation.profile(path):
+        busy(0.01)
+
+    functions = {function for _, _, function in pstats.Stats(path).stats}
+    assert "busy" in functions
+
+
+def test_sampling_profiler(tmp_path):
+    path = tmp_path / "run.folded"
+
+    with instrumentation.profile(str(path), "sampling") as profiler:
+        busy(0.1)
+
+    lines = path.read_text().splitlines()
+    assert lines and sum(int(line.rsplit(" ", 1)[1]) for line in lines) == sum(
+        profiler.samples.values()
+    )
+    assert any("busy (test_instrumentation.py:" in line for line in lines)
+    # Stacks are written root first, so the sampled function ends the line
+    assert lines[0].split(";")[-1].startswith("busy")
+
+
+def test_unknown_profiler(tmp_path):
+    with pytest.raises(ValueError):
+        with instrumentation.profile(str(tmp_path / "run"), "perf"):
+            pass
@@ -0,0 +1,91 @@
+import time
+
+import pytest
+
+from benchmarks.stubs import JobBoardStub
+from scripts.JobFetcher import (
+    FAILED,
+    FETCHED,
+    NOT_MODIFIED,
+    BulkFetcher,
+    HostRateLimiter,
+    ValidatorCache,
+)
+
+
+@pytest.fixture
+def board():
+    with JobBoardStub(failures={"flaky": 2, "down": 10}) as stub:
+        for job_id in ("1", "2", "3", "flaky", "down"):
+            stub.add_posting(job_id, f"Engineer {job_id}", "Acme", "<p>Python</p>")
+        yield stub
+
+
+def fetcher(**kwargs):
+    options = dict(rate_per_host=0, retries=2, backoff=0.01, timeout=5)
+    return BulkFetcher(**{**options, **kwargs})
+
+
+def test_postings_are_fetched_and_failures_reported(board):
+    urls = [f"{board.url}/jobs/{job_id}" for job_id in ("1", "2", "flaky", "down")]
+    urls += [f"{board.url}/jobs/missing", urls[0]]
+
+    with fetcher() as bulk:
+        results = {result.url: result for result in bulk.fetch_all(urls)}
+
+    assert len(results) == 5
+    assert results[urls[0]].status == FETCHED
+    assert results[urls[0]].posting.title == "Engineer 1"
+    assert results[urls[2]].status == FETCHED and results[urls[2]].attempts == 3
+    assert results[urls[3]].status == FAILED and results[urls[3]].attempts == 3
+    assert results[urls[3]].error == "HTTP 503"
+    # A 404 is not retried
+    assert results[urls[4]].attempts == 1 and results[urls[4]].error == "HTTP 404"
+
+
+class RetryAfterResponse:
+    def __init__(self, retry_after):
+        self.headers = {"Retry-After": retry_after}
+
+
+def test_retry_delays_are_clamped():
+    bulk = fetcher(backoff=1, max_backoff=5)
+
+    assert bulk._delay(1, RetryAfterResponse("2")) == 2
+    assert bulk._delay(0, RetryAfterResponse("86400")) == 5
+    assert [bulk._delay(attempt) for attempt in range(5)] == [1, 2, 4, 5, 5]
+
+
+def test_unchanged_postings_are_skipped(board, tmp_path):
+    urls = [f"{board.url}/jobs/{job_id}" for job_id in ("1", "2")]
+    cache_path = str(tmp_path / "validators.json")
+    with fetcher(cache=ValidatorCache(cache_path)) as bulk:
+        bulk.fetch_all(urls)
+
+    board.add_posting("2", "Senior Engineer 2", "Acme", "<p>Python, Go</p>")
+    with fetcher(cache=ValidatorCache(cache_path)) as bulk:
+        results = bulk.fetch_all(urls)
+
+    assert [result.status for result in results] == [NOT_MODIFIED, FETCHED]
+    assert results[1].posting.title == "Senior Engineer 2"
+
+
+def test_requests_to_a_host_are_rate_limited(board):
+    urls = [f"{board.url}/jobs/{job_id}" for job_id in ("1", "2", "3")]
+
+    start = time.perf_counter()
+    with fetcher(rate_per_host=20) as bulk:
+        results = bulk.fetch_all(urls)
+
+    assert all(result.status == FETCHED for result in results)
+    assert time.perf_counter() - start >= 2 / 20
+
+
+def test_hosts_are_limited_independently():
+    limiter = HostRateLimiter(rate=1)
+    limiter.wait("a.example.com")
+
+    start = time.perf_counter()
+    limiter.wait("b.example.com")
+
+    assert time.perf_counter() - start < 0.5
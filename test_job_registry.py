@@ -0,0 +1,186 @@
+import json
+import multiprocessing
+import os
+
+import pytest
+import spacy
+
+from Demo.DemoData import jobs, resumes
+from scripts import JobRegistry as job_registry
+from scripts import processor
+from scripts.JobRegistry import FEATURES_VERSION, JobRegistry
+from scripts.similarity.embedder import EmbeddingUnavailable, HashingEmbedder
+from scripts.utils import models
+
+RESUME = resumes[0]["resume"]
+JOB = jobs[1]["job_desc"]
+
+
+@pytest.fixture(autouse=True)
+def blank_pipeline(monkeypatch):
+    # The registry parses with the shared spaCy pipeline; a blank one needs no model
+    monkeypatch.setattr(spacy, "load", lambda name, exclude=(): spacy.blank("en"))
+    models._load.cache_clear()
+    yield
+    models._load.cache_clear()
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = JobRegistry(embedder=HashingEmbedder(dim=256))
+    monkeypatch.setattr(job_registry, "get_job_registry", lambda: registry)
+    return registry
+
+
+def test_register_versions(registry):
+    job = registry.register("job-1", JOB)
+
+    assert job.version == 1
+    assert job.features_version == FEATURES_VERSION
+    assert job.embedding is not None and job.embedding_model == "HashingEmbedder"
+    assert set(job.top_keywords) <= set(job.token_counts)
+    assert registry.register("job-1", JOB) is job
+    assert registry.register("job-1", jobs[0]["job_desc"]).version == 2
+    assert "job-1" in registry and len(registry) == 1
+
+    registry.unregister("job-1")
+    assert "job-1" not in registry
+
+
+def test_fast_mode_matches_unregistered(registry):
+    registry.register("job-1", JOB)
+
+    registered = processor.process_texts(RESUME, None, mode="fast", job_id="job-1")
+    direct = processor.process_texts(RESUME, JOB, mode="fast")
+
+    registered.pop("elapsed_ms")
+    direct.pop("elapsed_ms")
+    assert registered == direct
+
+
+def test_full_mode_only_processes_resume(registry, monkeypatch):
+    job = registry.register("job-1", JOB)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("the job side was recomputed")
+
+    monkeypatch.setattr(processor, "ParseJobDesc", fail)
+    monkeypatch.setattr(processor, "get_match_score", fail)
+    monkeypatch.setattr(processor, "get_job_skills", fail)
+    result = processor.process_texts(RESUME, None, mode="full", job_id="job-1")
+
+    assert result["job_description"] is job.parsed
+    assert 0 <= result["match_score"] <= 100
+    assert result["score_method"] == "embedding"
+    skills = result["skills_analysis"]
+    assert len(skills["matched_skills"]) + len(skills["missing_skills"]) == len(
+        job.keyterms
+    )
+
+
+def test_unknown_job(registry):
+    with pytest.raises(ValueError):
+        processor.process_texts(RESUME, None, mode="fast", job_id="missing")
+
+
+def test_persistence(tmp_path):
+    path = str(tmp_path / "jobs.json")
+    job = JobRegistry(path, HashingEmbedder(dim=256)).register("job-1", JOB)
+
+    loaded = JobRegistry(path).get("job-1")
+    assert loaded.version == job.version
+    assert loaded.parsed == json.loads(json.dumps(job.parsed))
+    assert loaded.embedding.tolist() == pytest.approx(job.embedding.tolist())
+
+    with open(path) as f:
+        stored = json.load(f)
+    stored["job-1"]["features_version"] = FEATURES_VERSION - 1
+    with open(path, "w") as f:
+        json.dump(stored, f)
+    assert JobRegistry(path).get("job-1") is None
+
+
+def _second_worker(path, conn):
+    registry = JobRegistry(path, HashingEmbedder(dim=256))
+    conn.send(registry.get("job-42").version)
+    conn.recv()  # the first worker registered a new version
+    conn.send(registry.get("job-42").version)
+    registry.register("job-7", resumes[0]["resume"])
+    conn.send(True)
+
+
+def test_workers_sharing_a_file(tmp_path):
+    path = str(tmp_path / "jobs.json")
+    first = JobRegistry(path, HashingEmbedder(dim=256))
+    first.register("job-42", JOB)
+
+    conn, child_conn = multiprocessing.Pipe()
+    worker = multiprocessing.get_context("fork").Process(
+        target=_second_worker, args=(path, child_conn)
+    )
+    worker.start()
+    assert conn.recv() == 1
+    first.register("job-42", jobs[2]["job_desc"])
+    conn.send(True)
+    assert conn.recv() == 2, "the second worker served a stale version"
+    assert conn.recv()
+    worker.join(30)
+    assert worker.exitcode == 0
+
+    with open(path) as f:
+        stored = json.load(f)
+    assert {job_id: job["version"] for job_id, job in stored.items()} == {
+        "job-42": 2,
+        "job-7": 1,
+    }
+    assert first.get("job-7").version == 1 and first.get("job-42").version == 2
+
+
+def _register(path, job_id):
+    JobRegistry(path, HashingEmbedder(dim=256)).register(job_id, JOB)
+
+
+def test_concurrent_registrations_are_not_lost(tmp_path):
+    path = str(tmp_path / "jobs.json")
+    context = multiprocessing.get_context("fork")
+    workers = [
+        context.Process(target=_register, args=(path, f"job-{i}")) for i in range(6)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+        assert worker.exitcode == 0
+
+    assert len(JobRegistry(path)) == 6
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_missing_embedding_is_retried(monkeypatch):
+    embedder = HashingEmbedder(dim=256)
+    registry = JobRegistry(embedder=embedder)
+
+    def unavailable(texts):
+        raise EmbeddingUnavailable("down")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(embedder, "embed", unavailable)
+        job = registry.register("job-1", JOB)
+    assert job.embedding is None and job.embedding_model is None
+
+    retried = registry.register("job-1", JOB)
+    assert retried.version == job.version
+    assert retried.embedding is not None
+    assert registry.get("job-1") is retried
+
+
+def test_hashing_scores_need_offline_opt_in(registry, monkeypatch):
+    job = registry.register("job-1", JOB)._replace(embedding=None)
+    monkeypatch.delenv("SIMILARITY_OFFLINE", raising=False)
+
+    with pytest.raises(EmbeddingUnavailable):
+        registry.match_score(job, "java spring")
+
+    monkeypatch.setenv("SIMILARITY_OFFLINE", "1")
+    score, method = registry.match_score(job, "java spring")
+    assert method == "hashing" and 0 <= score <= 100
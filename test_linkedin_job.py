@@ -0,0 +1,89 @@
+import pytest
+
+from scripts import LinkedinJobToPDF
+from scripts.LinkedinJobToPDF import (
+    JobPosting,
+    fetch_job_posting,
+    job_posting_to_json,
+    parse_job_posting,
+)
+
+POSTING_PAGE = """
+<html><head><script>var tracking = 1;</script></head><body>
+<nav>Sign in</nav>
+<h1 class="topcard__title"> Data Engineer </h1>
+<a class="topcard__org-name-link" href="/company/acme"> Acme </a>
+<div class="description__text">
+  <div class="show-more-less-html__markup">
+    <p>We build <strong>pipelines</strong> &amp; tools.</p>
+    <ul><li>Python</li><li>Spark</li></ul>
+  </div>
+</div>
+</body></html>
+"""
+
+
+class FakeParseJobDesc:
+    texts = []
+
+    def __init__(self, text):
+        self.texts.append(text)
+
+    def get_JSON(self):
+        return {"job_desc_data": self.texts[-1]}
+
+
+def test_posting_is_parsed():
+    posting = parse_job_posting(POSTING_PAGE, "https://example.com/job/1")
+
+    assert posting.title == "Data Engineer"
+    assert posting.organization == "Acme"
+    assert "<strong>pipelines</strong>" in posting.description_html
+    assert "Sign in" not in posting.description_html
+
+
+class FakeResponse:
+    def __init__(self, text, status_code=200):
+        self.text = text
+        self.status_code = status_code
+
+
+def test_page_without_a_title_is_not_a_posting(monkeypatch):
+    with pytest.raises(ValueError, match="No job title"):
+        parse_job_posting("<html><body>Sign in</body></html>")
+
+    calls = []
+    monkeypatch.setattr(
+        LinkedinJobToPDF.requests,
+        "get",
+        lambda url, **kwargs: calls.append(kwargs) or FakeResponse("<p>Sign in</p>"),
+    )
+    assert fetch_job_posting("https://example.com/jobs/search") is None
+    assert calls == [{"timeout": LinkedinJobToPDF.REQUEST_TIMEOUT}]
+
+
+def test_description_text_goes_straight_to_the_parser(monkeypatch):
+    monkeypatch.setattr(LinkedinJobToPDF, "ParseJobDesc", FakeParseJobDesc)
+    monkeypatch.setattr(LinkedinJobToPDF, "archive_pdf", None)
+
+    job = job_posting_to_json(parse_job_posting(POSTING_PAGE))
+
+    assert job["job_desc_data"] == "We build pipelines & tools.\nPython\nSpark"
+    assert job["job_title"] == "Data Engineer"
+    assert job["organization"] == "Acme"
+
+
+def test_archive_is_rendered_in_the_background(monkeypatch):
+    monkeypatch.setattr(LinkedinJobToPDF, "ParseJobDesc", FakeParseJobDesc)
+    rendered = []
+    monkeypatch.setattr(
+        LinkedinJobToPDF,
+        "save_pdf",
+        lambda posting, job_path: rendered.append(posting.title) or "job.pdf",
+    )
+    posting = JobPosting("", "Data Engineer", "Acme", "<p>Python</p>")
+
+    job_posting_to_json(posting, archive=True)
+    assert LinkedinJobToPDF.archive_pdf(posting).result(timeout=5) == "job.pdf"
+
+    assert rendered == ["Data Engineer", "Data Engineer"]
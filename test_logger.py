@@ -0,0 +1,110 @@
+import json
+import logging
+import logging.handlers
+import os
+import threading
+
+import pytest
+
+from scripts.utils import logger as log_config
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = str(tmp_path / "app.log")
+    yield path
+    log_config.shutdown_logging()
+
+
+def queue_handlers():
+    return [
+        handler
+        for handler in logging.getLogger().handlers
+        if isinstance(handler, logging.handlers.QueueHandler)
+    ]
+
+
+def read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read().splitlines()
+
+
+def test_init_is_idempotent(log_file):
+    log_config.init_logging_config(filename=log_file)
+    listener = log_config._listener
+    log_config.init_logging_config(basic_log_level=logging.WARNING, filename=log_file)
+
+    assert log_config._listener is listener
+    assert len(queue_handlers()) == 1
+    assert logging.getLogger().level == logging.WARNING
+
+    log_config.shutdown_logging()
+    assert log_config._listener is None and not queue_handlers()
+
+
+def test_records_are_written_by_the_listener(log_file):
+    log_config.init_logging_config(filename=log_file, stderr_level=logging.CRITICAL)
+
+    def log(thread):
+        for i in range(50):
+            logging.getLogger("test").info("thread %d record %d", thread, i)
+
+    threads = [threading.Thread(target=log, args=(t,)) for t in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    log_config.shutdown_logging()
+
+    lines = read_lines(log_file)
+    assert len(lines) == 200
+    for thread in range(4):
+        assert sum(f"thread {thread} record" in line for line in lines) == 50
+    assert all(os.path.basename(__file__) in line for line in lines)
+
+
+def test_json_output_keeps_exceptions(log_file):
+    log_config.init_logging_config(
+        filename=log_file, stderr_level=logging.CRITICAL, json_format=True
+    )
+    try:
+        raise ValueError("broken")
+    except ValueError:
+        logging.getLogger("test").exception("Request %s failed", 7)
+    log_config.shutdown_logging()
+
+    entry = json.loads(read_lines(log_file)[0])
+    assert entry["message"] == "Request 7 failed"
+    assert entry["level"] == "ERROR" and entry["logger"] == "test"
+    assert "ValueError: broken" in entry["exception"]
+
+
+def test_rotation(log_file):
+    log_config.init_logging_config(
+        filename=log_file, stderr_level=logging.CRITICAL, max_bytes=1000, backup_count=2
+    )
+    for i in range(100):
+        logging.getLogger("test").info("record %d", i)
+    log_config.shutdown_logging()
+
+    assert os.path.exists(log_file + ".1") and os.path.exists(log_file + ".2")
+    assert not os.path.exists(log_file + ".3")
+    assert all(os.path.getsize(log_file + suffix) <= 1000 for suffix in ("", ".1"))
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_forked_children_write_their_own_file(log_file):
+    log_config.init_logging_config(filename=log_file, stderr_level=logging.CRITICAL)
+    logging.getLogger("test").info("parent")
+
+    pid = os.fork()
+    if pid == 0:
+        logging.getLogger("test").info("child")
+        log_config.shutdown_logging()
+        os._exit(0)
+    os.waitpid(pid, 0)
+    log_config.shutdown_logging()
+
+    assert read_lines(log_file)[-1].endswith("parent")
+    child_lines = read_lines(log_config.process_log_file(log_file, pid))
+    assert len(child_lines) == 1 and child_lines[0].endswith("child")
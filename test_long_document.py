@@ -0,0 +1,77 @@
+import tracemalloc
+
+import spacy
+from spacy.language import Language
+
+from scripts.parsers.ParseLongDocument import ChunkedParser, split_into_chunks
+
+PARAGRAPH = (
+    "Acme builds payment systems in Python and Kubernetes. "
+    "Engineers write services, review code, and mentor developers.\n\n"
+)
+
+
+@Language.component("rule_pos")
+def rule_pos(doc):
+    # A rule-based stand-in for the tagger, so the test needs no trained model
+    for token in doc:
+        if token.is_punct:
+            token.pos_ = "PUNCT"
+        elif not token.is_space:
+            token.pos_ = "NOUN"
+    return doc
+
+
+def blank_nlp():
+    nlp = spacy.blank("en")
+    nlp.add_pipe("rule_pos")
+    nlp.add_pipe("entity_ruler").add_patterns([{"label": "ORG", "pattern": "Acme"}])
+    return nlp
+
+
+def test_chunks_cover_the_text_on_paragraph_breaks():
+    text = PARAGRAPH * 50
+
+    chunks = list(split_into_chunks(text, max_chars=1000))
+
+    assert "".join(chunks) == text
+    assert all(len(chunk) <= 1000 for chunk in chunks)
+    assert all(chunk.endswith("\n\n") for chunk in chunks)
+
+
+def test_lines_longer_than_a_chunk_are_cut_on_spaces():
+    text = "word " * 1000
+
+    chunks = list(split_into_chunks(text, max_chars=100))
+
+    assert "".join(chunks) == text
+    assert all(len(chunk) <= 100 and chunk.endswith(" ") for chunk in chunks)
+
+
+def test_chunk_results_are_merged():
+    parsed = ChunkedParser(nlp=blank_nlp(), max_chunk_chars=1000).parse(PARAGRAPH * 50)
+
+    assert parsed["entities"] == ["Acme"]
+    assert parsed["keyword_counts"]["Python"] == 50
+    assert parsed["pos_frequencies"]["NOUN"] == 50 * 16
+    assert "," not in parsed["clean_data"]
+    assert "payment systems" in parsed["bi_grams"]
+
+
+def test_peak_memory_does_not_grow_with_the_document():
+    parser = ChunkedParser(nlp=blank_nlp(), max_chunk_chars=4000)
+
+    def peak(text):
+        tracemalloc.start()
+        parser.parse(text)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak
+
+    small_text, large_text = PARAGRAPH * 100, PARAGRAPH * 800
+    peak(small_text)
+    small, large = peak(small_text), peak(large_text)
+
+    # Only the merged clean text grows with the document. A single Doc of the
+    # whole text would add about 40 bytes per character
+    assert large - small < 4 * (len(large_text) - len(small_text))
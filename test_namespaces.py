@@ -0,0 +1,96 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from qdrant_client import QdrantClient
+
+from Demo.DemoData import jobs, resumes
+from scripts.similarity.embedder import HashingEmbedder
+from scripts.similarity.get_similarity_score import (
+    QdrantSearch,
+    SerializedClient,
+    get_similarity_score,
+)
+
+EMBEDDER = HashingEmbedder(dim=128)
+THREADS = 16
+ROUNDS = 10
+
+
+@pytest.fixture(autouse=True)
+def offline(monkeypatch):
+    for name in ("COHERE_API_KEY", "QDRANT_URL", "QDRANT_API_KEY"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("SIMILARITY_OFFLINE", "1")
+
+
+@pytest.fixture
+def client():
+    return SerializedClient(QdrantClient(":memory:"))
+
+
+def tenant_resumes(tenant, round_):
+    return [
+        f"{resume['resume']} tenant{tenant} round{round_} doc{i}"
+        for i, resume in enumerate(resumes)
+    ]
+
+
+def test_concurrent_requests_are_isolated(client):
+    def request(tenant):
+        for round_ in range(ROUNDS):
+            texts = tenant_resumes(tenant, round_)
+            with QdrantSearch(
+                texts, jobs[0]["job_desc"], embedder=EMBEDDER, client=client
+            ) as search:
+                search.update_qdrant()
+                page = search.rank(limit=100, preview_chars=None)
+                assert sorted(hit["id"] for hit in page.hits) == list(range(len(texts)))
+                assert {hit["text"] for hit in page.hits} == set(texts)
+                assert len(search.search()) == len(texts)
+        return tenant
+
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        assert sorted(executor.map(request, range(THREADS))) == list(range(THREADS))
+
+    collection = f"resume_collection_name_{EMBEDDER.dim}"
+    assert client.count(collection).count == 0
+
+
+def test_named_namespace_is_kept_and_upserts_replace(client):
+    job = jobs[0]["job_desc"]
+    texts = tenant_resumes(0, 0)
+    with QdrantSearch(
+        texts, job, embedder=EMBEDDER, namespace="job-1", client=client
+    ) as search:
+        search.update_qdrant()
+    with QdrantSearch(
+        texts, job, embedder=EMBEDDER, namespace="job-1", client=client
+    ) as search:
+        search.update_qdrant()
+        assert client.count(search.collection_name).count == len(texts)
+
+        other = QdrantSearch(
+            texts[:1], job, embedder=EMBEDDER, namespace="job-2", client=client
+        )
+        other.update_qdrant()
+        assert len(search.rank(limit=100).hits) == len(texts)
+        assert len(other.rank(limit=100).hits) == 1
+
+        search.delete_namespace()
+        assert client.count(search.collection_name).count == 1
+
+
+def test_concurrent_similarity_scores():
+    pairs = [
+        (resumes[i % len(resumes)]["resume"], jobs[i % len(jobs)]["job_desc"])
+        for i in range(THREADS * 4)
+    ]
+
+    def score(pair):
+        hits = get_similarity_score(*pair)
+        assert len(hits) == 1
+        return hits[0]["score"]
+
+    expected = [score(pair) for pair in pairs]
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        assert list(executor.map(score, pairs)) == pytest.approx(expected)
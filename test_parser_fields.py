@@ -0,0 +1,98 @@
+import importlib
+import threading
+
+import pytest
+
+from scripts.parsers import ParseJobDesc, ParseResume
+from scripts.parsers.ParseFields import LazyParser, parser_field
+
+# The package re-exports the class under the name of its module
+job_description_processor = importlib.import_module("scripts.JobDescriptionProcessor")
+
+RESUME = "Jane Roe\njane.roe@example.com (555) 123-4567\nExperience\nData Engineer"
+
+
+def test_only_requested_fields_are_computed():
+    parser = ParseResume(RESUME)
+
+    output = parser.get_JSON(fields=["emails", "phones"])
+
+    assert set(output) == {"unique_id", "emails", "phones"}
+    assert output["emails"] == ["jane.roe@example.com"]
+    assert isinstance(output["phones"], list)
+    # Contact details are read with regexes, the text is never cleaned or parsed
+    assert "clean_data" not in vars(parser)
+    assert "extractor" not in vars(parser)
+
+
+def test_fields_are_memoized():
+    parser = ParseResume(RESUME)
+
+    first = parser.get_JSON(fields=["emails"])
+    second = parser.get_JSON(fields=["emails"])
+
+    assert first["unique_id"] == second["unique_id"]
+    assert first["emails"] is second["emails"]
+
+
+def test_parsers_on_different_threads_do_not_wait_for_each_other():
+    # Both computations must run at once to pass the barrier; a lock shared by
+    # the instances, as in functools.cached_property before 3.12, breaks it
+    barrier = threading.Barrier(2, timeout=5)
+
+    class Parser(LazyParser):
+        @parser_field()
+        def length(self):
+            barrier.wait()
+            return len(self.text)
+
+    parsers = [Parser("one"), Parser("three")]
+    threads = [threading.Thread(target=lambda p=p: p.length) for p in parsers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not barrier.broken
+    assert [vars(parser)["length"] for parser in parsers] == [3, 5]
+
+
+def test_profiles_select_fields_in_order():
+    assert ParseResume.PROFILES["full"] == ParseResume.FIELDS
+    assert ParseResume(RESUME).select_fields(profile="contact") == (
+        "name",
+        "emails",
+        "phones",
+    )
+    assert ParseJobDesc("").select_fields(["keyterms", "clean_data"]) == (
+        "clean_data",
+        "keyterms",
+    )
+
+
+def test_unknown_fields_and_profiles_are_rejected():
+    with pytest.raises(ValueError):
+        ParseJobDesc("").get_JSON(fields=["emails"])
+    with pytest.raises(ValueError):
+        ParseResume("").get_JSON(profile="everything")
+
+
+def test_job_description_processor_parses_job_descriptions(monkeypatch):
+    written = []
+    monkeypatch.setattr(job_description_processor, "read_document", lambda path: "")
+    monkeypatch.setattr(
+        job_description_processor, "ParseResume", pytest.fail, raising=True
+    )
+    monkeypatch.setattr(
+        job_description_processor.ParseJobDesc,
+        "get_JSON",
+        lambda self: {"unique_id": "1", "job_desc_data": self.job_desc_data},
+    )
+    monkeypatch.setattr(
+        job_description_processor.JobDescriptionProcessor,
+        "_write_json_file",
+        lambda self, output: written.append(output),
+    )
+
+    assert job_description_processor.JobDescriptionProcessor("job.pdf").process()
+    assert written == [{"unique_id": "1", "job_desc_data": ""}]
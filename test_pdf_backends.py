@@ -0,0 +1,119 @@
+import os
+
+import pytest
+
+from scripts.PdfBackends import (
+    BACKENDS,
+    PdfProbe,
+    available_backends,
+    extract_pages,
+    probe_pdf,
+    select_backend,
+)
+
+RESUME = os.path.join(os.path.dirname(__file__), "Data", "Resumes", "john_doe.pdf")
+
+
+def test_bundled_backends_are_available():
+    assert {"pypdf", "pdfminer"} <= set(available_backends())
+
+
+@pytest.mark.parametrize("name", ["pypdf", "pdfminer"])
+def test_backends_extract_one_string_per_page(name):
+    pages = BACKENDS[name].extract_pages(RESUME)
+
+    assert len(pages) == probe_pdf(RESUME).pages
+    assert pages[0].startswith("JOHN DOE")
+    assert "john.doe@email.com" in pages[0]
+
+
+def test_probe_finds_the_text_layer():
+    probe = probe_pdf(RESUME)
+
+    assert probe.size == os.path.getsize(RESUME)
+    assert probe.has_text and probe.fonts > 0
+
+
+def test_font_heavy_files_go_to_pdfminer(monkeypatch):
+    monkeypatch.delenv("PDF_BACKEND", raising=False)
+    monkeypatch.setattr(BACKENDS["pymupdf"], "available", lambda: False)
+    monkeypatch.setattr(BACKENDS["pdfium"], "available", lambda: False)
+    light = PdfProbe(size=1, pages=1, fonts=4, cid_fonts=False, has_text=True)
+    cid = light._replace(cid_fonts=True)
+
+    assert select_backend(RESUME, light).name == "pypdf"
+    assert select_backend(RESUME, cid).name == "pdfminer"
+
+
+def test_backend_can_be_forced(monkeypatch):
+    monkeypatch.setenv("PDF_BACKEND", "pdfminer")
+
+    assert select_backend(RESUME).name == "pdfminer"
+    assert extract_pages(RESUME) == BACKENDS["pdfminer"].extract_pages(RESUME)
+
+    monkeypatch.setenv("PDF_BACKEND", "unknown")
+    with pytest.raises(ValueError):
+        select_backend(RESUME)
+
+
+def write_form_pdf(path):
+    # A page whose only text is drawn by a Form XObject, as exporters of
+    # templates and stamps write it: the font is in the resources of the form
+    from pypdf import PdfWriter
+    from pypdf.generic import (
+        ArrayObject,
+        DecodedStreamObject,
+        DictionaryObject,
+        FloatObject,
+        NameObject,
+    )
+
+    writer = PdfWriter()
+    page = writer.add_blank_page(200, 200)
+    font = DictionaryObject(
+        {
+            NameObject("/Type"): NameObject("/Font"),
+            NameObject("/Subtype"): NameObject("/Type1"),
+            NameObject("/BaseFont"): NameObject("/Helvetica"),
+        }
+    )
+    form = DecodedStreamObject()
+    form.set_data(b"BT /F1 12 Tf 10 100 Td (Python developer) Tj ET")
+    form.update(
+        {
+            NameObject("/Type"): NameObject("/XObject"),
+            NameObject("/Subtype"): NameObject("/Form"),
+            NameObject("/BBox"): ArrayObject(
+                [FloatObject(0), FloatObject(0), FloatObject(200), FloatObject(200)]
+            ),
+            NameObject("/Resources"): DictionaryObject(
+                {
+                    NameObject("/Font"): DictionaryObject(
+                        {NameObject("/F1"): writer._add_object(font)}
+                    )
+                }
+            ),
+        }
+    )
+    page[NameObject("/Resources")] = DictionaryObject(
+        {
+            NameObject("/XObject"): DictionaryObject(
+                {NameObject("/Fm1"): writer._add_object(form)}
+            )
+        }
+    )
+    content = DecodedStreamObject()
+    content.set_data(b"/Fm1 Do")
+    page[NameObject("/Contents")] = writer._add_object(content)
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+def test_probe_finds_fonts_of_forms(tmp_path):
+    path = str(tmp_path / "form.pdf")
+    write_form_pdf(path)
+
+    probe = probe_pdf(path)
+
+    assert probe.has_text and probe.fonts == 1
+    assert "Python developer" in BACKENDS["pypdf"].extract_pages(path)[0]
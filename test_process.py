@@ -1,6 +1,6 @@
 import sys
 import traceback
-from resume_matcher.scripts.processor import process_files
+from scripts.processor import process_files
 
 def main():
     with open('debug.log', 'w') as f:
@@ -0,0 +1,115 @@
+import importlib.util
+
+import pytest
+import spacy
+
+from Demo.DemoData import jobs, resumes
+from scripts import init, processor
+from scripts.similarity.embedder import HASHING_MODEL, get_embedder
+from scripts.SkillMatcher import get_skill_matcher
+from scripts.utils import models
+from scripts.utils.logger import shutdown_logging
+from scripts.utils.models import get_model_name
+
+SHARED_FIELDS = {
+    "mode",
+    "match_score",
+    "score_method",
+    "contact",
+    "skill_coverage",
+    "top_keywords",
+    "skills_analysis",
+    "recommendations",
+    "elapsed_ms",
+}
+
+RESUME = resumes[0]["resume"] + "\njohn.doe@example.com (555) 123-4567 www.johndoe.dev"
+JOB = jobs[1]["job_desc"]
+
+
+def models_installed():
+    return importlib.util.find_spec(get_model_name()) is not None
+
+
+def test_fast_mode_fields():
+    result = processor.process_texts(RESUME, JOB, mode="fast")
+
+    assert set(result) == SHARED_FIELDS
+    assert 0 <= result["match_score"] <= 100
+    assert result["contact"]["emails"] == ["john.doe@example.com"]
+    assert result["contact"]["phones"] == ["(555) 123-4567"]
+    assert "java" in result["top_keywords"]
+
+
+def test_fast_mode_within_budget():
+    processor.process_texts(RESUME, JOB, mode="fast")
+    for resume in resumes:
+        result = processor.process_texts(resume["resume"], JOB, mode="fast")
+        assert result["elapsed_ms"] < processor.MODE_BUDGETS_MS["fast"]
+
+
+def test_fast_mode_ranks_matching_job_first():
+    scores = [
+        processor.process_texts(RESUME, job["job_desc"], mode="fast")["match_score"]
+        for job in jobs
+    ]
+    # John Doe is a full stack Java developer
+    assert scores.index(max(scores)) in (1, 3)
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        processor.process_texts(RESUME, JOB, mode="quick")
+
+
+def hashing_match_score(resume, job):
+    vectors = get_embedder(HASHING_MODEL).embed([resume, job])
+    return round(max(0.0, float(vectors[0] @ vectors[1])) * 100, 2), "hashing"
+
+
+def best_job(mode):
+    scores = [
+        processor.process_texts(RESUME, job["job_desc"], mode=mode)["match_score"]
+        for job in jobs
+    ]
+    return scores.index(max(scores))
+
+
+@pytest.mark.skipif(not models_installed(), reason="spaCy models are not installed")
+def test_modes_agree_on_shared_fields(monkeypatch):
+    monkeypatch.setattr(processor, "get_match_score", hashing_match_score)
+
+    fast = processor.process_texts(RESUME, JOB, mode="fast")
+    full = processor.process_texts(RESUME, JOB, mode="full")
+
+    assert SHARED_FIELDS <= set(full)
+    assert (fast["score_method"], full["score_method"]) == ("token_cosine", "hashing")
+    assert fast["skills_analysis"]["source"] == "job_keywords"
+    assert full["skills_analysis"]["source"] == "job_keyterms"
+    # Computed the same way in both modes
+    assert fast["contact"] == full["contact"]
+    assert fast["skill_coverage"] == full["skill_coverage"]
+    # Computed differently, but from the same resume: most keywords of the full
+    # parse are among the resume tokens the fast mode counts
+    tokens = set(processor.tokenize(RESUME))
+    keywords = [processor.tokenize(keyword) for keyword in full["top_keywords"]]
+    found = [words for words in keywords if words and set(words) <= tokens]
+    assert len(found) >= len(keywords) / 2
+    # Both scores pick a Java developer job for a Java developer
+    assert best_job("fast") in (1, 3)
+    assert best_job("full") in (1, 3)
+
+
+def test_init_loads_the_fast_mode(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(spacy, "load", lambda name, exclude=(): spacy.blank("en"))
+    models._load.cache_clear()
+    processor._stop_words.cache_clear()
+    get_skill_matcher.cache_clear()
+    try:
+        init()
+        assert processor._stop_words.cache_info().currsize == 1
+        assert get_skill_matcher.cache_info().currsize == 1
+    finally:
+        shutdown_logging()
+        models._load.cache_clear()
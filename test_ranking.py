@@ -0,0 +1,91 @@
+import pytest
+
+from scripts.Extractor import DataExtractor
+from scripts.similarity.embedder import HashingEmbedder
+from scripts.similarity.get_similarity_score import (
+    QdrantSearch,
+    RankFilter,
+    candidate_payload,
+)
+
+JOB = "Senior Python developer with Django, PostgreSQL and Docker"
+
+CANDIDATES = [
+    ("Python developer, 2012 - 2020. Django, PostgreSQL, Docker.", ["Berlin"]),
+    ("Python engineer with 3 years of Django and SQL.", ["Paris"]),
+    ("Java developer since 2010 - present, Spring and Docker.", ["Berlin"]),
+    ("Junior Python developer, 1 year of Flask.", ["Berlin"]),
+    ("Pastry chef, 2005 - 2019, French desserts.", ["Lyon"]),
+] * 4
+
+
+@pytest.fixture
+def search(monkeypatch):
+    for name in ("COHERE_API_KEY", "QDRANT_URL", "QDRANT_API_KEY"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("SIMILARITY_OFFLINE", "1")
+    texts = [text for text, _ in CANDIDATES]
+    payloads = [candidate_payload(text, entities) for text, entities in CANDIDATES]
+    search = QdrantSearch(texts, JOB, embedder=HashingEmbedder(), payloads=payloads)
+    search.update_qdrant()
+    yield search
+    search.close()
+
+
+def test_years_of_experience():
+    cases = {
+        "Analyst, 2015 - 2018\nLead, 2017 - 2020": 5,
+        "5+ years of Python": 5,
+        "No dates here": 0,
+    }
+    for text, years in cases.items():
+        assert DataExtractor(text).extract_years_of_experience() == years
+
+
+def test_cursor_pages_through_every_hit(search):
+    seen, scores, cursor = [], [], None
+    while True:
+        page = search.rank(limit=6, cursor=cursor)
+        assert len(page.hits) <= 6
+        seen += [hit["id"] for hit in page.hits]
+        scores += [hit["score"] for hit in page.hits]
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert sorted(seen) == list(range(len(CANDIDATES)))
+    assert scores == sorted(scores, reverse=True)
+    assert (
+        search.rank(limit=6, offset=6).hits
+        == search.rank(limit=6, cursor=search.rank(limit=6).next_cursor).hits
+    )
+
+
+def test_filters_are_applied_by_the_search(search):
+    filters = RankFilter(min_years=3, all_skills=("python", "django"))
+    page = search.rank(filters, limit=100)
+
+    assert page.next_cursor is None
+    assert len(page.hits) == 8
+    for hit in page.hits:
+        assert hit["years_experience"] >= 3
+        assert {"Python", "Django"} <= set(hit["skills"])
+
+    in_berlin = search.rank(RankFilter(locations=("Berlin",)), limit=100).hits
+    assert len(in_berlin) == 12
+    assert all(hit["locations"] == ["Berlin"] for hit in in_berlin)
+
+
+def test_cursor_is_bound_to_its_filters(search):
+    cursor = search.rank(RankFilter(min_years=1), limit=2).next_cursor
+
+    with pytest.raises(ValueError):
+        search.rank(RankFilter(min_years=5), cursor=cursor)
+    with pytest.raises(ValueError):
+        search.rank(cursor="not a cursor")
+
+
+def test_preview_length(search):
+    assert len(search.rank(limit=1, preview_chars=10).hits[0]["text"]) == 10
+    full = search.rank(limit=1, preview_chars=None).hits[0]["text"]
+    assert full in [text for text, _ in CANDIDATES]
@@ -0,0 +1,86 @@
+import os
+import zipfile
+
+import pytest
+
+from scripts import ReadDocument
+from scripts.ReadDocument import DOCX, HTML, PDF, TEXT, read_document, sniff_format
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+RESUME_PDF = os.path.join(REPO_ROOT, "Data", "Resumes", "john_doe.pdf")
+
+WORDPROCESSINGML = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+DOCUMENT_XML = (
+    f'<w:document xmlns:w="{WORDPROCESSINGML}">'
+    "<w:body>"
+    "<w:p><w:r><w:t>Jane Roe</w:t></w:r></w:p>"
+    "<w:p><w:r><w:t>Skills:</w:t><w:tab/><w:t>Python</w:t></w:r></w:p>"
+    "</w:body></w:document>"
+)
+
+
+@pytest.fixture
+def no_pdf(monkeypatch):
+    # Non-PDF inputs must never reach PDF extraction
+    def fail(file_path):
+        raise AssertionError(f"{file_path} was read as a PDF")
+
+    monkeypatch.setitem(ReadDocument.READERS, PDF, fail)
+
+
+def test_text_is_read_whatever_the_extension(tmp_path, no_pdf):
+    path = tmp_path / "resume.pdf"
+    path.write_text("Jane Roe\nSkills: Python, SQL\n", encoding="utf-8-sig")
+
+    assert sniff_format(path) == TEXT
+    assert read_document(path) == "Jane Roe\nSkills: Python, SQL\n"
+
+
+def test_empty_and_utf16_text(tmp_path, no_pdf):
+    empty = tmp_path / "empty.txt"
+    empty.write_bytes(b"")
+    utf16 = tmp_path / "utf16.txt"
+    utf16.write_text("Jane Roe", encoding="utf-16")
+
+    assert read_document(empty) == ""
+    assert read_document(utf16) == "Jane Roe"
+
+
+def test_html_is_stripped(tmp_path, no_pdf):
+    path = tmp_path / "job.html"
+    path.write_text(
+        "<!DOCTYPE html><html><head><title>Job</title>"
+        "<style>p { color: red }</style></head>"
+        "<body><h1>Data Engineer</h1><script>track()</script>"
+        "<ul><li>Python &amp; SQL</li><li>Spark</li></ul></body></html>"
+    )
+
+    assert sniff_format(path) == HTML
+    assert read_document(path) == "Data Engineer\nPython & SQL\nSpark"
+
+
+def test_docx_is_read_from_the_document_xml(tmp_path, no_pdf):
+    path = tmp_path / "resume.docx"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("[Content_Types].xml", "<Types/>")
+        archive.writestr("word/document.xml", DOCUMENT_XML)
+
+    assert sniff_format(path) == DOCX
+    assert read_document(path) == "Jane Roe\nSkills:\tPython\n"
+
+
+def test_pdf_is_sniffed():
+    assert sniff_format(RESUME_PDF) == PDF
+    assert read_document(RESUME_PDF).startswith("JOHN DOE")
+
+
+def test_unsupported_binaries_are_rejected(tmp_path):
+    legacy_doc = tmp_path / "resume.doc"
+    legacy_doc.write_bytes(b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1\x00\x00")
+    archive = tmp_path / "resume.zip"
+    with zipfile.ZipFile(archive, "w") as f:
+        f.writestr("resume.txt", "Jane Roe")
+
+    for path in (legacy_doc, archive):
+        with pytest.raises(ValueError):
+            read_document(path)
@@ -0,0 +1,177 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from benchmarks.stubs import CohereStub
+from scripts.similarity import embedder as embedder_module
+from scripts.similarity.embedder import (
+    CircuitBreaker,
+    CohereEmbedder,
+    EmbeddingUnavailable,
+    ResilienceConfig,
+    ResilientEmbedder,
+)
+
+DIM = 64
+TEXTS = ["Python developer", "Pastry chef"]
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    with CohereStub(dim=DIM) as stub:
+        monkeypatch.setenv("COHERE_API_KEY", "stub")
+        monkeypatch.setenv("COHERE_BASE_URL", stub.url)
+        yield stub
+
+
+def resilient(**options):
+    config = ResilienceConfig(
+        **{"deadline": 1.0, "backoff": 0.01, "max_backoff": 0.02, **options}
+    )
+    primary = CohereEmbedder(dim=DIM, timeout=config.deadline, max_retries=0)
+    return ResilientEmbedder(primary, config=config)
+
+
+def test_passes_through(stub):
+    embedder = resilient()
+    vectors = embedder.embed(TEXTS)
+
+    assert vectors.shape == (2, DIM)
+    assert stub.requests == 1
+    assert embedder.stats["cache_answers"] == 0
+    assert embedder.model_name == embedder.primary.model
+
+
+def test_retries_errors(stub):
+    stub.inject(503, 503)
+    embedder = resilient(retries=2)
+
+    vectors = embedder.embed(TEXTS)
+
+    assert np.allclose(vectors, resilient().embed(TEXTS))
+    assert embedder.stats["retries"] == 2
+
+
+def test_client_errors_are_not_retried(stub):
+    stub.inject(400, 400, 400)
+    embedder = resilient(retries=2, breaker_failures=2)
+
+    for _ in range(3):
+        with pytest.raises(EmbeddingUnavailable):
+            embedder.embed(TEXTS)
+
+    assert stub.requests == 3
+    assert embedder.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_client_error_on_the_trial_call_closes_the_circuit(stub):
+    stub.inject(500, 400)
+    embedder = resilient(retries=0, breaker_failures=1, breaker_reset=0.1)
+
+    with pytest.raises(EmbeddingUnavailable):
+        embedder.embed(TEXTS)
+    assert embedder.breaker.state == CircuitBreaker.OPEN
+    time.sleep(0.15)
+    with pytest.raises(EmbeddingUnavailable):
+        embedder.embed(TEXTS)
+
+    assert embedder.breaker.state == CircuitBreaker.CLOSED
+    assert embedder.embed(TEXTS).shape == (2, DIM)
+    assert embedder.embed(TEXTS[:1]).shape == (1, DIM)
+    assert stub.requests == 4
+
+
+def test_stats_are_counted_across_threads(stub):
+    embedder = resilient()
+    texts = [[f"text {i}"] for i in range(64)]
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(embedder.embed, texts))
+
+    assert embedder.stats["calls"] == 64
+
+
+def test_hedges_slow_requests(stub):
+    stub.inject(2.0)
+    embedder = resilient(deadline=1.0, hedge_after=0.05)
+
+    start = time.perf_counter()
+    vectors = embedder.embed(TEXTS)
+
+    assert time.perf_counter() - start < 0.5
+    assert vectors.shape == (2, DIM)
+    assert embedder.stats["hedges"] == 1
+
+
+def test_deadline_raises_unless_cached(stub):
+    embedder = resilient(deadline=0.1, retries=1)
+    cached = embedder.embed(TEXTS[:1])
+    stub.inject(2.0, 2.0, 2.0, 2.0)
+
+    start = time.perf_counter()
+    with pytest.raises(EmbeddingUnavailable):
+        embedder.embed(TEXTS)
+    assert time.perf_counter() - start < 0.5
+    assert embedder.stats["timeouts"] == 2
+
+    # Every text is cached: the primary's own vectors are served
+    assert np.allclose(embedder.embed(TEXTS[:1]), cached)
+    assert embedder.stats["cache_answers"] == 1
+
+
+def test_circuit_breaker_serves_cache_and_recovers(stub):
+    embedder = resilient(retries=0, breaker_failures=2, breaker_reset=0.2)
+    cached = embedder.embed(TEXTS[:1])
+
+    stub.error_rate = 1.0
+    for _ in range(2):
+        with pytest.raises(EmbeddingUnavailable):
+            embedder.embed(TEXTS)
+    assert embedder.breaker.state == CircuitBreaker.OPEN
+
+    requests = stub.requests
+    with pytest.raises(EmbeddingUnavailable):
+        embedder.embed(TEXTS)
+    assert np.allclose(embedder.embed(TEXTS[:1]), cached)
+    assert stub.requests == requests
+    assert embedder.stats["short_circuits"] == 2
+
+    stub.error_rate = 0.0
+    time.sleep(0.25)
+    embedder.embed(TEXTS)
+    assert embedder.breaker.state == CircuitBreaker.CLOSED
+    assert stub.requests == requests + 1
+
+
+def test_config_from_env(monkeypatch):
+    monkeypatch.setenv("EMBED_DEADLINE_MS", "250")
+    monkeypatch.setenv("EMBED_RETRIES", "4")
+    monkeypatch.setenv("EMBED_HEDGE_AFTER_MS", "80")
+
+    config = ResilienceConfig.from_env()
+
+    assert config.deadline == 0.25
+    assert config.retries == 4
+    assert config.hedge_after == 0.08
+    assert config.breaker_failures == ResilienceConfig().breaker_failures
+
+
+def test_similarity_score_through_stub(stub, monkeypatch):
+    from scripts.similarity.get_similarity_score import get_similarity_score
+
+    monkeypatch.delenv("QDRANT_URL", raising=False)
+    monkeypatch.setenv("SIMILARITY_OFFLINE", "1")
+    embedder_module.get_cohere_embedder.cache_clear()
+    try:
+        embedder = embedder_module.get_cohere_embedder()
+        embedder.primary.dim = DIM
+        stub.inject(503)
+
+        hits = get_similarity_score("Python developer", "Python developer")
+
+        assert hits[0]["score"] == pytest.approx(1.0)
+        assert embedder.stats["retries"] == 1
+    finally:
+        embedder_module.get_cohere_embedder.cache_clear()
@@ -0,0 +1,55 @@
+import pytest
+
+from Demo.DemoData import resumes
+from scripts.Extractor import RESUME_SECTIONS
+from scripts.SectionSegmenter import SectionSegmenter, get_segmenter
+
+
+@pytest.mark.parametrize(
+    "line, section",
+    [
+        ("Experience", "experience"),
+        ("  WORK   EXPERIENCE:", "experience"),
+        ("Employment History", "experience"),
+        ("1/2 Projects", "projects"),
+        ("• Honors & Awards", "awards"),
+        ("Skills: Python, SQL", "skills"),
+        ("Experience with Java and Spring", None),
+        ("Developed RESTful services", None),
+    ],
+)
+def test_match_header(line, section):
+    assert get_segmenter().match_header(line) == section
+
+
+def test_every_known_header_is_recognized():
+    assert all(get_segmenter().match_header(header) for header in RESUME_SECTIONS)
+
+
+@pytest.mark.parametrize("resume", [r["resume"] for r in resumes])
+def test_sections_cover_the_resume(resume):
+    sections = get_segmenter().segment(resume)
+
+    assert "".join(section.text for section in sections) == resume
+    assert all(resume[s.start : s.end] == s.text for s in sections)
+    assert sections[0].name == "header"
+    assert {"summary", "skills", "experience", "education"} <= {
+        s.name for s in sections
+    }
+
+
+def test_extract_stops_at_the_next_section():
+    text = "Jane Doe\nWork Experience\nEngineer at ACME\nEducation\nBSc Physics\n"
+
+    assert get_segmenter().extract(text, "experience") == (
+        "Work Experience\nEngineer at ACME\n"
+    )
+
+
+def test_custom_aliases():
+    segmenter = SectionSegmenter({"requirements": ["requirements", "what you bring"]})
+
+    assert [s.name for s in segmenter.segment("Intro\nWhat You Bring\n- Go\n")] == [
+        "header",
+        "requirements",
+    ]
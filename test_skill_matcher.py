@@ -0,0 +1,73 @@
+from scripts.SkillMatcher import SkillMatcher, get_skill_matcher, skill_coverage
+
+TAXONOMY = {
+    "Spring": ["spring framework", "spring"],
+    "Spring Boot": ["spring boot"],
+    "C++": ["c++", "cpp"],
+    "Node.js": ["nodejs", "node js"],
+    "CI/CD": ["ci/cd", "continuous integration"],
+}
+
+
+def test_aliases_map_to_canonical_skills():
+    matcher = SkillMatcher(TAXONOMY)
+
+    skills = matcher.extract("Built CI/CD with Node JS, C++ and cpp tooling.")
+
+    assert skills == ["CI/CD", "Node.js", "C++"]
+
+
+def test_longest_match_wins():
+    matches = SkillMatcher(TAXONOMY).find("Spring Boot and the Spring framework")
+
+    assert [m.skill for m in matches] == ["Spring Boot", "Spring"]
+    assert [(m.start, m.end) for m in matches] == [(0, 2), (4, 6)]
+
+
+def test_failure_links_find_overlapping_prefixes():
+    matcher = SkillMatcher({"A B C": [], "B C D": [], "C": []})
+
+    assert matcher.extract("a b c d") == ["A B C"]
+    assert matcher.extract("a b x c") == ["C"]
+    assert matcher.extract("x b c d") == ["B C D"]
+
+
+def test_coverage():
+    coverage = skill_coverage(["Java", "SQL"], ["SQL", "Docker"])
+
+    assert coverage == {
+        "score": 50.0,
+        "matched_skills": ["SQL"],
+        "missing_skills": ["Docker"],
+    }
+    assert skill_coverage(["Java"], [])["score"] == 0.0
+
+
+def test_bundled_taxonomy(tmp_path):
+    matcher = get_skill_matcher()
+
+    assert {"Java", "Spring Boot", "Docker"} <= set(
+        matcher.extract("Java developer using Spring Boot and Docker")
+    )
+
+    csv_path = tmp_path / "skills.csv"
+    csv_path.write_text("Kubernetes,k8s\nTerraform\n")
+    assert SkillMatcher.from_file(str(csv_path)).extract("k8s and terraform") == [
+        "Kubernetes",
+        "Terraform",
+    ]
+
+
+def test_canonical_names_are_not_aliases():
+    matcher = SkillMatcher(TAXONOMY)
+
+    assert matcher.extract("Spring Boot and Node.js") == ["Spring Boot"]
+    assert SkillMatcher({"Terraform": []}).extract("terraform") == ["Terraform"]
+
+
+def test_bundled_taxonomy_ignores_common_words():
+    matcher = get_skill_matcher()
+
+    assert matcher.extract("I will go to the office. Grade: C. Plan r and d") == []
+    assert "Go" not in matcher.extract("Ready to go above and beyond")
+    assert matcher.extract("Golang, ANSI C and RStudio") == ["Go", "C", "R"]
@@ -0,0 +1,52 @@
+import spacy
+
+from scripts.Extractor import DataExtractor
+from scripts.KeytermsExtraction import KeytermExtractor
+from scripts.utils import models
+from scripts.utils.Utils import CountFrequency, TextCleaner
+
+TEXT = "Python developer with experience in data pipelines and machine learning."
+
+
+def fake_load(calls):
+    def load(name, exclude=()):
+        calls.append((name, tuple(exclude)))
+        return spacy.blank("en")
+
+    return load
+
+
+def test_stages_share_one_pipeline(monkeypatch):
+    calls = []
+    monkeypatch.setattr(spacy, "load", fake_load(calls))
+    monkeypatch.delenv("SPACY_MODEL", raising=False)
+    monkeypatch.delenv("SPACY_EXCLUDE", raising=False)
+    models._load.cache_clear()
+    try:
+        nlp = models.get_nlp()
+        TextCleaner.clean_text(TEXT)
+        CountFrequency(TEXT).count_frequency()
+        extractor = DataExtractor(TEXT)
+        keyterms = KeytermExtractor(TEXT)
+
+        assert extractor.doc.vocab is nlp.vocab
+        assert keyterms.text_doc.vocab is nlp.vocab
+        assert calls == [(models.DEFAULT_MODEL, ())]
+        assert models.loaded_models() == 1
+    finally:
+        models._load.cache_clear()
+
+
+def test_model_is_configurable(monkeypatch):
+    calls = []
+    monkeypatch.setattr(spacy, "load", fake_load(calls))
+    monkeypatch.setenv("SPACY_MODEL", "en_core_web_sm")
+    monkeypatch.setenv("SPACY_EXCLUDE", "parser, lemmatizer")
+    models._load.cache_clear()
+    try:
+        models.get_nlp()
+        models.get_nlp()
+
+        assert calls == [("en_core_web_sm", ("parser", "lemmatizer"))]
+    finally:
+        models._load.cache_clear()
@@ -0,0 +1,44 @@
+import spacy
+from spacy.tokens import Doc
+
+from scripts.Extractor import DataExtractor
+from scripts.utils.Utils import CountFrequency
+
+WORDS = ["Java", "developers", "write", "Java", "code"]
+TAGS = ["PROPN", "NOUN", "VERB", "PROPN", "NOUN"]
+
+
+def extractor():
+    doc = Doc(spacy.blank("en").vocab, words=WORDS, pos=TAGS)
+    data_extractor = DataExtractor(" ".join(WORDS))
+    data_extractor._doc = doc
+    return data_extractor
+
+
+def test_features_are_exported_once():
+    data_extractor = extractor()
+
+    assert data_extractor.features.shape == (5, 4)
+    assert data_extractor.features is data_extractor.features
+
+
+def test_keyword_counts_are_deduplicated():
+    data_extractor = extractor()
+
+    assert data_extractor.extract_keyword_counts() == {
+        "Java": 2,
+        "developers": 1,
+        "code": 1,
+    }
+    assert sum(data_extractor.extract_keyword_counts().values()) == len(
+        data_extractor.extract_particular_words()
+    )
+
+
+def test_pos_counts_match_count_frequency():
+    data_extractor = extractor()
+
+    assert data_extractor.count_pos() == {"PROPN": 2, "NOUN": 2, "VERB": 1}
+    assert CountFrequency("", doc=data_extractor.doc).count_frequency() == (
+        data_extractor.count_pos()
+    )
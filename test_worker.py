@@ -0,0 +1,141 @@
+import glob
+import io
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+
+from Demo.DemoData import jobs, resumes
+from scripts import worker
+
+RESUME = resumes[0]["resume"]
+JOB = jobs[1]["job_desc"]
+
+
+def test_handle_request():
+    assert worker.handle_request({"id": 1, "op": "ping"}) == {
+        "id": 1,
+        "ok": True,
+        "result": "pong",
+    }
+
+    response = worker.handle_request(
+        {"id": 2, "resume_text": RESUME, "job_text": JOB, "mode": "fast"}
+    )
+    assert response["ok"] and response["result"]["mode"] == "fast"
+
+    response = worker.handle_request({"id": 3, "resume_text": " ", "job_text": JOB})
+    assert response == {
+        "id": 3,
+        "ok": False,
+        "error": "ValueError: Resume and job description cannot be empty",
+    }
+
+
+def test_profiles_stay_in_the_profile_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(worker, "PROFILE_DIR", str(tmp_path))
+    request = {"resume_text": RESUME, "job_text": JOB, "mode": "fast"}
+
+    assert worker.handle_request({**request, "profile_name": "fast.prof"})["ok"]
+    assert os.listdir(tmp_path) == ["fast.prof"]
+
+    for name in ("../escape.prof", "/tmp/escape.prof", ".hidden"):
+        response = worker.handle_request({**request, "profile_name": name})
+        assert not response["ok"] and "Invalid profile name" in response["error"]
+    assert os.listdir(tmp_path) == ["fast.prof"]
+
+
+def test_serve_stream():
+    reader = io.StringIO('{"id": 1, "op": "ping"}\n\nnot json\n{"id": 2}\n')
+    writer = io.StringIO()
+
+    worker.serve_stream(reader, writer)
+
+    responses = [json.loads(line) for line in writer.getvalue().splitlines()]
+    assert [response["id"] for response in responses] == [1, None, 2]
+    assert responses[0]["result"] == "pong"
+    assert responses[1]["error"].startswith("Invalid JSON")
+    assert responses[2] == {"id": 2, "ok": False, "error": "KeyError: 'resume_path'"}
+
+
+def children(pid):
+    """The child pids of a process, read from /proc rather than through psutil."""
+    pids = set()
+    for path in glob.glob(f"/proc/{pid}/task/*/children"):
+        try:
+            with open(path) as f:
+                pids.update(int(child) for child in f.read().split())
+        except FileNotFoundError:  # the thread exited
+            pass
+    return pids
+
+
+def running(pid):
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # The state follows the parenthesised command name; Z is a zombie
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+def wait_for(condition, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.05)
+
+
+@pytest.fixture
+def server(tmp_path):
+    socket_path = str(tmp_path / "worker.sock")
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-c",
+            "import sys; from scripts import worker; "
+            "worker.serve_socket(sys.argv[1], 2)",
+            socket_path,
+        ],
+        stderr=subprocess.DEVNULL,
+    )
+    wait_for(lambda: len(children(process.pid)) == 2 and os.path.exists(socket_path))
+    yield socket_path, process
+    if process.poll() is None:
+        for child in children(process.pid):
+            os.kill(child, signal.SIGKILL)
+        process.kill()
+        process.wait()
+
+
+def ping(socket_path):
+    client = worker.WorkerClient(socket_path)
+    try:
+        return client.request({"op": "ping"})
+    finally:
+        client.close()
+
+
+@pytest.mark.skipif(
+    not os.path.isdir("/proc/self/task"), reason="reads the children from /proc"
+)
+def test_serve_socket_restarts_children(server):
+    socket_path, parent = server
+    assert ping(socket_path)["result"] == "pong"
+
+    dead = min(children(parent.pid))
+    os.kill(dead, signal.SIGKILL)
+    wait_for(
+        lambda: len(children(parent.pid)) == 2 and dead not in children(parent.pid)
+    )
+    assert ping(socket_path)["result"] == "pong"
+
+    pids = children(parent.pid)
+    parent.terminate()
+    parent.wait(10)
+    wait_for(lambda: not any(running(pid) for pid in pids), timeout=10)
+    assert not os.path.exists(socket_path)